@@ -6,6 +6,8 @@ import { initializeAppCheck, ReCaptchaV3Provider } from "https://www.gstatic.com
 import { getFirestore, collection, getDocs } from "https://www.gstatic.com/firebasejs/12.0.0/firebase-firestore.js";
 import { processTeamData, processDecadeData, processGuessesData, processToughestPuzzlesData } from "./analyticsData.js";
 import { initScoreDisplay } from "./scoreDisplay.js";
+import "./registerServiceWorker.js";
+import { expandStatsSummary, versionedUrl } from "./statsSummary.js";
 
 export async function initAnalytics() {
     initScoreDisplay();
@@ -25,7 +27,7 @@ export async function initAnalytics() {
     try {
         console.log("Fetching player data and guess statistics...");
         const [statsResponse, guessesSnapshot] = await Promise.all([
-            fetch(`stats_summary.json?v=${new Date().getTime()}`),
+            fetch(versionedUrl('stats_summary.json', 'stats-summary-version')),
             getDocs(collection(db, 'guesses'))
         ]);
 
@@ -33,7 +35,7 @@ export async function initAnalytics() {
             throw new Error(`Failed to fetch stats_summary.json: ${statsResponse.statusText}`);
         }
         
-        const allPlayerData = await statsResponse.json();
+        const allPlayerData = expandStatsSummary(await statsResponse.json());
         console.log(`Successfully loaded ${allPlayerData.length} players from summary.`);
 
         const allGuesses = guessesSnapshot.docs.map(doc => doc.data());
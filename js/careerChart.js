@@ -0,0 +1,110 @@
+// ABOUTME: Draws the career-arc WAR waterfall chart on player detail pages.
+// ABOUTME: Reads per-player data from the #career-chart-data JSON island so the chart code is cached once.
+
+/**
+ * Builds the Chart.js configuration for a career waterfall.
+ * @param {{years: string[], war: number[], teams: string[]}} data - One entry per season
+ * @param {Object} teamColors - Team abbreviation to { bg, border, name }, as in team_colors.js
+ * @returns {Object}
+ */
+export function buildCareerChartConfig(data, teamColors) {
+    const { years, war: warData, teams: teamsByYear } = data;
+
+    const waterfallData = [];
+    let cumulativeTotal = 0;
+    for (const war of warData) {
+        waterfallData.push([cumulativeTotal, cumulativeTotal + war]);
+        cumulativeTotal += war;
+    }
+    waterfallData.push([0, cumulativeTotal]);
+
+    const labels = [...years, 'Career Total'];
+    const backgroundColors = teamsByYear.map(team => (teamColors[team] || teamColors['Default']).bg);
+    backgroundColors.push(teamColors['Total'].bg);
+
+    const borderColors = teamsByYear.map(team => (teamColors[team] || teamColors['Default']).border);
+    borderColors.push(teamColors['Total'].border);
+
+    return {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'WAR',
+                data: waterfallData,
+                backgroundColor: backgroundColors,
+                borderColor: borderColors,
+                borderWidth: 2,
+                borderRadius: 4,
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                title: { display: false },
+                tooltip: {
+                    callbacks: {
+                        label: function(context) {
+                            const i = context.dataIndex;
+                            if (i < warData.length) {
+                                return `${years[i]} (${teamsByYear[i]}): ${warData[i].toFixed(1)}`;
+                            } else {
+                                return `Total Career WAR: ${cumulativeTotal.toFixed(1)}`;
+                            }
+                        }
+                    }
+                },
+                legend: {
+                    display: true,
+                    position: 'bottom',
+                    labels: {
+                        padding: 20,
+                        font: { size: 10 },
+                        generateLabels: function() {
+                            const uniqueTeams = [...new Set(teamsByYear)];
+                            const legendItems = uniqueTeams.map(teamAbbr => {
+                                const teamInfo = teamColors[teamAbbr] || teamColors['Default'];
+                                return { text: teamInfo.name, fillStyle: teamInfo.bg, strokeStyle: teamInfo.border, lineWidth: 2 };
+                            });
+                            legendItems.push({ text: teamColors['Total'].name, fillStyle: teamColors['Total'].bg, strokeStyle: teamColors['Total'].border, lineWidth: 2 });
+                            return legendItems;
+                        }
+                    }
+                }
+            },
+            scales: {
+                y: { title: { display: false } },
+                x: {
+                    title: { display: false },
+                    grid: { display: false },
+                    ticks: { maxTicksLimit: 15 }
+                }
+            }
+        }
+    };
+}
+
+/**
+ * Renders the chart into #careerArcChart if the page has chart data and Chart.js loaded.
+ * @returns {Object|null} The Chart instance, or null when there is nothing to draw
+ */
+export function initCareerChart() {
+    const dataEl = document.getElementById('career-chart-data');
+    const canvas = document.getElementById('careerArcChart');
+    if (!dataEl || !canvas || typeof window.Chart === 'undefined') return null;
+
+    let data;
+    try {
+        data = JSON.parse(dataEl.textContent);
+    } catch (e) {
+        console.error('Malformed career chart data.', e);
+        return null;
+    }
+    return new window.Chart(canvas.getContext('2d'), buildCareerChartConfig(data, window.TEAM_COLORS));
+}
+
+// Module scripts run after the document is parsed and after the classic Chart.js and team color scripts
+if (typeof document !== 'undefined' && !window.__TESTING__) {
+    initCareerChart();
+}
@@ -2,6 +2,7 @@
 // ABOUTME: Manages follow-up questions and career summary visualizations.
 
 import { initScoreDisplay } from './scoreDisplay.js';
+import './registerServiceWorker.js';
 
 /**
  * Checks if the user should be allowed to view the answer page.
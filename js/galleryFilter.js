@@ -80,6 +80,54 @@ export function checkMatch(puzzle, isCompleted, tokens) {
     });
 }
 
+/**
+ * Finds the puzzles matching every search token using search_index.json's posting lists.
+ * Gives the same answers as checkMatch for whitespace-free tokens, with puzzles identified by id.
+ * @param {Object} index - The parsed search_index.json
+ * @param {string[]} tokens - Lowercased search terms
+ * @param {function(number): boolean} isCompleted - Whether the user has solved the puzzle with this id
+ * @returns {Set<number>|null} Matching ids, or null when there are no tokens and everything matches
+ */
+export function matchSearchIndex(index, tokens, isCompleted) {
+    if (tokens.length === 0) return null;
+
+    let matches = null;
+    for (const token of tokens) {
+        const ids = new Set();
+        const add = postings => postings?.forEach(id => ids.add(id));
+
+        // 1. Date parts, month names and full dates
+        add(index.exact[token]);
+        add(index.months[token]);
+        MONTH_NAMES.forEach((monthName, i) => {
+            if (monthName.includes(token)) add(index.months[String(i + 1).padStart(2, '0')]);
+        });
+        const dateId = index.dates.indexOf(token);
+        if (dateId !== -1) ids.add(dateId);
+
+        // 2. Teams, by abbreviation or any part of the full name
+        for (const [abbr, postings] of Object.entries(index.teams)) {
+            if (abbr.toLowerCase() === token || TEAM_NAME_MAP[abbr]?.includes(token)) add(postings);
+        }
+
+        // 3. Decades (career years themselves are exact entries)
+        if (token.length === 4 && !isNaN(token)) add(index.decades[token.substring(0, 3)]);
+        if (token.endsWith('s')) {
+            if (token.length === 3) add(index.decades[`${token[0]}0s`]);
+            else if (token.length === 5) add(index.decades[`${token.substring(0, 3)}0s`]);
+        }
+
+        // 4. Name/nickname words, ONLY for solved puzzles
+        for (const [word, postings] of Object.entries(index.names)) {
+            if (word.includes(token)) postings.forEach(id => { if (isCompleted(id)) ids.add(id); });
+        }
+
+        matches = matches === null ? ids : new Set([...matches].filter(id => ids.has(id)));
+        if (matches.size === 0) break;
+    }
+    return matches;
+}
+
 /**
  * Legacy compatibility wrapper for the index.js filtering loop.
  */
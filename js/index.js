@@ -1,8 +1,10 @@
 // ABOUTME: Entry point for the main landing page and archive navigation.
 // ABOUTME: Initializes the archive gallery and site-wide UI behaviors.
 
-import { checkMatch } from './galleryFilter.js';
+import { matchSearchIndex } from './galleryFilter.js';
 import { initScoreDisplay } from './scoreDisplay.js';
+import './registerServiceWorker.js';
+import { versionedUrl } from './statsSummary.js';
 
 export async function initIndex() {
     initScoreDisplay();
@@ -20,25 +22,31 @@ export async function initIndex() {
         console.warn('Malformed completion data in localStorage, resetting.', e);
         completedPuzzles = [];
     }
-    let puzzleData = [];
+    let searchIndex = null;
 
-    // Fetch the pre-generated stats summary for fast searching
+    // Fetch the pre-generated inverted index for fast searching
     try {
-        const response = await fetch(`stats_summary.json?v=${new Date().getTime()}`);
+        const response = await fetch(versionedUrl('search_index.json', 'search-index-version'));
         if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
-        puzzleData = await response.json();
+        searchIndex = await response.json();
     } catch (err) {
         console.error('Failed to load search data:', err);
     }
+    const puzzleDates = searchIndex?.dates || [];
+    // Puzzle ids past the static count live in archive/{month}.html rather than in index.html
+    const shardOf = id => (id >= searchIndex.static ? puzzleDates[id].substring(0, 7) : null);
 
     // Populate a map for quick DOM access during filtering
     const itemMap = new Map();
-    const galleryItems = galleryGrid.querySelectorAll('.gallery-container');
-    galleryItems.forEach(item => {
-        const href = item.querySelector('.reveal-link')?.getAttribute('href') || '';
-        const date = href.match(/(\d{4}-\d{2}-\d{2})/)?.[1] || href.replace('.html', '');
-        if (date) itemMap.set(date, item);
-    });
+    function registerItems(root) {
+        root.querySelectorAll('.gallery-container').forEach(item => {
+            const link = item.querySelector('.reveal-link');
+            const href = link?.getAttribute('href') || '';
+            const date = href.match(/(\d{4}-\d{2}-\d{2})/)?.[1] || href.replace('.html', '');
+            if (date) itemMap.set(date, item);
+            if (link) link.addEventListener('click', () => markAsCompleted(link));
+        });
+    }
 
     // Read URL parameters
     const urlParams = new URLSearchParams(window.location.search);
@@ -72,15 +80,75 @@ export async function initIndex() {
         }
     }
 
-    // Add click listeners to Reveal text links
-    const revealLinks = document.querySelectorAll('.reveal-link');
-    revealLinks.forEach(link => {
-        link.addEventListener('click', () => markAsCompleted(link));
-    });
+    // Register the static tiles and add click listeners to their Reveal text links
+    registerItems(galleryGrid);
 
     // Initial UI update
     updateCompletedUI();
 
+    // --- Archive Shards ---
+    // In sharded mode older tiles live in archive/{month}.html; search_index.json says which are static.
+    const pendingShards = [...new Set(puzzleDates.map((date, id) => !itemMap.has(date) && shardOf(id)).filter(Boolean))]
+        .sort().reverse();
+    const shardLoads = new Map();
+    let loadMoreButton = null;
+
+    function loadShard(month) {
+        if (!shardLoads.has(month)) {
+            shardLoads.set(month, fetch(`archive/${month}.html`)
+                .then(response => {
+                    if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+                    return response.text();
+                })
+                .then(markup => {
+                    const shard = document.createElement('div');
+                    shard.className = 'archive-shard';
+                    shard.dataset.month = month;
+                    shard.innerHTML = markup;
+                    // Keep shards in newest-first order even when a search loads them out of sequence
+                    const next = [...galleryGrid.querySelectorAll('.archive-shard')].find(s => s.dataset.month < month);
+                    galleryGrid.insertBefore(shard, next || null);
+                    registerItems(shard);
+                    updateCompletedUI();
+                })
+                .catch(err => {
+                    // Left in shardLoads so a missing shard is not requested again on every keystroke
+                    console.error(`Failed to load archive shard ${month}:`, err);
+                })
+                .finally(updateLoadMore));
+        }
+        return shardLoads.get(month);
+    }
+
+    function updateLoadMore() {
+        if (!loadMoreButton) return;
+        loadMoreButton.hidden = pendingShards.every(month => shardLoads.has(month));
+    }
+
+    async function loadNextShard() {
+        const month = pendingShards.find(m => !shardLoads.has(m));
+        if (!month) return;
+        await loadShard(month);
+        filterGallery();
+    }
+
+    if (pendingShards.length > 0) {
+        loadMoreButton = document.createElement('button');
+        loadMoreButton.type = 'button';
+        loadMoreButton.className = 'load-more';
+        loadMoreButton.textContent = 'Load older puzzles';
+        loadMoreButton.addEventListener('click', loadNextShard);
+        galleryGrid.after(loadMoreButton);
+
+        // Load the next month as the button scrolls into view; the button still works without the observer
+        if ('IntersectionObserver' in window) {
+            const observer = new IntersectionObserver(entries => {
+                if (entries.some(entry => entry.isIntersecting)) loadNextShard();
+            }, { rootMargin: '600px' });
+            observer.observe(loadMoreButton);
+        }
+    }
+
     // --- High-Performance Filtering Logic ---
     function filterGallery() {
         const searchQuery = searchBar.value.toLowerCase().trim();
@@ -90,18 +158,31 @@ export async function initIndex() {
         let visibleCount = 0;
 
         // If we failed to load JSON, fall back to showing everything (or implement DOM fallback)
-        if (puzzleData.length === 0) {
-            galleryItems.forEach(item => item.style.display = '');
+        if (puzzleDates.length === 0) {
+            itemMap.forEach(item => item.style.display = '');
             return;
         }
 
-        puzzleData.forEach(puzzle => {
-            const item = itemMap.get(puzzle.date);
-            if (!item) return;
+        const isFiltering = searchTokens.length > 0 || showUnsolvedOnly;
+        const missingShards = new Set();
 
-            const isCompleted = completedPuzzles.includes(puzzle.date);
+        const completed = new Set(completedPuzzles);
+        const matches = matchSearchIndex(searchIndex, searchTokens, id => completed.has(puzzleDates[id]));
+
+        puzzleDates.forEach((date, id) => {
+            const isCompleted = completed.has(date);
             const unsolvedFilterMatch = !showUnsolvedOnly || !isCompleted;
-            const searchMatch = checkMatch(puzzle, isCompleted, searchTokens);
+            const searchMatch = matches === null || matches.has(id);
+            const item = itemMap.get(date);
+
+            if (!item) {
+                // A match in a shard that has not been loaded yet: fetch it, then filter again
+                const shard = shardOf(id);
+                if (isFiltering && unsolvedFilterMatch && searchMatch && shard && !shardLoads.has(shard)) {
+                    missingShards.add(shard);
+                }
+                return;
+            }
 
             if (unsolvedFilterMatch && searchMatch) {
                 item.style.display = '';
@@ -111,7 +192,11 @@ export async function initIndex() {
             }
         });
 
-        noResultsMessage.style.display = (visibleCount === 0 && searchQuery) ? 'block' : 'none';
+        noResultsMessage.style.display = (visibleCount === 0 && searchQuery && missingShards.size === 0) ? 'block' : 'none';
+
+        if (missingShards.size > 0) {
+            Promise.all([...missingShards].map(loadShard)).then(filterGallery);
+        }
     }
 
     searchBar.addEventListener('input', filterGallery);
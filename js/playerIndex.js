@@ -0,0 +1,98 @@
+// ABOUTME: Loads the autocomplete shards in data/players on demand and answers suggestion and validity lookups.
+// ABOUTME: Only the shard for a guess's first two letters is fetched, instead of the whole master player list.
+
+import { normalizeText, getAutocompleteSuggestions } from './quizEngine.js';
+
+const EMPTY_SHARD = { names: [], keys: [] };
+
+/**
+ * The shard a normalized name belongs to; mirrors shard_key in page-generator/player_index.py.
+ * @param {string} normalized
+ * @returns {string}
+ */
+export function shardKey(normalized) {
+    return normalized.slice(0, 2).replace(/[^a-z0-9]/g, '_');
+}
+
+export class PlayerIndex {
+    /**
+     * @param {string[]} pinnedPlayers - Names suggested ahead of the index and always valid (tribute puzzles).
+     * @param {string} baseUrl - Directory holding the {shard}.json files.
+     */
+    constructor(pinnedPlayers = [], baseUrl = 'data/players') {
+        this.pinnedPlayers = pinnedPlayers;
+        this.pinnedKeys = new Set(pinnedPlayers.map(p => normalizeText(p)));
+        this.baseUrl = baseUrl;
+        this.shards = new Map();
+        this.keySets = new Map();
+        this.loads = new Map();
+    }
+
+    #shardFor(text) {
+        const normalized = normalizeText(text);
+        return normalized.length < 2 ? null : shardKey(normalized);
+    }
+
+    /**
+     * Whether lookups for this text can be answered without fetching.
+     * @param {string} text
+     * @returns {boolean}
+     */
+    isLoaded(text) {
+        const key = this.#shardFor(text);
+        return key === null || this.shards.has(key);
+    }
+
+    /**
+     * Fetches the shard for this text once. A missing shard counts as empty, so it is not requested again.
+     * @param {string} text
+     * @returns {Promise<void>}
+     */
+    load(text) {
+        const key = this.#shardFor(text);
+        if (key === null) return Promise.resolve();
+        if (!this.loads.has(key)) {
+            this.loads.set(key, fetch(`${this.baseUrl}/${key}.json`)
+                .then(response => {
+                    // No player's name starts with these letters
+                    if (response.status === 404) return EMPTY_SHARD;
+                    if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+                    return response.json();
+                })
+                .catch(err => {
+                    console.error(`Failed to load player names for "${key}":`, err);
+                    return EMPTY_SHARD;
+                })
+                .then(shard => {
+                    this.shards.set(key, shard);
+                    this.keySets.set(key, new Set(shard.keys));
+                }));
+        }
+        return this.loads.get(key);
+    }
+
+    /**
+     * Suggestions from the pinned names and the text's shard, which must already be loaded.
+     * @param {string} text
+     * @param {number} maxSuggestions
+     * @returns {string[]}
+     */
+    suggest(text, maxSuggestions = 7) {
+        const shard = this.shards.get(this.#shardFor(text)) || EMPTY_SHARD;
+        const matches = [
+            ...getAutocompleteSuggestions(text, this.pinnedPlayers, maxSuggestions),
+            ...getAutocompleteSuggestions(text, shard, maxSuggestions)
+        ];
+        return [...new Set(matches)].slice(0, maxSuggestions);
+    }
+
+    /**
+     * Set-like membership test for QuizEngine.submitGuess; the guess's shard must already be loaded.
+     * @param {string} normalizedGuess
+     * @returns {boolean}
+     */
+    has(normalizedGuess) {
+        if (this.pinnedKeys.has(normalizedGuess)) return true;
+        return this.keySets.get(this.#shardFor(normalizedGuess))?.has(normalizedGuess) || false;
+    }
+}
@@ -5,8 +5,10 @@
 import { initializeApp } from "https://www.gstatic.com/firebasejs/12.0.0/firebase-app.js";
 import { initializeAppCheck, ReCaptchaV3Provider } from "https://www.gstatic.com/firebasejs/12.0.0/firebase-app-check.js";
 import { getFirestore, collection, addDoc, query, where, getDocs, serverTimestamp } from "https://www.gstatic.com/firebasejs/12.0.0/firebase-firestore.js";
-import { QuizEngine, normalizeText, getAutocompleteSuggestions } from "./quizEngine.js";
+import { QuizEngine } from "./quizEngine.js";
+import { PlayerIndex } from "./playerIndex.js";
 import { initScoreDisplay } from "./scoreDisplay.js";
+import "./registerServiceWorker.js";
 import { QuizUI } from "./quizUI.js";
 import { copyShareText } from "./quizShare.js";
 
@@ -204,16 +206,16 @@ export async function initQuiz() {
     }
 
     let engine;
-    let allPlayers = (typeof ALL_PLAYERS !== 'undefined') ? [...ALL_PLAYERS] : [];
-
     // John Sterling Tribute Injection
+    let pinnedPlayers = [];
     if (date === '2026-05-04') {
-        allPlayers = ['John Sterling', ...allPlayers.filter(p => p !== 'John Sterling')];
+        pinnedPlayers = ['John Sterling'];
     } else if (date === '2026-07-04') {
-        allPlayers = ['George Steinbrenner', 'The Boss', ...allPlayers.filter(p => !['George Steinbrenner', 'The Boss'].includes(p))];
+        pinnedPlayers = ['George Steinbrenner', 'The Boss'];
     }
 
-    const normalizedPlayerSet = new Set(allPlayers.map(p => normalizeText(p)));
+    // Player names load per two-letter prefix as the user types; it also answers the engine's validity checks
+    const playerIndex = new PlayerIndex(pinnedPlayers);
 
     let totalScore = parseInt(localStorage.getItem('nameThatYankeeTotalScore')) || 0;
     let completedPuzzles = JSON.parse(localStorage.getItem('nameThatYankeeCompletedPuzzles')) || [];
@@ -329,6 +331,22 @@ export async function initQuiz() {
         dispatch({ type: 'SET_PROCESSING', payload: false });
     }
 
+    // Prefers the small data/quiz/{date}.json payload and falls back to the detail page's #quiz-data
+    async function fetchQuizData() {
+        try {
+            const response = await fetch(`data/quiz/${date}.json`);
+            if (response.ok) return await response.json();
+        } catch (error) {
+            console.warn("Quiz JSON unavailable, reading the detail page instead:", error);
+        }
+
+        const response = await fetch(`${date}.html`);
+        const htmlText = await response.text();
+        const doc = new DOMParser().parseFromString(htmlText, 'text/html');
+        const quizDataEl = doc.getElementById('quiz-data');
+        return quizDataEl ? JSON.parse(quizDataEl.textContent) : null;
+    }
+
     async function loadQuizData() {
         if (completedPuzzles.includes(date)) {
             dispatch({ type: 'SET_ERROR', payload: "You have already completed this puzzle." });
@@ -336,14 +354,8 @@ export async function initQuiz() {
         }
 
         try {
-            const response = await fetch(`${date}.html`);
-            const htmlText = await response.text();
-            const parser = new DOMParser();
-            const doc = parser.parseFromString(htmlText, 'text/html');
-
-            const quizDataEl = doc.getElementById('quiz-data');
-            if (quizDataEl) {
-                const data = JSON.parse(quizDataEl.textContent);
+            const data = await fetchQuizData();
+            if (data) {
                 const formattedName = data.answer.split(' ').map(n => n.charAt(0).toUpperCase() + n.slice(1)).join(' ');
                 
                 // Update UI clues
@@ -373,8 +385,13 @@ export async function initQuiz() {
             dispatch({ type: 'UPDATE_FEEDBACK', payload: { message: "Please enter a valid guess.", className: 'incorrect' } });
             return;
         }
+        if (!playerIndex.isLoaded(userGuess)) {
+            // Usually already fetched while typing; otherwise check again once the names are in
+            playerIndex.load(userGuess).then(checkGuess);
+            return;
+        }
 
-        const result = engine.submitGuess(userGuess, normalizedPlayerSet);
+        const result = engine.submitGuess(userGuess, playerIndex);
 
         if (result.status === 'CORRECT') {
             dispatch({ type: 'GUESS_RESULT', payload: { status: result.status, score: result.score, guess: userGuess, gameOver: result.gameOver } });
@@ -426,8 +443,12 @@ export async function initQuiz() {
         ui.elements.showGuessesBtn.addEventListener('click', showIncorrectGuesses);
 
         ui.elements.guessInput.addEventListener('input', () => {
-            const matches = getAutocompleteSuggestions(ui.elements.guessInput.value, allPlayers);
-            dispatch({ type: 'UPDATE_SUGGESTIONS', payload: matches });
+            const showSuggestions = () => dispatch({ type: 'UPDATE_SUGGESTIONS', payload: playerIndex.suggest(ui.elements.guessInput.value) });
+            if (playerIndex.isLoaded(ui.elements.guessInput.value)) {
+                showSuggestions();
+            } else {
+                playerIndex.load(ui.elements.guessInput.value).then(showSuggestions);
+            }
         });
 
         ui.elements.guessInput.addEventListener('keydown', (e) => {
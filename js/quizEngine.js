@@ -14,19 +14,44 @@ export function normalizeText(text) {
 /**
  * Provides autocomplete suggestions based on player names.
  * @param {string} inputText - The user input to match.
- * @param {string[]} allPlayers - The full list of player names.
+ * @param {string[]|{names: string[], keys: string[]}} allPlayers - A list of player names, or an
+ *     autocomplete shard whose names are sorted by their pre-normalized keys.
  * @param {number} maxSuggestions - Maximum number of suggestions to return.
  * @returns {string[]} Filtered list of player names.
  */
 export function getAutocompleteSuggestions(inputText, allPlayers, maxSuggestions = 7) {
     const normalizedInput = normalizeText(inputText);
     if (normalizedInput.length < 2) return [];
+    if (!Array.isArray(allPlayers)) return findSortedPrefixMatches(normalizedInput, allPlayers, maxSuggestions);
     return allPlayers.filter(player => {
         if (typeof player !== 'string') return false;
         return normalizeText(player).startsWith(normalizedInput);
     }).slice(0, maxSuggestions);
 }
 
+/**
+ * Binary-searches a shard's sorted keys for the first name with the prefix, then reads forward.
+ * @param {string} normalizedInput - Already normalized prefix.
+ * @param {{names: string[], keys: string[]}} shard - Parallel lists sorted by key.
+ * @param {number} maxSuggestions - Maximum number of names to return.
+ * @returns {string[]}
+ */
+export function findSortedPrefixMatches(normalizedInput, shard, maxSuggestions) {
+    const { names, keys } = shard;
+    let low = 0;
+    let high = keys.length;
+    while (low < high) {
+        const mid = (low + high) >>> 1;
+        if (keys[mid] < normalizedInput) low = mid + 1;
+        else high = mid;
+    }
+    const matches = [];
+    for (let i = low; i < keys.length && matches.length < maxSuggestions && keys[i].startsWith(normalizedInput); i++) {
+        matches.push(names[i]);
+    }
+    return matches;
+}
+
 /**
  * Calculates the score based on how many hints were revealed.
  * @param {number} index - The current hint index (0-based).
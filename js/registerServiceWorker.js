@@ -0,0 +1,20 @@
+// ABOUTME: Registers the generated sw.js so repeat visits load the site shell and recent puzzles from cache.
+// ABOUTME: Imported for its side effect by each page's entry script; does nothing where service workers are unsupported.
+
+/**
+ * Registers sw.js once the page has loaded, so it never competes with first-visit requests.
+ * The path is relative to the page (every page importing this sits at the site root), so the
+ * scope sw.js resolves its assets against stays right when the site is served from a subpath.
+ */
+export function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) return;
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('sw.js').catch(err => {
+            console.warn('Service worker registration failed:', err);
+        });
+    });
+}
+
+if (typeof document !== 'undefined' && !window.__TESTING__) {
+    registerServiceWorker();
+}
@@ -0,0 +1,44 @@
+// ABOUTME: Loads the generated data files at their content-hash version and expands the columnar stats summary.
+// ABOUTME: Mirrors page-generator/stats_summary.py, which writes the file and stamps the version into the pages.
+
+/**
+ * Adds the version the generator stamped into <meta name={metaName}> so the file caches until it changes.
+ * @param {string} path - Data file relative to the page, e.g. "stats_summary.json"
+ * @param {string} metaName - e.g. "stats-summary-version"
+ * @returns {string}
+ */
+export function versionedUrl(path, metaName) {
+    const version = document.querySelector(`meta[name="${metaName}"]`)?.getAttribute('content');
+    return version ? `${path}?v=${encodeURIComponent(version)}` : path;
+}
+
+/**
+ * Expands [[1996, 1998], 2001] into ["1996", "1997", "1998", "2001"].
+ * @param {Array<number|number[]>} ranges
+ * @returns {string[]}
+ */
+export function expandYears(ranges) {
+    const years = [];
+    for (const entry of ranges) {
+        const [start, end] = Array.isArray(entry) ? entry : [entry, entry];
+        for (let year = start; year <= end; year++) years.push(String(year));
+    }
+    return years;
+}
+
+/**
+ * Rebuilds per-puzzle entries ({ date, name, nickname, teams, years }) from the columnar summary.
+ * Arrays written by older generators are returned unchanged.
+ * @param {Object|Object[]} data - The parsed stats_summary.json
+ * @returns {Object[]}
+ */
+export function expandStatsSummary(data) {
+    if (Array.isArray(data)) return data;
+    return data.date.map((date, i) => ({
+        date,
+        name: data.name[i],
+        nickname: data.nickname[i],
+        teams: data.teams[i].map(id => data.team_table[id]),
+        years: expandYears(data.years[i])
+    }));
+}
@@ -26,6 +26,14 @@ class GeminiDailyQuotaExceeded(Exception):
     pass
 
 
+def is_daily_quota_error(error: Exception) -> bool:
+    """Returns True if a Gemini API error means the daily Free Tier quota is exhausted."""
+    if not isinstance(error, errors.APIError) or getattr(error, 'code', None) != 429:
+        return False
+    message = str(error)
+    return "GenerateRequestsPerDayPerProjectPerModel-FreeTier" in message or "quota_value: 50" in message
+
+
 def _respect_free_tier_rate_limit():
     """Enforce a conservative delay between Gemini API calls.
 
@@ -345,6 +353,7 @@ def analyze_player_image(image_path, player_name: str, api_key: str) -> dict:
     2. Any image + Yankee uniform
     3. Any image of the player
     
+    image_path may also be an already decoded PIL image, which is sent as it is.
     Returns a dict with verification results and priority level.
     """
     print(f"🤖 Analyzing image for {player_name} with prioritized criteria...")
@@ -352,7 +361,7 @@ def analyze_player_image(image_path, player_name: str, api_key: str) -> dict:
     client = genai.Client(api_key=api_key)
     
     try:
-        verification_image = Image.open(image_path)
+        verification_image = image_path if isinstance(image_path, Image.Image) else Image.open(image_path)
     except Exception as e:
         print(f"  ❌ Error opening image for analysis: {e}")
         return {"success": False, "priority": 0, "reasoning": str(e)}
@@ -603,8 +612,7 @@ def get_facts_and_followup_from_gemini(player_name: str, api_key: str):
             
             if isinstance(e, errors.APIError) and getattr(e, 'code', None) == 429:
                 message = str(e)
-                # Detect daily quota exhaustion (GenerateRequestsPerDay...)
-                if "GenerateRequestsPerDayPerProjectPerModel-FreeTier" in message or "quota_value: 50" in message:
+                if is_daily_quota_error(e):
                     print("  ❌ Gemini daily Free Tier quota appears to be exhausted.")
                     raise GeminiDailyQuotaExceeded(message)
                 else:
@@ -4,127 +4,175 @@ import http.server
 import json
 import os
 import re
+import threading
 import time
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+from stats_summary import load_stats_summary
+from audit_store import FAILURE_TYPES, STORE_PATH, AuditStore, failure_type, render_report
 
 PORT = 63463
 PROJECT_DIR = Path(__file__).parent.parent
 LOG_PATH = PROJECT_DIR / "audit.log"
-REPORT_PATH = PROJECT_DIR / "FACT_AUDIT_REPORT.md"
 STATS_PATH = PROJECT_DIR / "stats_summary.json"
 
 # Total players from stats_summary.json (read once)
 try:
-    with open(STATS_PATH, 'r') as f:
-        TOTAL_PLAYERS = len(json.load(f))
+    TOTAL_PLAYERS = len(load_stats_summary(STATS_PATH))
 except:
     TOTAL_PLAYERS = 189
 
-def parse_report():
-    failures = []
-    if not REPORT_PATH.exists():
-        return failures
-    
-    content = REPORT_PATH.read_text(encoding='utf-8')
-    sections = content.split('### ❌ ')
-    
-    for section in sections[1:]: # Skip header
-        lines = section.strip().split('\n')
-        if not lines: continue
-        
-        # Player name and date
-        header = lines[0]
-        name_match = re.search(r"(.*?) \((.*?)\)", header)
-        if not name_match: continue
-        
-        name = name_match.group(1)
-        date = name_match.group(2)
-        
-        prediction = "Unknown"
-        reasoning = ""
-        debunked = []
-        
-        current_fact = None
-        
-        for line in lines[1:]:
-            line = line.strip()
-            if line.startswith("- **Phase 1 Prediction:**"):
-                prediction = line.replace("- **Phase 1 Prediction:**", "").strip()
-            elif line.startswith("- **Phase 1 Reasoning:"):
-                reasoning = line.replace("- **Phase 1 Reasoning:", "").replace("**", "").strip()
-            elif line.startswith("- **Fact:**"):
-                current_fact = {"text": line.replace("- **Fact:**", "").strip(), "reason": "", "source": ""}
-                debunked.append(current_fact)
-            elif line.startswith("- **Reason:**") and current_fact:
-                current_fact["reason"] = line.replace("- **Reason:**", "").strip()
-            elif line.startswith("- **Source:**") and current_fact:
-                current_fact["source"] = line.replace("- **Source:**", "").strip()
-        
-        failures.append({
-            "name": name,
-            "date": date,
-            "prediction": prediction,
-            "reasoning": reasoning,
-            "debunked": debunked
-        })
+class LogTail:
+    """Follows audit.log from a saved byte offset so each poll only reads newly appended lines."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.partial = b""
+        self.processed = 0
+        self.current_player = "Waiting..."
+
+    def update(self):
+        if not self.path.exists():
+            self.reset()
+            return
+        if self.path.stat().st_size < self.offset:
+            # The log was truncated or replaced by a new run
+            self.reset()
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read()
+            self.offset = f.tell()
+        if not chunk:
+            return
+        lines = (self.partial + chunk).split(b"\n")
+        self.partial = lines.pop()
+        for raw_line in lines:
+            line = raw_line.decode('utf-8', errors='replace')
+            if "Phase 1: Checking identity" in line:
+                self.processed += 1
+                match = re.search(r"for (.*?) \(", line)
+                if match:
+                    self.current_player = match.group(1)
+
+class FileCache:
+    """Keeps the value loaded from a file until the file's mtime or size changes."""
+
+    def __init__(self, path, loader):
+        self.path = Path(path)
+        self.loader = loader
+        self.signature = None
+        self.value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        try:
+            stat = self.path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+        with self._lock:
+            if self.value is None or signature != self.signature:
+                self.value = self.loader()
+                self.signature = signature
+            return self.value
+
+def failure_view(record):
+    """Shapes a stored mismatch for the dashboard's error cards."""
+    return {
+        "name": record["name"],
+        "date": record["date"],
+        "type": failure_type(record),
+        "prediction": record.get("p1_predicted", "Unknown"),
+        "reasoning": record.get("reasoning", ""),
+        "debunked": [{"text": f["fact"], "reason": f.get("reasoning", ""), "source": f.get("source", "")}
+                     for f in record.get("failures", [])]
+    }
+
+def query_failures(query):
+    """Answers /api/failures?date=&player=&type=&offset=&limit= from the cached verdict store."""
+    params = {key: values[0] for key, values in parse_qs(query).items()}
+    kind = params.get("type") if params.get("type") in FAILURE_TYPES else None
+    try:
+        offset = max(0, int(params.get("offset", 0)))
+        limit = min(200, max(1, int(params.get("limit", 20))))
+    except ValueError:
+        offset, limit = 0, 20
+    total, page = STORE_CACHE.get().query(date=params.get("date"), player=params.get("player"),
+                                          kind=kind, offset=offset, limit=limit)
+    return {"total": total, "offset": offset, "limit": limit, "failures": [failure_view(r) for r in page]}
+
+LOG_TAIL = LogTail(LOG_PATH)
+STORE_CACHE = FileCache(STORE_PATH, lambda: AuditStore(STORE_PATH))
+_STATUS_LOCK = threading.Lock()
+
+def build_status():
+    """Returns the dashboard status, reading only new log lines and reloading the verdict store only when it changed."""
+    with _STATUS_LOCK:
+        LOG_TAIL.update()
+        processed = LOG_TAIL.processed
+        current_player = LOG_TAIL.current_player
+    failures_list = STORE_CACHE.get().failures()
+
+    start_time = os.path.getmtime(LOG_PATH) if LOG_PATH.exists() else None
+    elapsed = time.time() - start_time if start_time else 0
+    if processed > 0:
+        sec_per_player = elapsed / processed
+        remaining_sec = sec_per_player * (TOTAL_PLAYERS - processed)
+    else:
+        remaining_sec = (TOTAL_PLAYERS * 13)
     
-    return failures
+    return {
+        "processed": processed,
+        "total": TOTAL_PLAYERS,
+        "failures_count": len(failures_list),
+        "latest_failure": failures_list[0]["date"] if failures_list else None,
+        "current_player": current_player,
+        "percent": round((processed / TOTAL_PLAYERS) * 100, 1) if TOTAL_PLAYERS > 0 else 0,
+        "eta_seconds": round(remaining_sec)
+    }
+
+# Seconds between server-side status checks for each event stream, and between unconditional refreshes (which also keep the connection alive).
+EVENT_INTERVAL = 1.0
+REFRESH_INTERVAL = 15.0
 
 class AuditStatusHandler(http.server.BaseHTTPRequestHandler):
     def do_GET(self):
-        if self.path == '/api/status':
+        url = urlsplit(self.path)
+        if url.path == '/api/status':
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
+            self.wfile.write(json.dumps(build_status()).encode())
+
+        elif url.path == '/api/failures':
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(query_failures(url.query)).encode())
+
+        elif url.path == '/api/events':
+            self.send_response(200)
+            self.send_header('Content-type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.stream_events()
             
-            processed = 0
-            current_player = "Waiting..."
-            start_time = None
-            
-            if LOG_PATH.exists():
-                with open(LOG_PATH, 'r') as f:
-                    log_lines = f.readlines()
-                    processed = sum(1 for line in log_lines if "Phase 1: Checking identity" in line)
-                    for line in reversed(log_lines):
-                        if "Phase 1: Checking identity for" in line:
-                            match = re.search(r"for (.*?) \(", line)
-                            if match:
-                                current_player = match.group(1)
-                                break
-                    start_time = os.path.getmtime(LOG_PATH)
-
-            failures_list = parse_report()
-            
-            elapsed = time.time() - start_time if start_time else 0
-            if processed > 0:
-                sec_per_player = elapsed / processed
-                remaining_sec = sec_per_player * (TOTAL_PLAYERS - processed)
-            else:
-                remaining_sec = (TOTAL_PLAYERS * 13)
-            
-            status = {
-                "processed": processed,
-                "total": TOTAL_PLAYERS,
-                "failures_count": len(failures_list),
-                "failures": failures_list,
-                "current_player": current_player,
-                "percent": round((processed / TOTAL_PLAYERS) * 100, 1) if TOTAL_PLAYERS > 0 else 0,
-                "eta_seconds": round(remaining_sec)
-            }
-            self.wfile.write(json.dumps(status).encode())
-            
-        elif self.path == '/raw':
+        elif url.path == '/raw':
             self.send_response(200)
             self.send_header('Content-type', 'text/plain; charset=utf-8')
             self.end_headers()
-            if REPORT_PATH.exists():
-                self.wfile.write(REPORT_PATH.read_bytes())
-            else:
-                self.wfile.write(b"Report not found yet.")
+            self.wfile.write(render_report(STORE_CACHE.get().failures()).encode())
                 
-        elif self.path == '/':
+        elif url.path == '/':
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
             self.end_headers()
@@ -146,6 +194,9 @@ class AuditStatusHandler(http.server.BaseHTTPRequestHandler):
                     .progress-bar { height: 100%; background: linear-gradient(90deg, #48bb78, #38a169); width: 0%; transition: width 1s cubic-bezier(0.4, 0, 0.2, 1); }
                     .current { font-style: italic; color: #4a5568; font-size: 14px; text-align: center; font-weight: 500; }
                     
+                    .filters { display: flex; gap: 10px; align-items: center; flex-wrap: wrap; }
+                    .filters input, .filters select, .filters button { padding: 8px 10px; border: 1px solid #e2e8f0; border-radius: 8px; font-size: 14px; background: white; }
+                    .filters span { font-size: 13px; color: #718096; }
                     .error-list { margin-top: 30px; }
                     .error-card { border-left: 6px solid #e53e3e; background: white; padding: 25px; border-radius: 12px; margin-bottom: 20px; box-shadow: 0 4px 12px rgba(0,0,0,0.05); border-top: 1px solid #fed7d7; border-right: 1px solid #fed7d7; border-bottom: 1px solid #fed7d7; }
                     .error-header { display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 15px; }
@@ -197,6 +248,18 @@ class AuditStatusHandler(http.server.BaseHTTPRequestHandler):
                     </div>
 
                     <h2 id="errors-title">Detected Inconsistencies (0)</h2>
+                    <div class="filters">
+                        <input id="filter-date" type="text" placeholder="Date (e.g. 2025-04)">
+                        <input id="filter-player" type="text" placeholder="Player">
+                        <select id="filter-type">
+                            <option value="">All failures</option>
+                            <option value="debunked">Debunked facts</option>
+                            <option value="unconfirmed">Unconfirmed mismatch</option>
+                        </select>
+                        <button id="prev-page">&larr;</button>
+                        <span id="page-label"></span>
+                        <button id="next-page">&rarr;</button>
+                    </div>
                     <div id="error-list" class="error-list">
                         <!-- Populated by JS -->
                     </div>
@@ -233,11 +296,8 @@ class AuditStatusHandler(http.server.BaseHTTPRequestHandler):
                         `;
                     }
 
-                    async function update() {
+                    function render(data) {
                         try {
-                            const res = await fetch('/api/status');
-                            const data = await res.json();
-                            
                             document.getElementById('processed').textContent = `${data.processed} / ${data.total}`;
                             document.getElementById('failures_count').textContent = data.failures_count;
                             document.getElementById('percent').textContent = `${data.percent}%`;
@@ -246,23 +306,75 @@ class AuditStatusHandler(http.server.BaseHTTPRequestHandler):
                             document.getElementById('eta').textContent = formatTime(data.eta_seconds);
                             document.getElementById('errors-title').textContent = `Detected Inconsistencies (${data.failures_count})`;
 
-                            const errorList = document.getElementById('error-list');
-                            // Sort by date descending
-                            const sortedFailures = data.failures.reverse();
-                            errorList.innerHTML = sortedFailures.map(createErrorCard).join('');
-                            
+                            const storeVersion = `${data.failures_count}:${data.latest_failure}`;
+                            if (storeVersion !== lastStoreVersion) {
+                                lastStoreVersion = storeVersion;
+                                loadFailures();
+                            }
                         } catch (e) { console.error("Update failed", e); }
                     }
 
-                    setInterval(update, 3000);
-                    update();
+                    const PAGE_SIZE = 20;
+                    let offset = 0;
+                    let lastStoreVersion = null;
+                    let filterTimer = null;
+
+                    async function loadFailures() {
+                        const params = new URLSearchParams({
+                            date: document.getElementById('filter-date').value.trim(),
+                            player: document.getElementById('filter-player').value.trim(),
+                            type: document.getElementById('filter-type').value,
+                            offset: offset,
+                            limit: PAGE_SIZE
+                        });
+                        try {
+                            const res = await fetch(`/api/failures?${params}`);
+                            const page = await res.json();
+                            document.getElementById('error-list').innerHTML = page.failures.map(createErrorCard).join('');
+                            const last = Math.min(page.offset + page.limit, page.total);
+                            document.getElementById('page-label').textContent = page.total ? `${page.offset + 1}–${last} of ${page.total}` : 'No matches';
+                            document.getElementById('prev-page').disabled = page.offset === 0;
+                            document.getElementById('next-page').disabled = last >= page.total;
+                        } catch (e) { console.error("Loading failures failed", e); }
+                    }
+
+                    function onFilterChange() {
+                        clearTimeout(filterTimer);
+                        filterTimer = setTimeout(() => { offset = 0; loadFailures(); }, 250);
+                    }
+
+                    ['filter-date', 'filter-player', 'filter-type'].forEach(id => document.getElementById(id).addEventListener('input', onFilterChange));
+                    document.getElementById('prev-page').addEventListener('click', () => { offset = Math.max(0, offset - PAGE_SIZE); loadFailures(); });
+                    document.getElementById('next-page').addEventListener('click', () => { offset += PAGE_SIZE; loadFailures(); });
+
+                    const events = new EventSource('/api/events');
+                    events.onmessage = (event) => render(JSON.parse(event.data));
                 </script>
             </body>
             </html>
             """
             self.wfile.write(html.encode())
 
+    def stream_events(self):
+        """Pushes the status whenever audit progress changes, plus a periodic refresh for the ETA, until the client disconnects."""
+        last_progress = None
+        last_write = 0.0
+        try:
+            while True:
+                status = build_status()
+                progress = {k: v for k, v in status.items() if k != "eta_seconds"}
+                now = time.time()
+                if progress != last_progress or now - last_write >= REFRESH_INTERVAL:
+                    self.wfile.write(f"data: {json.dumps(status)}\n\n".encode())
+                    self.wfile.flush()
+                    last_progress = progress
+                    last_write = now
+                time.sleep(EVENT_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
 if __name__ == '__main__':
-    server = http.server.HTTPServer(('0.0.0.0', PORT), AuditStatusHandler)
+    server = http.server.ThreadingHTTPServer(('0.0.0.0', PORT), AuditStatusHandler)
+    server.daemon_threads = True
     print(f"Dashboard serving at http://localhost:{PORT}")
     server.serve_forever()
@@ -0,0 +1,147 @@
+# ABOUTME: Persistent store of fact-audit verdicts keyed by puzzle date and page content hash.
+# ABOUTME: Skips unchanged puzzles on re-audit and is the source for the Markdown report and the audit dashboard.
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+STORE_PATH = PROJECT_DIR / "fact_audit_results.jsonl"
+
+# A mismatch is "debunked" when Phase 2 refuted at least one fact, otherwise "unconfirmed" (a possible Phase 1 false positive).
+FAILURE_TYPES = ("debunked", "unconfirmed")
+
+
+def content_hash(player_data: dict) -> str:
+    """Hashes the audited content of a puzzle: the player name plus every fact and Q&A answer."""
+    payload = json.dumps({"name": player_data["name"], "facts": player_data["facts"]}, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def failure_type(record: dict) -> str:
+    return "debunked" if record.get("failures") else "unconfirmed"
+
+
+def render_report(records, generated_at=None) -> str:
+    """Renders mismatch records as the Markdown audit report."""
+    generated_at = generated_at or time.strftime('%Y-%m-%d %H:%M:%S')
+    lines = ["# Player Fact Audit Report", f"Generated on: {generated_at}", ""]
+    for r in records:
+        lines.append(f"### ❌ {r['name']} ({r['date']})")
+        lines.append(f"- **Phase 1 Prediction:** {r['p1_predicted']}")
+        if r.get('reasoning'):
+            lines.append(f"- **Phase 1 Reasoning:** {r['reasoning']}")
+        if r['failures']:
+            lines.append("- **Debunked Facts:**")
+            for fail in r['failures']:
+                lines.append(f"  - **Fact:** {fail['fact']}")
+                lines.append(f"    - **Reason:** {fail['reasoning']}")
+                lines.append(f"    - **Source:** [{fail['source']}]({fail['source']})")
+        else:
+            lines.append("- *No specific facts debunked in Phase 2 (potential false positive in P1)*")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def parse_legacy_report(text: str):
+    """
+    Splits a hand-appended Markdown report into (audit records, other sections).
+    Audit records use the store's schema; any other "## " sections are returned verbatim.
+    """
+    records, other_sections = [], []
+    for block in re.split(r"(?m)^(?=##+ )", text):
+        if block.startswith("## "):
+            other_sections.append(block.rstrip() + "\n")
+            continue
+        if not block.startswith("### ❌ "):
+            continue
+        lines = block.strip().split('\n')
+        header = re.search(r"### ❌ (.*?) \((.*?)\)", lines[0])
+        if not header:
+            continue
+        record = {"date": header.group(2), "name": header.group(1), "p1_match": False,
+                  "p1_predicted": "Unknown", "reasoning": "", "failures": []}
+        current_fact = None
+        for line in lines[1:]:
+            line = line.strip()
+            if line.startswith("- **Phase 1 Prediction:**"):
+                record["p1_predicted"] = line.replace("- **Phase 1 Prediction:**", "").strip()
+            elif line.startswith("- **Phase 1 Reasoning:"):
+                record["reasoning"] = line.replace("- **Phase 1 Reasoning:", "").replace("**", "").strip()
+            elif line.startswith("- **Fact:**"):
+                current_fact = {"fact": line.replace("- **Fact:**", "").strip(), "is_accurate": False, "reasoning": "", "source": ""}
+                record["failures"].append(current_fact)
+            elif line.startswith("- **Reason:**") and current_fact:
+                current_fact["reasoning"] = line.replace("- **Reason:**", "").strip()
+            elif line.startswith("- **Source:**") and current_fact:
+                source = line.replace("- **Source:**", "").strip()
+                link = re.fullmatch(r"\[(.*)\]\((.*)\)", source)
+                current_fact["source"] = link.group(1) if link else source
+        records.append(record)
+    return records, other_sections
+
+
+class AuditStore:
+    """Append-only JSONL log of audit verdicts; the newest record for each date wins."""
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self.records = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.records[record["date"]] = record
+
+    def is_current(self, date: str, digest: str) -> bool:
+        """Returns True if the stored verdict for date was made against the same content."""
+        record = self.records.get(date)
+        return bool(record) and record.get("content_hash") == digest
+
+    def get(self, date: str):
+        return self.records.get(date)
+
+    def failures(self):
+        """Returns every stored identity mismatch, newest puzzle first."""
+        return [self.records[date] for date in sorted(self.records, reverse=True) if not self.records[date].get("p1_match", True)]
+
+    def query(self, date=None, player=None, kind=None, offset=0, limit=50):
+        """
+        Filters mismatches by date prefix (e.g. "2025-04"), case-insensitive player substring
+        and failure type (one of FAILURE_TYPES). Returns (total matching, the requested page).
+        """
+        matches = self.failures()
+        if date:
+            matches = [r for r in matches if r["date"].startswith(date)]
+        if player:
+            needle = player.lower()
+            matches = [r for r in matches if needle in r["name"].lower() or needle in str(r.get("p1_predicted", "")).lower()]
+        if kind:
+            matches = [r for r in matches if failure_type(r) == kind]
+        return len(matches), matches[offset:offset + limit]
+
+    def record(self, entry: dict, digest: str) -> dict:
+        """Appends a verdict for entry['date'] and returns the stored record."""
+        record = {**entry, "content_hash": digest, "audited_at": time.strftime('%Y-%m-%d %H:%M:%S')}
+        self.records[record["date"]] = record
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return record
+
+    def compact(self):
+        """Rewrites the log with only the newest record for each date."""
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for date in sorted(self.records):
+                f.write(json.dumps(self.records[date], ensure_ascii=False) + "\n")
+        temp_path.replace(self.path)
+
+    def clear(self):
+        self.records = {}
+        self.path.unlink(missing_ok=True)
@@ -266,18 +266,17 @@ class AutomatedWorkflow:
                 
             # Find and process multiple candidates
             logger.info(f"Searching for Yankee image candidates for {player_name}")
-            candidate_paths = self.player_image_search.download_and_process_player_image(player_name, date_str, self.api_key)
+            # The first (best) candidate becomes the default answer image
+            default_path = self.images_dir / f"answer-{date_str}.webp"
+            candidate_paths = self.player_image_search.download_and_process_player_image(
+                player_name, date_str, self.api_key, answer_path=default_path)
             
             if not candidate_paths:
                 logger.warning(f"No valid images found for {player_name}")
                 return None
-            
-            # The first one is the default "best" match
-            default_path = self.images_dir / f"answer-{date_str}.webp"
-            
-            # Copy the first candidate to the final location as a default
-            import shutil
-            shutil.copy2(candidate_paths[0], default_path)
+            if not default_path.exists():
+                logger.warning(f"Could not write the answer image for {player_name}")
+                return None
             
             logger.info(f"Saved {len(candidate_paths)} candidates to temp_player_images/")
             logger.info(f"Defaulting to: {default_path}")
@@ -295,14 +294,17 @@ class AutomatedWorkflow:
             files_to_add = [
                 f"images/clue-{date_str}.webp",
                 f"images/answer-{date_str}.webp",
+                # The page's <picture> and srcset point at the variants the manifest records
+                f"images/variants/clue-{date_str}-*w.*",
+                f"images/variants/answer-{date_str}-*w.*",
+                "images/image_manifest.json",
                 f"{date_str}.html"
             ]
             
             # Only add files that exist
             existing_files = []
             for file_pattern in files_to_add:
-                file_path = self.project_dir / file_pattern
-                if file_path.exists():
+                for file_path in sorted(self.project_dir.glob(file_pattern)):
                     existing_files.append(str(file_path))
             
             if existing_files:
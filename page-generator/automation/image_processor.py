@@ -4,14 +4,49 @@ Image processing automation for puzzle workflow.
 Handles conversion, optimization, and validation of puzzle and player images.
 """
 
+import hashlib
+import io
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import numpy as np
 from PIL import Image, ImageOps
 from typing import List, Tuple, Optional
 import logging
 
+from image_manifest import file_revision, image_entry, load_image_manifest, record_entries
+from image_quality import choose_quality, quality_record
+from image_variants import write_variants
+
 logger = logging.getLogger(__name__)
 
+# Downloads are decoded at no less than this multiple of the output size, leaving room for a crop
+DRAFT_HEADROOM = 2
+
+
+def dhash(img: Image.Image, hash_size: int = 8) -> str:
+    """
+    Difference hash: whether each pixel of a (hash_size+1) x hash_size grayscale thumbnail is
+    brighter than its left neighbour. Resized, recompressed or lightly edited copies hash alike.
+    
+    Args:
+        img: PIL Image to hash
+        hash_size: Bits per row and number of rows
+        
+    Returns:
+        The hash_size * hash_size bits as a hex string
+    """
+    thumbnail = img.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    return np.packbits(pixels[:, 1:] > pixels[:, :-1]).tobytes().hex()
+
+
+def hash_distance(first: str, second: str) -> int:
+    """Number of differing bits between two dhash values."""
+    return bin(int(first, 16) ^ int(second, 16)).count('1')
+
+
 class ImageProcessor:
     """Handles automated image processing for puzzle workflow."""
     
@@ -50,17 +85,41 @@ class ImageProcessor:
             return img.convert('RGB')
         return img
 
-    def convert_to_webp(self, input_path: Path, output_path: Path) -> bool:
+    def convert_to_webp(self, input_path: Path, output_path: Path, variants: bool = False,
+                        image_class: Optional[str] = None) -> bool:
         """
         Convert an image to WEBP format with optimization.
         
         Args:
             input_path: Path to source image
             output_path: Path for output WEBP file
+            variants: Also write the responsive WEBP and AVIF variants the pages offer
+            image_class: 'clue' or 'answer' to pick the quality by that class's SSIM policy instead of self.quality
             
         Returns:
             True if conversion successful, False otherwise
         """
+        entry = self._encode_webp(input_path, output_path, variants, image_class)
+        if entry is None:
+            return False
+        if entry:
+            record_entries(output_path.parent, {output_path.name: entry})
+        return True
+    
+    def _encode_webp(self, input_path: Path, output_path: Path, variants: bool = False,
+                     image_class: Optional[str] = None) -> Optional[dict]:
+        """
+        Convert an image to WEBP without touching the sidecar manifest, so it is safe in worker processes.
+        
+        Args:
+            input_path: Path to source image
+            output_path: Path for output WEBP file
+            variants: Also write the responsive WEBP and AVIF variants
+            image_class: 'clue' or 'answer' to pick the quality by that class's SSIM policy
+            
+        Returns:
+            The output's image manifest entry ({} if it could not be described), or None if conversion failed
+        """
         try:
             with Image.open(input_path) as img:
                 # Convert to RGB if necessary (for PNG with transparency)
@@ -72,16 +131,150 @@ class ImageProcessor:
                 # Resize if necessary
                 img = self._resize_if_needed(img)
                 
-                # Save as WEBP
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                img.save(output_path, 'WEBP', quality=self.quality, method=6)
-                
+                entry = self._write_webp(img, output_path, variants, image_class)
                 logger.info(f"Converted {input_path.name} to WEBP: {output_path.name}")
-                return True
+                return entry
                 
         except Exception as e:
             logger.error(f"Error converting {input_path} to WEBP: {e}")
+            return None
+    
+    def _write_webp(self, img: Image.Image, output_path: Path, variants: bool = False,
+                    image_class: Optional[str] = None) -> dict:
+        """
+        Encode an RGB, upright, resized image to output_path. Raises if the file cannot be written.
+        
+        Args:
+            img: PIL Image ready to save
+            output_path: Path for output WEBP file
+            variants: Also write the responsive WEBP and AVIF variants
+            image_class: 'clue' or 'answer' to pick the quality by that class's SSIM policy
+            
+        Returns:
+            The output's image manifest entry ({} if it could not be described)
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        quality = self.quality
+        if image_class:
+            # Lowest quality whose decode stays above the class's SSIM threshold
+            quality, data, score = choose_quality(img, image_class)
+            output_path.write_bytes(data)
+            logger.info(f"Chose WEBP quality {quality} for {output_path.name} (SSIM {score:.4f})")
+        else:
+            img.save(output_path, 'WEBP', quality=quality, method=6)
+        
+        entry = self._describe_output(output_path, img, variants, quality)
+        if entry and image_class:
+            entry['quality_audit'] = quality_record(image_class, quality)
+        return entry
+    
+    def decode_image_bytes(self, data: bytes, min_width: int = 200,
+                           min_height: int = 200) -> Optional[Tuple[Image.Image, float]]:
+        """
+        Decode a downloaded image once, upright and in RGB, so it can be checked, cropped and saved
+        without going through temporary files. JPEGs are decoded at reduced scale when they are much
+        larger than the output size.
+        
+        Args:
+            data: The downloaded file's bytes
+            min_width: Minimum width of the original image
+            min_height: Minimum height of the original image
+            
+        Returns:
+            (image, scale), where scale converts the decoded image's pixels back to the original's,
+            or None if the image is unreadable or below the minimum size
+        """
+        try:
+            img = Image.open(io.BytesIO(data))
+            # The header gives the size, so small images are rejected before any pixels are decoded
+            width, height = img.size
+            if width < min_width or height < min_height:
+                logger.info(f"Image too small ({width}x{height}). Minimum required is {min_width}x{min_height}.")
+                return None
+            
+            img.draft('RGB', (self.max_width * DRAFT_HEADROOM, self.max_height * DRAFT_HEADROOM))
+            img = ImageOps.exif_transpose(img)
+            img = self._ensure_rgb(img)
+            return img, max(width, height) / max(img.size)
+        except Exception as e:
+            logger.error(f"Error decoding downloaded image: {e}")
+            return None
+    
+    def crop_image(self, img: Image.Image, crop_box: List[int], scale: float = 1.0,
+                   min_width: int = 100, min_height: int = 100) -> Optional[Image.Image]:
+        """
+        Crop a decoded image to a bounding box in normalized coordinates.
+        
+        Args:
+            img: PIL Image to crop
+            crop_box: List of [ymin, xmin, ymax, xmax] in 0-1000 scale
+            scale: Factor from img's pixels to the original image's, for the minimum size check
+            min_width: Minimum width of the cropped region in original pixels
+            min_height: Minimum height of the cropped region in original pixels
+            
+        Returns:
+            The cropped image, img itself if the box is unusable, or None if the crop is too small
+        """
+        rectangle = self._crop_rectangle(img.size, crop_box)
+        if rectangle is None:
+            logger.warning(f"Invalid crop box: {crop_box}")
+            return img
+        
+        left, top, right, bottom = rectangle
+        width, height = round((right - left) * scale), round((bottom - top) * scale)
+        if width < min_width or height < min_height:
+            logger.info(f"Cropped image too small ({width}x{height}).")
+            return None
+        return img.crop(rectangle)
+    
+    def save_webp(self, img: Image.Image, output_path: Path, variants: bool = False,
+                  image_class: Optional[str] = None, record: bool = True) -> bool:
+        """
+        Resize and encode an already decoded image, recording it in the sidecar manifest.
+        
+        Args:
+            img: Upright RGB PIL Image, e.g. from decode_image_bytes
+            output_path: Path for output WEBP file
+            variants: Also write the responsive WEBP and AVIF variants the pages offer
+            image_class: 'clue' or 'answer' to pick the quality by that class's SSIM policy
+            record: False for staged candidates, which are recorded when promoted into images/
+            
+        Returns:
+            True if the image was written, False otherwise
+        """
+        try:
+            entry = self._write_webp(self._resize_if_needed(img), output_path, variants, image_class)
+        except Exception as e:
+            logger.error(f"Error saving {output_path} as WEBP: {e}")
             return False
+        if entry and record:
+            record_entries(output_path.parent, {output_path.name: entry})
+        logger.info(f"Saved WEBP: {output_path.name}")
+        return True
+    
+    def _describe_output(self, output_path: Path, img: Image.Image, variants: bool = False,
+                         quality: Optional[int] = None) -> dict:
+        """
+        Build the written image's manifest entry: its size, placeholder and, if requested, variants.
+        
+        Args:
+            output_path: Path the image was saved to
+            img: The PIL Image that was saved, so the file need not be decoded again
+            variants: Also write the responsive variants and record them
+            quality: WEBP quality the image was saved at, reused for the variants
+            
+        Returns:
+            The manifest entry, or {} if it could not be built
+        """
+        try:
+            entry = image_entry(img, output_path)
+            if variants:
+                entry['variants'] = write_variants(output_path, img, webp_quality=quality or self.quality)
+            return entry
+        except Exception as e:
+            # The pages still render without it; the next manifest refresh measures the file
+            logger.warning(f"Could not record dimensions for {output_path.name}: {e}")
+            return {}
     
     def _resize_if_needed(self, img: Image.Image) -> Image.Image:
         """
@@ -121,7 +314,7 @@ class ImageProcessor:
         
         clue_path = images_dir / f"clue-{date_str}.webp"
         
-        if self.convert_to_webp(screenshot_path, clue_path):
+        if self.convert_to_webp(screenshot_path, clue_path, variants=True, image_class='clue'):
             logger.info(f"Processed puzzle clue: {clue_path.name}")
             return clue_path
         
@@ -145,34 +338,98 @@ class ImageProcessor:
         
         answer_path = images_dir / f"answer-{date_str}.webp"
         
-        if self.convert_to_webp(player_image_path, answer_path):
+        if self.convert_to_webp(player_image_path, answer_path, variants=True, image_class='answer'):
             logger.info(f"Processed player answer image: {answer_path.name}")
             return answer_path
         
         return None
     
-    def batch_process_images(self, input_dir: Path, output_dir: Path, pattern: str = "*.png") -> List[Path]:
+    def _settings_key(self) -> str:
+        """Identifies the encoder settings, so a change of quality or size re-converts every input."""
+        return f"webp-q{self.quality}-{self.max_width}x{self.max_height}"
+    
+    def _is_current(self, output_file: Path, entry: Optional[dict], source_hash: str) -> bool:
+        """
+        Check whether output_file was converted from this exact input with the current settings.
+        
+        Args:
+            output_file: Path the converted image would be written to
+            entry: The output's image manifest entry, if any
+            source_hash: SHA-256 of the input file
+            
+        Returns:
+            True if the output can be kept as it is
+        """
+        if not entry or not output_file.exists():
+            return False
+        source = entry.get('source', {})
+        if source.get('sha256') != source_hash or source.get('settings') != self._settings_key():
+            return False
+        # An output edited or replaced since it was converted is converted again
+        return entry.get('revision') == file_revision(output_file)
+    
+    def batch_process_images(self, input_dir: Path, output_dir: Path, pattern: str = "*.png",
+                             workers: Optional[int] = None) -> List[dict]:
         """
         Batch process images from input directory to output directory.
         
+        Inputs whose SHA-256 and encoder settings match those recorded for their output in the
+        sidecar manifest are skipped. The rest are converted on a process pool.
+        
         Args:
             input_dir: Directory containing source images
             output_dir: Directory for processed images
             pattern: File pattern to match (default: *.png)
+            workers: Encoder processes (default: one per CPU; 1 converts in this process)
             
         Returns:
-            List of successfully processed image paths
+            One dict per successfully processed or skipped image, with 'input', 'output',
+            'seconds' (time spent converting it) and 'skipped' keys
         """
-        processed_files = []
+        started = time.perf_counter()
+        manifest = load_image_manifest(output_dir)
+        results = []
+        pending = []
+        source_hashes = {}
         
-        for input_file in input_dir.glob(pattern):
+        for input_file in sorted(input_dir.glob(pattern)):
             output_file = output_dir / f"{input_file.stem}.webp"
-            
-            if self.convert_to_webp(input_file, output_file):
-                processed_files.append(output_file)
+            source_hashes[output_file.name] = hashlib.sha256(input_file.read_bytes()).hexdigest()
+            if self._is_current(output_file, manifest.get(output_file.name), source_hashes[output_file.name]):
+                results.append({'input': input_file, 'output': output_file, 'seconds': 0.0, 'skipped': True})
+            else:
+                pending.append((input_file, output_file))
+        
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers > 1:
+            tasks = [(self.quality, self.max_width, self.max_height, input_file, output_file) for input_file, output_file in pending]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                converted = list(pool.map(_convert_in_worker, tasks))
+        else:
+            converted = [self._timed_encode(input_file, output_file) for input_file, output_file in pending]
+        
+        # Workers only write images; their manifest entries are recorded here in one write
+        entries = {}
+        for (input_file, output_file), (entry, seconds) in zip(pending, converted):
+            if entry is None:
+                continue
+            if entry:
+                entry['source'] = {'sha256': source_hashes[output_file.name], 'settings': self._settings_key()}
+                entries[output_file.name] = entry
+            results.append({'input': input_file, 'output': output_file, 'seconds': seconds, 'skipped': False})
+        if entries:
+            record_entries(output_dir, entries)
         
-        logger.info(f"Batch processed {len(processed_files)} images")
-        return processed_files
+        converted_count = sum(1 for result in results if not result['skipped'])
+        logger.info(f"Batch processed {converted_count} images, skipped {len(results) - converted_count} unchanged "
+                    f"({len(pending) - converted_count} failed) in {time.perf_counter() - started:.2f}s")
+        return results
+    
+    def _timed_encode(self, input_path: Path, output_path: Path) -> Tuple[Optional[dict], float]:
+        """Convert one image, returning its manifest entry (None on failure) and the seconds it took."""
+        started = time.perf_counter()
+        entry = self._encode_webp(input_path, output_path)
+        return entry, time.perf_counter() - started
     
     def validate_image_quality(self, image_path: Path, min_width: int = 200, min_height: int = 200) -> bool:
         """
@@ -232,27 +489,13 @@ class ImageProcessor:
             
         try:
             with Image.open(image_path) as img:
-                width, height = img.size
-                
-                # Convert normalized coordinates to pixel coordinates
-                # crop_box is [ymin, xmin, ymax, xmax]
-                top = int((crop_box[0] / 1000) * height)
-                left = int((crop_box[1] / 1000) * width)
-                bottom = int((crop_box[2] / 1000) * height)
-                right = int((crop_box[3] / 1000) * width)
-                
-                # Ensure coordinates are within image bounds and valid
-                left = max(0, left)
-                top = max(0, top)
-                right = min(width, right)
-                bottom = min(height, bottom)
-                
-                if right <= left or bottom <= top:
+                rectangle = self._crop_rectangle(img.size, crop_box)
+                if rectangle is None:
                     logger.warning(f"Invalid crop box for {image_path}: {crop_box}")
                     return False
                 
                 # Perform crop
-                cropped_img = img.crop((left, top, right, bottom))
+                cropped_img = img.crop(rectangle)
                 
                 # Ensure we can save as JPEG if the extension is .jpg/.jpeg
                 if image_path.suffix.lower() in ('.jpg', '.jpeg'):
@@ -270,3 +513,34 @@ class ImageProcessor:
         except Exception as e:
             logger.error(f"Error cropping {image_path}: {e}")
             return False
+
+
+    def _crop_rectangle(self, size: Tuple[int, int], crop_box: List[int]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Convert a normalized crop box to a pixel rectangle within an image.
+        
+        Args:
+            size: (width, height) of the image
+            crop_box: List of [ymin, xmin, ymax, xmax] in 0-1000 scale
+            
+        Returns:
+            (left, top, right, bottom) clamped to the image, or None if the box is empty or malformed
+        """
+        if not crop_box or len(crop_box) != 4:
+            return None
+        width, height = size
+        
+        # Convert normalized coordinates to pixel coordinates
+        top = max(0, int((crop_box[0] / 1000) * height))
+        left = max(0, int((crop_box[1] / 1000) * width))
+        bottom = min(height, int((crop_box[2] / 1000) * height))
+        right = min(width, int((crop_box[3] / 1000) * width))
+        
+        if right <= left or bottom <= top:
+            return None
+        return left, top, right, bottom
+
+def _convert_in_worker(task) -> Tuple[Optional[dict], float]:
+    """Process pool entry point for batch_process_images: converts one image with the parent's settings."""
+    quality, max_width, max_height, input_path, output_path = task
+    return ImageProcessor(quality, max_width, max_height)._timed_encode(input_path, output_path)
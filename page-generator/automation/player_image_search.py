@@ -25,10 +25,15 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
-from .image_processor import ImageProcessor
+from .image_processor import ImageProcessor, dhash, hash_distance
 
 logger = logging.getLogger(__name__)
 
+# Hashes of candidates the AI rejected, per player, so reruns don't pay to analyze them again
+REJECTED_HASHES_NAME = ".rejected_image_hashes.json"
+# dhash bits two copies of one picture may differ by (resizing, recompression, a watermark)
+DUPLICATE_DISTANCE = 6
+
 class PlayerImageSearch:
     """Handles automated player image search and download with prioritized verification."""
     
@@ -44,6 +49,7 @@ class PlayerImageSearch:
         self.temp_dir = temp_dir or Path.cwd() / "temp_player_images"
         self.temp_dir.mkdir(exist_ok=True)
         self.image_processor = ImageProcessor()
+        self.rejected_hashes_path = Path(images_dir).parent / REJECTED_HASHES_NAME
         
         # User agent for requests
         self.headers = {
@@ -61,11 +67,15 @@ class PlayerImageSearch:
         3. Any image of the player
         """
         search_term = f"{player_name} yankees card"
+        # Shared by both engines, so a picture hosted on several sites is analyzed once
+        seen_hashes = []
+        rejected_hashes = self._load_rejected_hashes(player_name)
+        known_rejections = len(rejected_hashes)
         
         # Try Bing as primary search engine
         logger.info(f"🚀 Searching Bing Images for: {search_term}")
         bing_candidates = self._get_image_candidates_from_bing(search_term)
-        best_matches, fallbacks = self._evaluate_candidates(bing_candidates, player_name, api_key)
+        best_matches, fallbacks = self._evaluate_candidates(bing_candidates, player_name, api_key, seen_hashes, rejected_hashes)
         
         # Determine if we need to fall back to Google (if no high priority matches found)
         has_high_priority = any(m['priority'] in [1, 2] for m in best_matches)
@@ -78,10 +88,13 @@ class PlayerImageSearch:
             new_google_candidates = [c for c in google_candidates if c['direct_url'] not in bing_urls]
             
             if new_google_candidates:
-                g_best, g_fallback = self._evaluate_candidates(new_google_candidates, player_name, api_key)
+                g_best, g_fallback = self._evaluate_candidates(new_google_candidates, player_name, api_key, seen_hashes, rejected_hashes)
                 best_matches.extend(g_best)
                 fallbacks.extend(g_fallback)
         
+        if len(rejected_hashes) > known_rejections:
+            self._save_rejected_hashes(player_name, rejected_hashes)
+        
         # Combine results: Best matches first, then fill with fallbacks until we have 3
         # Sort best matches by priority
         best_matches.sort(key=lambda x: x.get('priority', 3))
@@ -89,12 +102,6 @@ class PlayerImageSearch:
         final_results = best_matches + fallbacks
         final_results = final_results[:3]
         
-        # Cleanup any candidates that didn't make the final cut
-        # This is a bit tricky since some might be the same object, but unlink handles missing
-        for cand in (best_matches + fallbacks):
-            if cand not in final_results and 'temp_file' in cand:
-                cand['temp_file'].unlink(missing_ok=True)
-
         if final_results:
             logger.info(f"  🏁 Finished search. Providing {len(final_results)} candidates for review.")
             return final_results
@@ -102,11 +109,22 @@ class PlayerImageSearch:
         logger.warning(f"  ❌ No suitable images found for {player_name} after searching both engines.")
         return []
 
-    def _evaluate_candidates(self, candidates: List[dict], player_name: str, api_key: str) -> Tuple[List[dict], List[dict]]:
-        """Evaluates a list of candidates using Gemini and returns (best_matches, fallbacks)."""
+    def _evaluate_candidates(self, candidates: List[dict], player_name: str, api_key: str,
+                             seen_hashes: Optional[List[str]] = None,
+                             rejected_hashes: Optional[List[str]] = None) -> Tuple[List[dict], List[dict]]:
+        """
+        Evaluates a list of candidates using Gemini and returns (best_matches, fallbacks).
+        
+        Candidates whose perceptual hash is near one in seen_hashes (evaluated earlier in this search)
+        or rejected_hashes (rejected before for this player) are skipped without an analysis call.
+        Both lists are extended in place with the hashes evaluated and rejected here.
+        """
         best_matches = []
         fallbacks = []
         max_candidates_to_check = 25
+        seen_hashes = [] if seen_hashes is None else seen_hashes
+        rejected_hashes = [] if rejected_hashes is None else rejected_hashes
+        duplicates = 0
         
         if not candidates:
             return [], []
@@ -121,46 +139,45 @@ class PlayerImageSearch:
             logger.info(f"Source: {candidate['source_page'][:80]}...")
             
             # Step 2 & 3: Download full scale and check suitability
-            temp_file = self._download_full_size_image(candidate)
-            if not temp_file:
+            data = self._download_image_bytes(candidate)
+            if not data:
                 continue
                 
-            # Check suitability (size & format)
-            img_info = self.image_processor.get_image_info(temp_file)
-            if img_info:
-                width, height = img_info.get('width', 0), img_info.get('height', 0)
-                if width < 200 or height < 200:
-                    logger.info(f"  ❌ Image too small ({width}x{height}). Minimum required is 200x200. Skipping.")
-                    temp_file.unlink(missing_ok=True)
-                    continue
-            else:
-                logger.info("  ❌ Could not determine image dimensions. Skipping.")
-                temp_file.unlink(missing_ok=True)
+            # Decoded once here; the same pixels are analyzed, cropped and finally saved
+            decoded = self.image_processor.decode_image_bytes(data, min_width=200, min_height=200)
+            if decoded is None:
+                logger.info("  ❌ Image unreadable or smaller than 200x200. Skipping.")
                 continue
+            image, scale = decoded
+
+            # The same card scan is often hosted on several sites, or resized; analyze it only once
+            image_hash = dhash(image)
+            if self._is_near_duplicate(image_hash, seen_hashes + rejected_hashes):
+                logger.info("  ⏭️ Same image as a candidate already evaluated or rejected. Skipping.")
+                duplicates += 1
+                continue
+            seen_hashes.append(image_hash)
 
             # Step 4: Use Gemini to verify priority
             if api_key:
                 try:
                     import ai_services
-                    analysis = ai_services.analyze_player_image(temp_file, player_name, api_key)
+                    analysis = ai_services.analyze_player_image(image, player_name, api_key)
                     priority = analysis.get('priority', 3)
                     crop_box = analysis.get('crop_box')
                     
                     if priority in [1, 2]:
                         # Perform smart crop if requested by AI
                         if crop_box:
-                            if self.image_processor.crop_to_bounding_box(temp_file, crop_box):
-                                # Re-validate dimensions after crop
-                                img_info = self.image_processor.get_image_info(temp_file)
-                                if img_info:
-                                    w, h = img_info.get('width', 0), img_info.get('height', 0)
-                                    if w < 100 or h < 100: # Slightly more lenient after crop
-                                        logger.info(f"  ❌ Cropped image too small ({w}x{h}). Skipping.")
-                                        temp_file.unlink(missing_ok=True)
-                                        continue
+                            # Slightly more lenient minimum after crop
+                            image = self.image_processor.crop_image(image, crop_box, scale, min_width=100, min_height=100)
+                            if image is None:
+                                logger.info("  ❌ Cropped image too small. Skipping.")
+                                rejected_hashes.append(image_hash)
+                                continue
                         
                         logger.info(f"  ✨ Found High Priority Match (Level {priority})!")
-                        candidate['temp_file'] = temp_file
+                        candidate['image'] = image
                         candidate['priority'] = priority
                         best_matches.append(candidate)
                         
@@ -173,30 +190,59 @@ class PlayerImageSearch:
                     elif priority == 3:
                         if len(fallbacks) < 3:
                             logger.info(f"  📍 Found Priority 3 (Fallback). Staging as option {len(fallbacks)+1}...")
-                            candidate['temp_file'] = temp_file
+                            candidate['image'] = image
                             candidate['priority'] = 3
                             fallbacks.append(candidate)
                         else:
                             logger.info("  ⏭️ Already have 3 fallbacks. Skipping.")
-                            temp_file.unlink(missing_ok=True)
                     else:
                         logger.info(f"  ❌ Image rejected by AI (Priority {priority}).")
-                        temp_file.unlink(missing_ok=True)
+                        rejected_hashes.append(image_hash)
                         
                 except Exception as e:
                     logger.error(f"  ⚠️ Error during AI analysis: {e}")
-                    temp_file.unlink(missing_ok=True)
             else:
                 # No API key, just take the first 3 suitable images
                 logger.warning("  ⚠️ No API key provided for verification.")
-                candidate['temp_file'] = temp_file
+                candidate['image'] = image
                 candidate['priority'] = 99
                 best_matches.append(candidate)
                 if len(best_matches) >= 3:
                     break
         
+        if duplicates:
+            logger.info(f"  ♻️ Skipped {duplicates} duplicate images without analyzing them.")
         return best_matches, fallbacks
 
+    @staticmethod
+    def _is_near_duplicate(image_hash: str, known_hashes: List[str]) -> bool:
+        return any(hash_distance(image_hash, known) <= DUPLICATE_DISTANCE for known in known_hashes)
+
+    @staticmethod
+    def _player_key(player_name: str) -> str:
+        return " ".join(player_name.lower().split())
+
+    def _load_all_rejected_hashes(self) -> Dict[str, List[str]]:
+        if not self.rejected_hashes_path.exists():
+            return {}
+        try:
+            with open(self.rejected_hashes_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"  ⚠️ Could not read {self.rejected_hashes_path.name}: {e}")
+            return {}
+
+    def _load_rejected_hashes(self, player_name: str) -> List[str]:
+        """Hashes of the candidates rejected in earlier searches for this player."""
+        return list(self._load_all_rejected_hashes().get(self._player_key(player_name), []))
+
+    def _save_rejected_hashes(self, player_name: str, hashes: List[str]):
+        all_hashes = self._load_all_rejected_hashes()
+        all_hashes[self._player_key(player_name)] = sorted(set(hashes))
+        temp_path = self.rejected_hashes_path.with_name(self.rejected_hashes_path.name + ".tmp")
+        temp_path.write_text(json.dumps(all_hashes, indent=1, sort_keys=True), encoding='utf-8')
+        temp_path.replace(self.rejected_hashes_path)
+
     def _get_image_candidates_from_google(self, search_term: str) -> List[dict]:
         """Uses Selenium to extract image candidate URLs using a robust hybrid strategy."""
         options = webdriver.ChromeOptions()
@@ -368,10 +414,8 @@ class PlayerImageSearch:
             
         return unique_candidates
 
-    def _download_full_size_image(self, candidate: dict) -> Optional[Path]:
-        """Downloads the full-size image, prioritizing the direct URL but falling back to page scraping."""
-        temp_path = self.temp_dir / f"download_{hash(candidate['direct_url'])}.jpg"
-        
+    def _download_image_bytes(self, candidate: dict) -> Optional[bytes]:
+        """Downloads the full-size image into memory, prioritizing the direct URL but falling back to page scraping."""
         # Strategy A: Try direct download from imgurl
         try:
             logger.debug(f"  Attempting direct download: {candidate['direct_url'][:60]}...")
@@ -383,9 +427,7 @@ class PlayerImageSearch:
                 
             response = requests.get(candidate['direct_url'], headers=headers, timeout=10)
             if response.status_code == 200 and len(response.content) > 5000: # Simple check for non-thumbnail
-                with open(temp_path, 'wb') as f:
-                    f.write(response.content)
-                return temp_path
+                return response.content
         except Exception as e:
             logger.debug(f"  Direct download failed: {e}")
 
@@ -397,9 +439,7 @@ class PlayerImageSearch:
                 if scraped_url:
                     response = requests.get(scraped_url, headers=self.headers, timeout=10)
                     if response.status_code == 200:
-                        with open(temp_path, 'wb') as f:
-                            f.write(response.content)
-                        return temp_path
+                        return response.content
             except Exception as e:
                 logger.debug(f"  Source site scraping failed: {e}")
                 
@@ -449,8 +489,14 @@ class PlayerImageSearch:
             return None
         except Exception:
             return None
-    def download_and_process_player_image(self, player_name: str, date_str: str, api_key: str = None) -> List[Path]:
-        """Complete workflow orchestrator for finding and saving multiple player image candidates."""
+    def download_and_process_player_image(self, player_name: str, date_str: str, api_key: str = None,
+                                          answer_path: Optional[Path] = None) -> List[Path]:
+        """
+        Complete workflow orchestrator for finding and saving multiple player image candidates.
+        
+        When answer_path is given, the best candidate is also written there as the puzzle's answer image,
+        encoded once from its in-memory decode under the answer quality policy and with its variants.
+        """
         staging_dir = self.images_dir.parent / "temp_player_images"
         staging_dir.mkdir(exist_ok=True)
         
@@ -479,23 +525,23 @@ class PlayerImageSearch:
         final_paths = []
         
         for i, result in enumerate(results):
-            temp_file = result.get('temp_file')
-            if not temp_file or not temp_file.exists():
+            image = result.get('image')
+            if image is None:
                 continue
                 
             # Name: answer-YYYY-MM-DD-N.webp
             target_name = f"answer-{date_str}-{i+1}.webp"
             target_path = staging_dir / target_name
             
-            # Process and convert to webp
-            try:
-                self.image_processor.convert_to_webp(temp_file, target_path)
+            # Resize and encode the already decoded (and cropped) image: the only disk write per candidate.
+            # Candidates are throwaway, so only the one promoted into images/ goes into the manifest
+            if self.image_processor.save_webp(image, target_path, record=False):
                 final_paths.append(target_path)
-            except Exception as e:
-                logger.error(f"Error converting {temp_file} to webp: {e}")
             
-            # Clean up original temp download
-            temp_file.unlink(missing_ok=True)
+            if i == 0 and answer_path is not None:
+                # Encoding from the source pixels, not the staged copy, keeps the answer to a single lossy encode
+                if not self.image_processor.save_webp(image, answer_path, variants=True, image_class='answer'):
+                    logger.error(f"Could not write answer image {answer_path.name}")
             
         # Final cleanup of any stray downloads in the temp folder
         self.cleanup_temp_files()
@@ -12,8 +12,17 @@ from bs4 import BeautifulSoup
 # Add page-generator to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from batch.utils import StateManager
+from batch.utils import StateManager, extract_response_text
 import fact_verifier
+from puzzle_store import rendered_followup_qa, update_puzzle_record
+
+def patched_record_fields(new_data):
+    """The canonical-record fields matching what patch_html writes into the page."""
+    return {
+        'facts': list(new_data.get('facts', [])),
+        # Normalized as build_puzzle_record does, so a re-render shows exactly what patch_html wrote
+        'followup_qa': rendered_followup_qa(new_data.get('qa', []))
+    }
 
 def patch_html(html_content, new_data, player_name):
     """
@@ -49,13 +58,13 @@ def patch_html(html_content, new_data, player_name):
         followup_section.append(h3)
         
         buttons_div = soup.new_tag('div', attrs={'class': 'followup-buttons'})
-        for qa in new_data.get('qa', []):
+        for qa in rendered_followup_qa(new_data.get('qa', [])):
             item_div = soup.new_tag('div', attrs={'class': 'followup-item'})
             btn = soup.new_tag('button', attrs={
                 'class': 'followup-btn',
-                'data-answer': qa.get('answer', '')
+                'data-answer': qa['answer']
             })
-            btn.string = qa.get('question', '')
+            btn.string = qa['question']
             item_div.append(btn)
             
             answer_div = soup.new_tag('div', attrs={'class': 'followup-answer', 'style': 'display:none;'})
@@ -131,7 +140,8 @@ def main(project_root):
     state_file = root_path / "page-generator" / "batch" / "state.json"
     responses_file = root_path / "temp" / "responses.jsonl"
     dossier_dir = root_path / "temp" / "dossiers"
-    audit_report_path = root_path / "FACT_AUDIT_REPORT.md"
+    # FACT_AUDIT_REPORT.md is rendered from the fact auditor's verdict store, so batch verification failures get their own log
+    verification_report_path = root_path / "BATCH_VERIFICATION_REPORT.md"
     
     manager = StateManager(state_file)
     
@@ -151,13 +161,7 @@ def main(project_root):
                 continue
             
             try:
-                content_text = ""
-                # Developer API structure: {"response": {"candidates": [{"content": {"parts": [{"text": "..."}]}}]}}
-                response_obj = resp_data.get('response', {})
-                body = response_obj.get('body', {})
-                candidates = body.get('candidates', []) if body else response_obj.get('candidates', [])
-                if candidates:
-                    content_text = candidates[0].get('content', {}).get('parts', [{}])[0].get('text', '')
+                content_text = extract_response_text(resp_data)
                 
                 if not content_text:
                     print("Could not extract content for a response line.")
@@ -202,6 +206,7 @@ def main(project_root):
                         
                         with open(html_file, 'w', encoding='utf-8') as hf:
                             hf.write(updated_html)
+                        update_puzzle_record(root_path, date_str, **patched_record_fields(content_json))
                         
                         manager.set_status(date_str, "completed")
                         print(f"Successfully updated {date_str}")
@@ -210,7 +215,7 @@ def main(project_root):
                 else:
                     # Verification failed
                     manager.set_status(date_str, "failed")
-                    with open(audit_report_path, 'a', encoding='utf-8') as af:
+                    with open(verification_report_path, 'a', encoding='utf-8') as af:
                         af.write(f"## {date_str} - {dossier.get('name')}\n")
                         af.write("Fact verification failed for the following claims:\n")
                         for claim in claims:
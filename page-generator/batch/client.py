@@ -3,14 +3,82 @@
 
 from google import genai
 from google.genai import types
+import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add page-generator to path to import config_manager
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import config_manager
 
+DEFAULT_MODEL = "gemini-3.1-flash-lite"
+# Keeps each uploaded request file far below the Batch API input file limit.
+DEFAULT_CHUNK_BYTES = 50 * 1024 * 1024
+TERMINAL_STATES = ("SUCCEEDED", "FAILED", "CANCELLED", "EXPIRED")
+
+def split_requests(jsonl_path, max_chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Splits a requests JSONL file into chunk files no larger than max_chunk_bytes.
+    Lines are never split; a single oversized line gets a chunk of its own.
+    Returns the list of chunk paths (the original path if no split is needed).
+    """
+    jsonl_path = Path(jsonl_path)
+    if jsonl_path.stat().st_size <= max_chunk_bytes:
+        return [jsonl_path]
+
+    chunk_paths = []
+    out = None
+    written = 0
+    with open(jsonl_path, 'rb') as f_in:
+        for line in f_in:
+            if not line.strip():
+                continue
+            if out is None or (written and written + len(line) > max_chunk_bytes):
+                if out:
+                    out.close()
+                chunk_path = jsonl_path.with_name(f"{jsonl_path.stem}.part{len(chunk_paths) + 1:03d}.jsonl")
+                chunk_paths.append(chunk_path)
+                out = open(chunk_path, 'wb')
+                written = 0
+            out.write(line)
+            written += len(line)
+    if out:
+        out.close()
+    return chunk_paths
+
+def merge_results(result_paths, output_path):
+    """
+    Merges downloaded result files into one responses JSONL keyed by request key (the puzzle date).
+    When a key appears more than once the last result wins. Returns the number of lines written.
+    """
+    merged = {}
+    for path in result_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    key = json.loads(line).get("key")
+                except json.JSONDecodeError:
+                    print(f"Failed to parse result line in {path}")
+                    continue
+                merged[key or f"unkeyed-{len(merged)}"] = line.rstrip("\n")
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for key in sorted(merged):
+            f.write(merged[key] + "\n")
+    return len(merged)
+
+def _state_name(job):
+    state_str = str(job.state)
+    for state in TERMINAL_STATES:
+        if state in state_str:
+            return state
+    return state_str
+
 class BatchClient:
     def __init__(self, api_key=None):
         """
@@ -30,7 +98,7 @@ class BatchClient:
             
         self.client = genai.Client(api_key=self.api_key)
         
-    def submit_batch(self, jsonl_path, model="gemini-3.1-flash-lite"):
+    def submit_batch(self, jsonl_path, model=DEFAULT_MODEL):
         """
         Uploads a JSONL file and creates a batch job.
         Args:
@@ -63,6 +131,14 @@ class BatchClient:
         """
         return self.client.batches.get(name=job_name)
         
+    def cancel_job(self, job_name):
+        """
+        Cancels a batch job that is still pending or running.
+        Args:
+            job_name: The resource name of the job (e.g. 'batches/12345').
+        """
+        self.client.batches.cancel(name=job_name)
+
     def list_jobs(self):
         """
         Lists all batch jobs.
@@ -80,9 +156,12 @@ class BatchClient:
         Raises:
             ValueError: If the job is not SUCCEEDED or has no results file.
         """
-        job = self.get_job(job_name)
-        state_str = str(job.state)
-        if "SUCCEEDED" not in state_str:
+        self._download_job(self.get_job(job_name), output_path)
+
+    def _download_job(self, job, output_path):
+        """Writes the results file of an already-fetched SUCCEEDED job to output_path."""
+        job_name = job.name
+        if _state_name(job) != "SUCCEEDED":
             raise ValueError(f"Job {job_name} is not in SUCCEEDED state (current state: {job.state})")
         
         # Retrieve destination file path from the job destination metadata.
@@ -93,9 +172,96 @@ class BatchClient:
         if not result_file:
             raise AttributeError(f"BatchJob '{job_name}' is missing result file information in 'dest.file_name'.")
              
-        file_data = self.client.files.download(file=result_file)
-        with open(output_path, 'wb') as f:
-            f.write(file_data)
+        # Streamed to disk in chunks, so a large results file is never held in memory
+        temp_path = Path(output_path).with_name(Path(output_path).name + ".tmp")
+        self.client.files.download(file=result_file, destination=str(temp_path))
+        temp_path.replace(output_path)
+
+    def run_batch(self, jsonl_path, output_path, model=DEFAULT_MODEL,
+                  max_chunk_bytes=DEFAULT_CHUNK_BYTES, poll_interval=30, max_poll_interval=600):
+        """
+        Runs a whole batch unattended: splits the requests into size-limited chunks,
+        submits them concurrently, polls every job with exponential backoff, downloads
+        each job's results as soon as it finishes and merges them into output_path.
+        Args:
+            jsonl_path: Path to the requests .jsonl file.
+            output_path: Path of the merged responses file consumed by apply.py.
+            model: The Gemini model to use.
+            max_chunk_bytes: Maximum size of each uploaded chunk.
+            poll_interval: Initial delay in seconds between status polls.
+            max_poll_interval: Upper bound for the polling delay.
+        Returns:
+            A dict mapping job name to its final state, or DOWNLOAD_FAILED if its results could not be fetched.
+        """
+        output_path = Path(output_path)
+        results_dir = output_path.parent / "batch_results"
+        results_dir.mkdir(parents=True, exist_ok=True)
+
+        chunks = split_requests(jsonl_path, max_chunk_bytes)
+        print(f"Submitting {len(chunks)} chunk(s) from {jsonl_path}...")
+        with ThreadPoolExecutor(max_workers=min(len(chunks), 8)) as pool:
+            futures = [pool.submit(self.submit_batch, str(chunk), model=model) for chunk in chunks]
+        jobs, submit_errors = [], []
+        for chunk, future in zip(chunks, futures):
+            try:
+                job = future.result()
+            except Exception as e:
+                submit_errors.append(e)
+                print(f"  ❌ Could not submit {Path(chunk).name}: {e}")
+                continue
+            jobs.append(job)
+            print(f"  {Path(chunk).name} -> {job.name}")
+        # Chunk files are copies of jsonl_path made for upload; a rerun splits it again
+        for chunk in chunks:
+            if Path(chunk) != Path(jsonl_path):
+                Path(chunk).unlink(missing_ok=True)
+        if submit_errors:
+            # The jobs already created would keep running (and billing) without anyone polling them
+            for job in jobs:
+                try:
+                    self.cancel_job(job.name)
+                    print(f"  🛑 Cancelled {job.name}")
+                except Exception as e:
+                    print(f"  ⚠️ Could not cancel {job.name} ({e}); cancel it or fetch it later with --download.")
+            raise submit_errors[0]
+
+        pending = {job.name for job in jobs}
+        final_states = {}
+        result_paths = []
+        delay = poll_interval
+        while pending:
+            time.sleep(delay)
+            for job_name in sorted(pending):
+                try:
+                    job = self.get_job(job_name)
+                except Exception as e:
+                    print(f"  ⚠️ Could not poll {job_name} ({e}); trying again next poll")
+                    continue
+                state = _state_name(job)
+                if state not in TERMINAL_STATES:
+                    continue
+                pending.discard(job_name)
+                final_states[job_name] = state
+                if state == "SUCCEEDED":
+                    result_path = results_dir / f"{job_name.replace('/', '_')}.jsonl"
+                    try:
+                        self._download_job(job, result_path)
+                    except Exception as e:
+                        # The other jobs are still tracked; this one can be fetched later with --download
+                        final_states[job_name] = "DOWNLOAD_FAILED"
+                        print(f"  ❌ {job_name} succeeded but its results could not be downloaded: {e}")
+                        continue
+                    result_paths.append(result_path)
+                    print(f"  ✅ {job_name} succeeded, results saved to {result_path}")
+                else:
+                    print(f"  ❌ {job_name} finished with state {state}")
+            if pending:
+                print(f"  ⏳ {len(pending)} job(s) still running, next poll in {delay}s")
+            delay = min(delay * 2, max_poll_interval)
+
+        count = merge_results(result_paths, output_path)
+        print(f"Merged {count} responses into {output_path}")
+        return final_states
 
 if __name__ == "__main__":
     import argparse
@@ -106,6 +272,9 @@ if __name__ == "__main__":
     parser.add_argument("--status", type=str, help="Job ID to check status for")
     parser.add_argument("--download", type=str, nargs=2, metavar=('JOB_ID', 'OUTPUT_PATH'), help="Job ID and output path to download results")
     parser.add_argument("--list", action="store_true", help="List all batch jobs")
+    parser.add_argument("--run-batch", type=str, metavar='JSONL_PATH', help="Split, submit, poll, download and merge a whole batch")
+    parser.add_argument("--output", type=str, default="temp/responses.jsonl", help="Merged responses path for --run-batch")
+    parser.add_argument("--chunk-mb", type=int, default=DEFAULT_CHUNK_BYTES // (1024 * 1024), help="Maximum chunk size in MB for --run-batch")
     
     args = parser.parse_args()
     client = BatchClient()
@@ -133,6 +302,13 @@ if __name__ == "__main__":
             client.download_results(job_id, output_path)
             print("Download complete.")
             
+        elif args.run_batch:
+            states = client.run_batch(args.run_batch, args.output, max_chunk_bytes=args.chunk_mb * 1024 * 1024)
+            failed = [name for name, state in states.items() if state != "SUCCEEDED"]
+            if failed:
+                print(f"Jobs that did not succeed: {', '.join(failed)}")
+                sys.exit(1)
+
         elif args.list:
             jobs = client.list_jobs()
             print(f"{'Job Name':<30} {'State':<15} {'Created'}")
@@ -5,6 +5,8 @@ import json
 import os
 import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from bs4 import BeautifulSoup
 
@@ -13,8 +15,18 @@ current_dir = Path(__file__).parent
 if str(current_dir.parent) not in sys.path:
     sys.path.append(str(current_dir.parent))
 
-from batch.utils import StateManager, BATCH_PROMPT_TEMPLATE
+from batch.utils import StateManager, HostScheduler, BATCH_PROMPT_TEMPLATE
 import scraper
+from puzzle_store import load_puzzle_record
+
+# Minimum seconds between visits to each host, shared by all workers.
+# A B-Ref scrape is a search plus a player page, and B-Ref blocks clients
+# that exceed ~20 requests per minute.
+POLITE_INTERVALS = {
+    "baseball-reference.com": 6.0,
+    "sabr.org": 2.0,
+    "mlb.com": 4.0,
+}
 
 def build_request(dossier, date_str):
     """
@@ -49,9 +61,56 @@ def extract_player_name(html_content):
         return player_name
     return None
 
-def prepare_batch(project_root, limit=None):
+def scrape_dossier(player_name, driver, scheduler=None):
+    """
+    Scrapes B-Ref stats and a SABR (or MLB.com) bio into a single dossier dict.
+    When a scheduler is given, each site visit waits for its host's next polite slot.
+    """
+    def _wait(host):
+        if scheduler:
+            scheduler.wait(host)
+
+    print(f"Scraping dossier for {player_name}...")
+    _wait("baseball-reference.com")
+    stats = scraper.search_and_scrape_player(player_name, automated=True, driver=driver)
+    _wait("sabr.org")
+    bio = scraper.get_sabr_bio(player_name)
+
+    # MLB.com Fallback
+    if not bio or len(bio) < 500:
+        print(f"  ℹ️ SABR bio thin or missing for {player_name}, trying MLB.com fallback...")
+        _wait("mlb.com")
+        mlb_bio = scraper.get_mlb_bio(player_name, shared_driver=driver)
+        if mlb_bio:
+            bio = mlb_bio
+
+    # Limit bio to ~2500 words to avoid context overflow
+    if bio:
+        words = bio.split()
+        if len(words) > 2500:
+            bio = " ".join(words[:2500]) + "..."
+
+    dossier = {
+        "name": player_name,
+        "bio": bio or "No SABR bio found."
+    }
+    if stats:
+        dossier.update(stats)
+    else:
+        dossier.update({
+            "career_totals": {},
+            "yearly_war": [],
+            "transactions": [],
+            "awards": []
+        })
+    return dossier
+
+def prepare_batch(project_root, limit=None, workers=1):
     """
     Main loop to scrape dossiers and generate requests.jsonl.
+    With workers > 1, dossiers are scraped on a thread pool where every worker
+    owns its own driver and all workers share one per-host HostScheduler.
+    Each dossier is written and checkpointed in state.json as soon as it completes.
     """
     root_path = Path(project_root)
     state_file = root_path / "page-generator" / "batch" / "state.json"
@@ -61,15 +120,36 @@ def prepare_batch(project_root, limit=None):
     dossier_dir.mkdir(parents=True, exist_ok=True)
     
     manager = StateManager(state_file)
-    shared_driver = scraper.get_driver()
+    scheduler = HostScheduler(POLITE_INTERVALS)
+    state_lock = threading.Lock()
+    drivers = []
+    local = threading.local()
+
+    def _get_worker_driver():
+        driver = getattr(local, "driver", None)
+        if driver is None:
+            driver = scraper.get_driver()
+            local.driver = driver
+            with state_lock:
+                drivers.append(driver)
+        return driver
+
+    def _process(date_str, player_name):
+        dossier = scrape_dossier(player_name, _get_worker_driver(), scheduler)
+        dossier_path = dossier_dir / f"{date_str}.json"
+        with open(dossier_path, 'w', encoding='utf-8') as f:
+            json.dump(dossier, f, indent=2)
+        with state_lock:
+            manager.set_status(date_str, "scraped", data={"player": player_name})
+            manager.save()
     
     try:
-        # 1. Scrape dossiers
+        # 1. Collect pending pages
         html_files = sorted(list(root_path.glob("202*.html")))
-        processed_count = 0
+        pending = []
         
         for html_file in html_files:
-            if limit and processed_count >= limit:
+            if limit and len(pending) >= limit:
                 break
                 
             date_str = html_file.stem # YYYY-MM-DD
@@ -79,54 +159,36 @@ def prepare_batch(project_root, limit=None):
                 print(f"Skipping {date_str} (status: {status})")
                 continue
                 
-            print(f"Processing {date_str}...")
-            with open(html_file, 'r', encoding='utf-8') as f:
-                player_name = extract_player_name(f.read())
+            record = load_puzzle_record(root_path, date_str)
+            if record is not None:
+                player_name = record['name']
+            else:
+                with open(html_file, 'r', encoding='utf-8') as f:
+                    player_name = extract_player_name(f.read())
                 
             if not player_name:
                 print(f"Could not find player name in {html_file}")
                 continue
-                
-            print(f"Scraping dossier for {player_name}...")
-            stats = scraper.search_and_scrape_player(player_name, automated=True, driver=shared_driver)
-            bio = scraper.get_sabr_bio(player_name)
-            
-            # MLB.com Fallback
-            if not bio or len(bio) < 500:
-                print(f"  ℹ️ SABR bio thin or missing for {player_name}, trying MLB.com fallback...")
-                mlb_bio = scraper.get_mlb_bio(player_name, shared_driver=shared_driver)
-                if mlb_bio:
-                    bio = mlb_bio
-            
-            # Limit bio to ~2500 words to avoid context overflow
-            if bio:
-                words = bio.split()
-                if len(words) > 2500:
-                    bio = " ".join(words[:2500]) + "..."
-            
-            dossier = {
-                "name": player_name,
-                "bio": bio or "No SABR bio found."
-            }
-            if stats:
-                dossier.update(stats)
-            else:
-                dossier.update({
-                    "career_totals": {},
-                    "yearly_war": [],
-                    "transactions": [],
-                    "awards": []
-                })
-                
-            dossier_path = dossier_dir / f"{date_str}.json"
-            with open(dossier_path, 'w', encoding='utf-8') as f:
-                json.dump(dossier, f, indent=2)
-                
-            manager.set_status(date_str, "scraped", data={"player": player_name})
-            manager.save()
-            processed_count += 1
+            pending.append((date_str, player_name))
+
+        # 2. Scrape dossiers
+        if workers <= 1:
+            for date_str, player_name in pending:
+                print(f"Processing {date_str}...")
+                _process(date_str, player_name)
+        else:
+            print(f"Scraping {len(pending)} dossiers with {workers} workers...")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_process, d, n): d for d, n in pending}
+                for future in as_completed(futures):
+                    date_str = futures[future]
+                    try:
+                        future.result()
+                        print(f"✅ Dossier ready for {date_str}")
+                    except Exception as e:
+                        print(f"❌ Error scraping {date_str}: {e}")
             
-        # 2. Generate requests.jsonl
+        # 3. Generate requests.jsonl
         print("Generating requests.jsonl...")
         with open(requests_file, 'w', encoding='utf-8') as f_out:
             for date_str, entry in manager.state.items():
@@ -141,10 +203,15 @@ def prepare_batch(project_root, limit=None):
         print(f"Successfully generated {requests_file}")
         
     finally:
-        shared_driver.quit()
+        for driver in drivers:
+            driver.quit()
 
 if __name__ == "__main__":
-    import sys
-    project_root = sys.argv[1] if len(sys.argv) > 1 else "."
-    limit = int(sys.argv[2]) if len(sys.argv) > 2 else None
-    prepare_batch(project_root, limit=limit)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape dossiers and build requests.jsonl for the Batch API.")
+    parser.add_argument("project_root", nargs="?", default=".", help="Path to the website project folder.")
+    parser.add_argument("limit", nargs="?", type=int, default=None, help="Maximum number of pages to scrape.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel scraping workers, each with its own driver.")
+    args = parser.parse_args()
+    prepare_batch(args.project_root, limit=args.limit, workers=args.workers)
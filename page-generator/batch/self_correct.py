@@ -5,7 +5,8 @@ import os
 import json
 import re
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from google import genai
 from google.genai import types
@@ -14,10 +15,12 @@ from google.genai import types
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from batch.utils import StateManager
-from batch.apply import patch_html
+from batch.apply import patch_html, patched_record_fields
 from grounded_ai import generate_grounded_trivia
+from ai_services import GeminiDailyQuotaExceeded
 import fact_verifier
 import config_manager
+from puzzle_store import update_puzzle_record
 
 MODEL = 'gemini-3.1-flash-lite'
 
@@ -40,12 +43,40 @@ def contains_spoiler(facts):
                 return True, s
     return False, None
 
+def count_bad_claims(claims, dossier):
+    """Returns how many individual claims fail verification against the dossier."""
+    return sum(1 for claim in claims if not fact_verifier.verify_claims([claim], dossier))
+
+def work_priority(status, data, has_dossier):
+    """
+    Sort key ranking dates by how likely a retry is to succeed.
+    Near misses (few unverifiable claims) come first, never-attempted dates next,
+    and dates without a dossier last since they cannot be corrected at all.
+    """
+    if not has_dossier:
+        return (5, 0)
+    failure = data.get("last_failure") or {}
+    reason = failure.get("reason")
+    if reason == "verification":
+        return (0, failure.get("bad_claims", 99))
+    if status == "failed":
+        # Failed claim verification during apply; claim count unknown
+        return (1, 0)
+    if reason is None:
+        return (2, 0)
+    if reason == "quality":
+        return (3, 0)
+    return (4, 0)
+
 class SelfCorrector:
-    def __init__(self, project_root):
+    def __init__(self, project_root, workers=1):
         self.root_path = Path(project_root)
         self.state_file = self.root_path / "page-generator" / "batch" / "state.json"
         self.dossier_dir = self.root_path / "temp" / "dossiers"
         self.manager = StateManager(self.state_file)
+        self.workers = workers
+        self._state_lock = threading.Lock()
+        self._quota_exhausted = threading.Event()
         
         config = config_manager.load_config()
         self.api_key = config.get("gemini_api_key")
@@ -53,38 +84,96 @@ class SelfCorrector:
             raise ValueError("GEMINI_API_KEY not found in local config")
         self.client = genai.Client(api_key=self.api_key)
 
-    def run(self, limit=None):
-        # Find all dates that aren't completed
+    def build_work_queue(self):
+        """Returns non-completed dates ordered by likelihood of a successful correction."""
         all_dates = sorted(self.manager.state.keys())
         failed_dates = [d for d in all_dates if self.manager.get_status(d) != "completed"]
+        return sorted(failed_dates, key=lambda d: work_priority(
+            self.manager.get_status(d),
+            self.manager.get_data(d),
+            (self.dossier_dir / f"{d}.json").exists()
+        ))
+
+    def run(self, limit=None):
+        work_queue = self.build_work_queue()
         
-        print(f"🔧 Found {len(failed_dates)} puzzles requiring self-correction.")
+        print(f"🔧 Found {len(work_queue)} puzzles requiring self-correction.")
         
         processed = 0
-        for date_str in failed_dates:
-            if limit and processed >= limit:
-                break
-                
-            player_name = self.manager.get_data(date_str).get('player', date_str)
+        in_flight = 0
+        pending = iter(work_queue)
+        slot_freed = threading.Condition(self._state_lock)
+
+        def _claim():
+            """Takes the next date once a correction slot is free under limit; None when done."""
+            nonlocal in_flight
+            with slot_freed:
+                # In-flight corrections may still succeed, so they count against limit until they finish
+                while limit and in_flight and processed + in_flight >= limit:
+                    slot_freed.wait()
+                if self._quota_exhausted.is_set() or (limit and processed >= limit):
+                    return None
+                date_str = next(pending, None)
+                if date_str is not None:
+                    in_flight += 1
+                return date_str
+
+        def _process(date_str):
+            with self._state_lock:
+                player_name = self.manager.get_data(date_str).get('player', date_str)
             print(f"\n🚀 Processing {player_name} ({date_str})...")
             
             dossier_path = self.dossier_dir / f"{date_str}.json"
             if not dossier_path.exists():
                 print(f"  ⚠️ Dossier not found for {date_str}, skipping.")
-                continue
+                return False
                 
             with open(dossier_path, 'r', encoding='utf-8') as f:
                 dossier = json.load(f)
             
-            success = self.correct_player(date_str, player_name, dossier)
-            if success:
-                processed += 1
-                # Small pause to respect rate limits on standard API
-                time.sleep(2)
+            try:
+                return self.correct_player(date_str, player_name, dossier)
+            except GeminiDailyQuotaExceeded:
+                if not self._quota_exhausted.is_set():
+                    self._quota_exhausted.set()
+                    print("\n❌ Gemini daily quota has been reached. Finishing in-flight work and stopping.")
+                return False
+
+        def _worker():
+            nonlocal processed, in_flight
+            while (date_str := _claim()) is not None:
+                success = False
+                try:
+                    success = _process(date_str)
+                finally:
+                    with slot_freed:
+                        in_flight -= 1
+                        processed += bool(success)
+                        slot_freed.notify_all()
+
+        if self.workers <= 1:
+            _worker()
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for future in [pool.submit(_worker) for _ in range(self.workers)]:
+                    future.result()
+
+        if self._quota_exhausted.is_set():
+            print(f"⏸️ Stopped on daily quota after {processed} correction(s). Progress is saved in {self.state_file.name}; rerun to resume.")
+
+    def _record_failure(self, date_str, reason, **details):
+        with self._state_lock:
+            data = dict(self.manager.get_data(date_str))
+            data["last_failure"] = {"reason": reason, **details}
+            self.manager.set_status(date_str, self.manager.get_status(date_str) or "failed", data=data)
+            self.manager.save()
 
     def correct_player(self, date_str, player_name, dossier):
         # We'll try up to 5 times for these strict rules
+        last_failure = ("error", {})
         for attempt in range(5):
+            if self._quota_exhausted.is_set():
+                raise GeminiDailyQuotaExceeded("Daily quota exhausted by another worker")
             print(f"  🤖 Generating verified trivia (Attempt {attempt + 1}/5)...")
             
             try:
@@ -99,17 +188,20 @@ class SelfCorrector:
                 all_text = " ".join(facts) + " " + " ".join([q.get('question', '') + " " + q.get('answer', '') for q in qa])
                 if any(word in all_text.lower() for word in ["sabr", "bioproject", "biography remains", "unassigned"]):
                     print("  ⚠️ REJECTED: Response contains forbidden meta-commentary.")
+                    last_failure = ("quality", {})
                     continue
                 
                 # Quality Check 2: NO SPOILERS IN HINTS
                 has_spoiler, word = contains_spoiler(facts)
                 if has_spoiler:
                     print(f"  ⚠️ REJECTED: Hint contains spoiler word '{word}'.")
+                    last_failure = ("quality", {})
                     continue
 
                 # Check for 3-hint rule
                 if len(facts) != 3:
                     print(f"  ⚠️ Invalid fact count ({len(facts)}), retrying...")
+                    last_failure = ("quality", {})
                     continue
 
                 # Run verification
@@ -124,26 +216,40 @@ class SelfCorrector:
                         
                         with open(html_file, 'w', encoding='utf-8') as hf:
                             hf.write(updated_html)
+                        update_puzzle_record(self.root_path, date_str, **patched_record_fields(result))
                         
-                        self.manager.set_status(date_str, "completed")
-                        self.manager.save()
+                        with self._state_lock:
+                            self.manager.set_status(date_str, "completed")
+                            self.manager.save()
                         print(f"  ✅ Successfully updated {date_str}")
                         return True
                     else:
                         print(f"  ❌ HTML file not found: {html_file}")
                         return False
                 else:
-                    print(f"  🔍 Verification failed on stats/years.")
-                    
+                    bad_claims = count_bad_claims(claims, dossier)
+                    print(f"  🔍 Verification failed on stats/years ({bad_claims} bad claim(s)).")
+                    if last_failure[0] != "verification" or bad_claims < last_failure[1]["bad_claims"]:
+                        last_failure = ("verification", {"bad_claims": bad_claims})
+
+            except GeminiDailyQuotaExceeded:
+                raise
             except Exception as e:
                 print(f"  ❌ Error: {e}")
                 
         print(f"  ⚠️ Failed to generate verified facts for {date_str} after 5 attempts.")
+        reason, details = last_failure
+        self._record_failure(date_str, reason, **details)
         return False
 
 if __name__ == "__main__":
-    project_root = sys.argv[1] if len(sys.argv) > 1 else "."
-    limit = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Self-correct puzzles whose batch facts failed verification.")
+    parser.add_argument("project_root", nargs="?", default=".", help="Path to the website project folder.")
+    parser.add_argument("limit", nargs="?", type=int, default=None, help="Stop after this many successful corrections.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of concurrent workers sharing the Gemini rate limiter.")
+    args = parser.parse_args()
     
-    corrector = SelfCorrector(project_root)
-    corrector.run(limit=limit)
+    corrector = SelfCorrector(args.project_root, workers=args.workers)
+    corrector.run(limit=args.limit)
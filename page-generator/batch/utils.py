@@ -2,8 +2,11 @@
 # ABOUTME: Tracks progress and player data across multiple execution phases.
 
 import json
+import threading
 from pathlib import Path
 
+from rate_limiter import RateLimiter
+
 class StateManager:
     def __init__(self, path):
         self.path = Path(path)
@@ -35,6 +38,38 @@ class StateManager:
             json.dump(self.state, f, indent=2)
         temp_path.replace(self.path)
 
+def extract_response_text(resp_data):
+    """
+    Returns the model text from one Batch API result line, or "" if it has none.
+    Handles both {"response": {"candidates": ...}} and {"response": {"body": {"candidates": ...}}}.
+    """
+    response_obj = resp_data.get('response', {}) or {}
+    body = response_obj.get('body', {})
+    candidates = body.get('candidates', []) if body else response_obj.get('candidates', [])
+    if not candidates:
+        return ""
+    return candidates[0].get('content', {}).get('parts', [{}])[0].get('text', '')
+
+class HostScheduler:
+    """
+    Spaces out requests to each host so parallel workers stay polite.
+    Every host gets its own RateLimiter, so N workers never hit one site
+    faster than its interval while different sites proceed independently.
+    """
+    def __init__(self, intervals=None, default_interval=2.0):
+        self.intervals = intervals or {}
+        self.default_interval = default_interval
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = RateLimiter(self.intervals.get(host, self.default_interval))
+                self._limiters[host] = limiter
+        return limiter.wait()
+
 BATCH_PROMPT_TEMPLATE = """
 You are a "Skeptical Storyteller" tasked with generating high-accuracy, engaging trivia for a New York Yankees trivia game.
 Your goal is to generate trivia "hints" and "follow-up stories" about the player: {name}.
@@ -0,0 +1,106 @@
+# ABOUTME: Emits the career-arc chart markup for detail pages: a JSON data island plus the shared js/careerChart.js.
+# ABOUTME: Also migrates pages that still inline the Chart.js script and reports the page weight saved.
+import argparse
+import gzip
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+PROJECT_DIR = Path(__file__).parent.parent
+CHART_DATA_ID = "career-chart-data"
+TEAM_COLORS_SRC = "js/team_colors.js"
+CHART_MODULE_SRC = "js/careerChart.js"
+
+# The per-page script older generators wrote; its arrays are the only part that differs between pages
+INLINE_CHART_PATTERN = re.compile(r'^([ \t]*)<script>\s*const years = .*?</script>[ \t]*$', re.MULTILINE | re.DOTALL)
+
+
+def chart_data(yearly_war: list) -> dict:
+    return {
+        'years': [item['year'] for item in yearly_war],
+        'war': [item['war'] for item in yearly_war],
+        'teams': [item['display_team'] for item in yearly_war],
+    }
+
+
+def chart_scripts_html(data: dict, indent: str = "", include_team_colors: bool = True) -> str:
+    """The data island and script tags that draw the chart, one per line at the given indent."""
+    # "</" cannot appear inside a script element, so escape it in the JSON
+    island = json.dumps(data, separators=(',', ':')).replace("</", "<\\/")
+    lines = []
+    if include_team_colors:
+        lines.append(f'<script src="{TEAM_COLORS_SRC}"></script>')
+    lines.append(f'<script type="application/json" id="{CHART_DATA_ID}">{island}</script>')
+    lines.append(f'<script type="module" src="{CHART_MODULE_SRC}"></script>')
+    return "\n".join(indent + line for line in lines)
+
+
+def _json_const(script_text: str, name: str) -> list:
+    match = re.search(rf"const {name} = (\[.*?\]);", script_text, re.DOTALL)
+    return json.loads(match.group(1)) if match else []
+
+
+def migrate_page(html_text: str) -> Optional[str]:
+    """Replaces an inline chart script with the data island and shared module. Returns None if there is none."""
+    match = INLINE_CHART_PATTERN.search(html_text)
+    if not match:
+        return None
+    script_text = match.group(0)
+    data = {
+        'years': _json_const(script_text, "years"),
+        'war': _json_const(script_text, "warData"),
+        'teams': _json_const(script_text, "teamsByYear"),
+    }
+    # Pages from before team_colors.js existed carried their own copy of the color map
+    include_team_colors = TEAM_COLORS_SRC not in html_text
+    replacement = chart_scripts_html(data, match.group(1), include_team_colors)
+    return html_text[:match.start()] + replacement + html_text[match.end():]
+
+
+def _sizes(text: str):
+    data = text.encode('utf-8')
+    return len(data), len(gzip.compress(data, mtime=0))
+
+
+def migrate_pages(project_dir: Path, apply: bool = False) -> dict:
+    """
+    Migrates (or, without apply, previews) every detail page and prints the bytes saved per page.
+    Returns archive totals: pages, migrated, before/after raw bytes and before/after gzip bytes.
+    """
+    totals = {'pages': 0, 'migrated': 0, 'before': 0, 'after': 0, 'before_gz': 0, 'after_gz': 0}
+    print(f"{'page':<12} {'before':>9} {'after':>9} {'saved':>8} {'saved gz':>9}")
+    for page in sorted(Path(project_dir).glob("????-??-??.html")):
+        html_text = page.read_text(encoding='utf-8')
+        migrated = migrate_page(html_text)
+        before, before_gz = _sizes(html_text)
+        after, after_gz = _sizes(migrated) if migrated is not None else (before, before_gz)
+        totals['pages'] += 1
+        totals['before'] += before
+        totals['after'] += after
+        totals['before_gz'] += before_gz
+        totals['after_gz'] += after_gz
+        if migrated is None:
+            continue
+        totals['migrated'] += 1
+        print(f"{page.stem:<12} {before:>9} {after:>9} {before - after:>8} {before_gz - after_gz:>9}")
+        if apply:
+            page.write_text(migrated, encoding='utf-8')
+
+    saved = totals['before'] - totals['after']
+    saved_gz = totals['before_gz'] - totals['after_gz']
+    print(f"{'archive':<12} {totals['before']:>9} {totals['after']:>9} {saved:>8} {saved_gz:>9}")
+    verb = "Migrated" if apply else "Would migrate"
+    print(f"📊 {verb} {totals['migrated']} of {totals['pages']} pages, saving {saved / 1024:.1f} KB ({saved_gz / 1024:.1f} KB gzipped).")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move inline career charts to js/careerChart.js and report page weight.")
+    parser.add_argument("--apply", action="store_true", help="Rewrite the pages; without it only the page-weight report is printed.")
+    args = parser.parse_args()
+    migrate_pages(PROJECT_DIR, apply=args.apply)
+
+
+if __name__ == "__main__":
+    main()
@@ -70,6 +70,11 @@ class AutomationConfig:
             "logging": {
                 "level": "INFO",
                 "file": "automation.log"
+            },
+            "site": {
+                "archive_mode": "full",
+                "static_tiles": 24,
+                "precache_puzzles": 7
             }
         }
         
@@ -172,6 +177,10 @@ class AutomationConfig:
         """Get workflow configuration."""
         return self.get('workflow', {})
     
+    def get_site_config(self) -> Dict[str, Any]:
+        """Get static site output configuration."""
+        return self.get('site', {})
+    
     def is_auto_commit_enabled(self) -> bool:
         """Check if auto-commit is enabled."""
         return self.get('git_integration.auto_commit', False)
@@ -230,6 +239,17 @@ class AutomationConfig:
         if workflow_config.get('auto_approve_player', False) and not workflow_config.get('skip_manual_review', False):
             warnings.append("Auto-approve player is enabled but manual review is not skipped")
         
+        # Validate site output settings
+        site_config = self.get_site_config()
+        if site_config.get('archive_mode', 'full') not in ('full', 'sharded'):
+            issues.append("Archive mode must be 'full' or 'sharded'")
+        static_tiles = site_config.get('static_tiles', 24)
+        if not isinstance(static_tiles, int) or static_tiles < 1:
+            issues.append("Static tiles must be an integer >= 1")
+        precache_puzzles = site_config.get('precache_puzzles', 7)
+        if not isinstance(precache_puzzles, int) or precache_puzzles < 0:
+            issues.append("Precache puzzles must be an integer >= 0")
+        
         return {
             'valid': len(issues) == 0,
             'issues': issues,
@@ -3,18 +3,27 @@
 import os
 import json
 import re
-import time
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from bs4 import BeautifulSoup
 from google import genai
 from google.genai import types
 
+from audit_store import AuditStore, content_hash, parse_legacy_report, render_report
+from puzzle_store import audited_facts, load_puzzle_record
+from batch.client import BatchClient
+from batch.utils import extract_response_text
+from rate_limiter import GEMINI_RATE_LIMITER, RateLimiter
+
 # --- CONFIGURATION ---
 MODEL = 'gemini-3.1-flash-lite'
 PROJECT_DIR = Path(__file__).parent.parent
 CONFIG_PATH = Path.home() / ".yankee_generator_config.json"
 REPORT_PATH = PROJECT_DIR / "FACT_AUDIT_REPORT.md"
+VERIFICATION_REPORT_PATH = PROJECT_DIR / "BATCH_VERIFICATION_REPORT.md"
+BATCH_DIR = PROJECT_DIR / "temp" / "audit_batch"
 
 def load_api_key():
     if not CONFIG_PATH.exists():
@@ -23,24 +32,163 @@ def load_api_key():
         config = json.load(f)
     return config.get("gemini_api_key")
 
-_LAST_CALL_TS = time.time()
+def build_phase_1_prompt(player_data):
+    return f"""
+        You are a skeptical baseball historian. I have a list of facts that are SUPPOSED to be about the player "{player_data['name']}".
+        
+        FACTS TO AUDIT:
+        {json.dumps(player_data['facts'])}
+        
+        YOUR TASK:
+        1. Identify the player(s) described by these facts.
+        2. Determine if ALL facts consistently describe "{player_data['name']}".
+        3. If any fact describes a different player, or if the facts as a whole better fit someone else, you MUST flag it.
+        
+        **IMPORTANT**: Maintain normal English spacing. Do NOT squash words together in your JSON response.
+        
+        Return ONLY a JSON object:
+        {{
+          "primary_identity": "Name of the player most facts describe",
+          "is_fully_consistent": true/false,
+          "reasoning": "Brief explanation if inconsistent"
+        }}
+        """
 
-def _respect_rate_limit():
-    global _LAST_CALL_TS
-    now = time.time()
-    min_interval = 13.0
-    elapsed = now - _LAST_CALL_TS
-    if elapsed < min_interval:
-        time.sleep(min_interval - elapsed)
-    _LAST_CALL_TS = time.time()
+def build_phase_2_prompt(player_name, facts):
+    return f"""
+            Verify each of these baseball facts for the player "{player_name}" using Google Search.
+            
+            Facts:
+            {json.dumps(facts)}
+            
+            **CRITICAL**: Do NOT squash words together. Ensure all "reasoning" and "fact" strings have proper spaces between words.
+            
+            Return ONLY a JSON list of objects:
+            [
+              {{
+                "fact": "...",
+                "is_accurate": true/false,
+                "reasoning": "...",
+                "source": "..."
+              }}
+            ]
+            """
+
+def phase_2_batches(facts):
+    """Splits facts into the 2 batches checked per Phase 2 call to save tokens while keeping context clear."""
+    return [facts[:3], facts[3:]]
+
+def interpret_phase_1(player_data, result):
+    """Turns a parsed Phase 1 response into a match verdict."""
+    predicted_name = result.get("primary_identity", "Unknown")
+    is_consistent = result.get("is_fully_consistent", True)
+    
+    # Match if consistent AND the name matches
+    name_matches = predicted_name.lower() in player_data['name'].lower() or player_data['name'].lower() in predicted_name.lower()
+    
+    return {
+        "is_match": is_consistent and name_matches,
+        "predicted_name": predicted_name,
+        "reasoning": result.get("reasoning", "")
+    }
+
+def error_verdicts(facts):
+    return [{"fact": f, "is_accurate": True, "reasoning": "Error during audit", "source": ""} for f in facts]
+
+def build_audit_entry(player_data, p1_result, p2_verdicts=None):
+    return {
+        "date": player_data['date'],
+        "name": player_data['name'],
+        "p1_match": p1_result['is_match'],
+        "p1_predicted": p1_result['predicted_name'],
+        "reasoning": p1_result.get('reasoning', ''),
+        "failures": [v for v in (p2_verdicts or []) if not v.get('is_accurate', True)]
+    }
+
+def _batch_request(key, prompt, grounded=False):
+    request = {
+        "contents": [{"parts": [{"text": prompt}]}],
+        "generation_config": {"temperature": 0.1, "response_mime_type": "application/json"}
+    }
+    if grounded:
+        request["tools"] = [{"google_search": {}}]
+    return {"key": key, "request": request}
+
+def _read_batch_responses(path):
+    """Returns {key: parsed JSON} for every result line in a merged responses file."""
+    parsed = {}
+    if not Path(path).exists():
+        return parsed
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                resp_data = json.loads(line)
+                parsed[resp_data.get("key")] = json.loads(extract_response_text(resp_data))
+            except (json.JSONDecodeError, AttributeError):
+                print(f"  ❌ Could not parse batch result line: {line[:80]}")
+    return parsed
+
+def write_report(store):
+    """Atomically rewrites the Markdown report from the store's mismatches; returns how many were written."""
+    if not store.records:
+        _migrate_legacy_report(store)
+    return _render_report_file(store)
+
+def _render_report_file(store):
+    failures = store.failures()
+    temp_path = REPORT_PATH.with_suffix(".tmp")
+    temp_path.write_text(render_report(failures), encoding='utf-8')
+    temp_path.replace(REPORT_PATH)
+    return len(failures)
+
+def _migrate_legacy_report(store):
+    if not REPORT_PATH.exists():
+        return 0
+    records, other_sections = parse_legacy_report(REPORT_PATH.read_text(encoding='utf-8'))
+    # Later sections were appended later, so they win over earlier ones for the same date
+    latest = {record['date']: record for record in records}
+    imported = [record for date, record in latest.items() if store.get(date) is None]
+    for record in imported:
+        store.record(record, "")
+    if other_sections:
+        with open(VERIFICATION_REPORT_PATH, 'a', encoding='utf-8') as f:
+            f.write("\n".join(other_sections) + "\n")
+    return len(imported)
+
+def import_legacy_report(store):
+    """
+    Moves mismatches from a hand-appended Markdown report into the store (without a content hash,
+    so they are re-audited on the next run) and batch verification sections into their own log.
+    Also happens by itself the first time an empty store records a verdict or renders the report.
+    Returns the number of imported mismatches.
+    """
+    count = _migrate_legacy_report(store)
+    _render_report_file(store)
+    return count
+
+def _has_audit_errors(entry):
+    """True if an API error stood in for a real verdict, so the entry must not be cached."""
+    if entry['p1_predicted'] == "Error":
+        return True
+    return any(f.get('reasoning') == "Error during audit" for f in entry['failures'])
 
 class FactAuditor:
-    def __init__(self, api_key):
+    def __init__(self, api_key, store=None, rate_limiter=None):
+        self.api_key = api_key
         self.client = genai.Client(api_key=api_key)
         self.results = []
+        self.store = store if store is not None else AuditStore()
+        # Shared with the other Gemini callers in this process unless the caller brings its own
+        self.rate_limiter = rate_limiter if rate_limiter is not None else GEMINI_RATE_LIMITER
+        self._lock = threading.Lock()
 
     def scrape_facts(self, html_path):
-        """Extracts player name and all 6 facts from a puzzle HTML file."""
+        """Extracts player name and all 6 facts from a puzzle's canonical record, or its HTML file if it has none."""
+        record = load_puzzle_record(html_path.parent, html_path.stem)
+        if record is not None:
+            return {"name": record['name'], "facts": audited_facts(record), "date": html_path.stem}
         try:
             with open(html_path, 'r', encoding='utf-8') as f:
                 soup = BeautifulSoup(f, 'html.parser')
@@ -75,51 +223,19 @@ class FactAuditor:
     def run_phase_1(self, player_data):
         """Phase 1: Skeptical Identity Sweep."""
         print(f"🔍 Phase 1: Checking identity for {player_data['name']} ({player_data['date']})...")
-        _respect_rate_limit()
-        
-        prompt = f"""
-        You are a skeptical baseball historian. I have a list of facts that are SUPPOSED to be about the player "{player_data['name']}".
-        
-        FACTS TO AUDIT:
-        {json.dumps(player_data['facts'])}
-        
-        YOUR TASK:
-        1. Identify the player(s) described by these facts.
-        2. Determine if ALL facts consistently describe "{player_data['name']}".
-        3. If any fact describes a different player, or if the facts as a whole better fit someone else, you MUST flag it.
-        
-        **IMPORTANT**: Maintain normal English spacing. Do NOT squash words together in your JSON response.
-        
-        Return ONLY a JSON object:
-        {{
-          "primary_identity": "Name of the player most facts describe",
-          "is_fully_consistent": true/false,
-          "reasoning": "Brief explanation if inconsistent"
-        }}
-        """
+        self.rate_limiter.wait()
         
         try:
             response = self.client.models.generate_content(
                 model=MODEL,
-                contents=prompt,
+                contents=build_phase_1_prompt(player_data),
                 config=types.GenerateContentConfig(
                     temperature=0.1,
                     response_mime_type="application/json"
                 )
             )
             
-            result = json.loads(response.text)
-            predicted_name = result.get("primary_identity", "Unknown")
-            is_consistent = result.get("is_fully_consistent", True)
-            
-            # Match if consistent AND the name matches
-            name_matches = predicted_name.lower() in player_data['name'].lower() or player_data['name'].lower() in predicted_name.lower()
-            
-            return {
-                "is_match": is_consistent and name_matches,
-                "predicted_name": predicted_name,
-                "reasoning": result.get("reasoning", "")
-            }
+            return interpret_phase_1(player_data, json.loads(response.text))
         except Exception as e:
             print(f"  ❌ Error in Phase 1: {e}")
             return {"is_match": True, "predicted_name": "Error"} # Assume match on error to avoid Phase 2 spam
@@ -129,34 +245,13 @@ class FactAuditor:
         print(f"🚀 Phase 2: Grounded audit for {player_data['name']}...")
         verdicts = []
         
-        # Check facts in 2 batches to save tokens while keeping context clear
-        batches = [player_data['facts'][:3], player_data['facts'][3:]]
-        
-        for batch in batches:
-            _respect_rate_limit()
-            prompt = f"""
-            Verify each of these baseball facts for the player "{player_data['name']}" using Google Search.
-            
-            Facts:
-            {json.dumps(batch)}
-            
-            **CRITICAL**: Do NOT squash words together. Ensure all "reasoning" and "fact" strings have proper spaces between words.
-            
-            Return ONLY a JSON list of objects:
-            [
-              {{
-                "fact": "...",
-                "is_accurate": true/false,
-                "reasoning": "...",
-                "source": "..."
-              }}
-            ]
-            """
+        for batch in phase_2_batches(player_data['facts']):
+            self.rate_limiter.wait()
             
             try:
                 response = self.client.models.generate_content(
                     model=MODEL,
-                    contents=prompt,
+                    contents=build_phase_2_prompt(player_data['name'], batch),
                     config=types.GenerateContentConfig(
                         temperature=0.1,
                         response_mime_type="application/json",
@@ -168,12 +263,61 @@ class FactAuditor:
                 verdicts.extend(batch_verdicts)
             except Exception as e:
                 print(f"  ❌ Error in Phase 2: {e}")
-                for f in batch:
-                    verdicts.append({"fact": f, "is_accurate": True, "reasoning": "Error during audit", "source": ""})
+                verdicts.extend(error_verdicts(batch))
         
         return verdicts
 
-    def audit_all(self, limit=None, skip=0):
+    def pending_pages(self, html_files, force=False):
+        """Scrapes html_files and returns (player_data, content hash) for pages needing an audit."""
+        pending = []
+        for html_file in html_files:
+            data = self.scrape_facts(html_file)
+            if not data:
+                continue
+            digest = content_hash(data)
+            if not force and self.store.is_current(data['date'], digest):
+                print(f"⏭️ Unchanged since last audit: {data['name']} ({data['date']})")
+                continue
+            pending.append((data, digest))
+        return pending
+
+    def record(self, audit_entry, digest):
+        """Stores a finished audit entry and re-renders the report if the set of mismatches changed."""
+        with self._lock:
+            self.results.append(audit_entry)
+            if _has_audit_errors(audit_entry):
+                return
+            # Mismatches in a report written before the store existed must survive its first re-render
+            migrated = not self.store.records and _migrate_legacy_report(self.store) > 0
+            previous = self.store.get(audit_entry['date'])
+            self.store.record(audit_entry, digest)
+            if migrated or not audit_entry['p1_match'] or (previous and not previous.get('p1_match', True)):
+                self.generate_report()
+
+    def audit_page(self, data, digest):
+        """Runs both audit phases for one scraped page and records the result."""
+        p1_result = self.run_phase_1(data)
+        
+        p2_verdicts = None
+        if not p1_result['is_match']:
+            print(f"  ⚠️ Mismatch found! Target: {data['name']}, Predicted: {p1_result['predicted_name']}")
+            p2_verdicts = self.run_phase_2(data)
+        
+        audit_entry = build_audit_entry(data, p1_result, p2_verdicts)
+        self.record(audit_entry, digest)
+        return audit_entry
+
+    def audit_file(self, html_file, force=False):
+        """
+        Audits one puzzle page unless its content is unchanged since its stored verdict.
+        Returns the audit entry, or None if the page was skipped or could not be scraped.
+        """
+        pending = self.pending_pages([html_file], force=force)
+        if not pending:
+            return None
+        return self.audit_page(*pending[0])
+
+    def _select_files(self, limit=None, skip=0):
         html_files = sorted(PROJECT_DIR.glob("????-??-??.html"), reverse=True)
         
         if skip:
@@ -182,103 +326,139 @@ class FactAuditor:
             
         if limit:
             html_files = html_files[:limit]
+        return html_files
+
+    def audit_all(self, limit=None, skip=0, force=False, workers=1):
+        """
+        Audits every changed page. With workers > 1, pages are audited concurrently;
+        all Gemini calls still pass through the shared rate limiter.
+        """
+        html_files = self._select_files(limit, skip)
+        pending = self.pending_pages(html_files, force=force)
         
-        for html_file in html_files:
-            data = self.scrape_facts(html_file)
-            if not data: continue
-            
-            p1_result = self.run_phase_1(data)
-            
-            audit_entry = {
-                "date": data['date'],
-                "name": data['name'],
-                "p1_match": p1_result['is_match'],
-                "p1_predicted": p1_result['predicted_name'],
-                "reasoning": p1_result.get('reasoning', ''),
-                "failures": []
-            }
-            
-            if not p1_result['is_match']:
-                print(f"  ⚠️ Mismatch found! Target: {data['name']}, Predicted: {p1_result['predicted_name']}")
-                p2_verdicts = self.run_phase_2(data)
-                audit_entry['failures'] = [v for v in p2_verdicts if not v['is_accurate']]
-            
-            self.results.append(audit_entry)
-            self.generate_report()
+        if workers <= 1:
+            for data, digest in pending:
+                self.audit_page(data, digest)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(lambda item: self.audit_page(*item), pending))
+        print(f"✅ Audited {len(pending)} of {len(html_files)} pages; the rest were unchanged since their last audit.")
 
-    def generate_report(self):
-        """Appends the latest result to the audit report."""
-        if not self.results:
+    def audit_all_batch(self, limit=None, skip=0, force=False, batch_client=None):
+        """
+        Audits every changed page through the Batch API: all Phase 1 identity sweeps go
+        out as one batch job, then Phase 2 grounded checks go out as a second job for
+        the mismatches only. Verdicts land in the same store and report as audit_all.
+        """
+        html_files = self._select_files(limit, skip)
+        pending = self.pending_pages(html_files, force=force)
+        if not pending:
+            print("✅ Nothing to audit; every page is unchanged since its last audit.")
             return
+        client = batch_client or BatchClient(api_key=self.api_key)
+        BATCH_DIR.mkdir(parents=True, exist_ok=True)
 
-        file_exists = REPORT_PATH.exists()
-        
-        # We only write the newest result (the last one in the list)
-        r = self.results[-1]
-        
-        # We only care about logging failures/mismatches
-        if r['p1_match']:
-            return
+        # Phase 1: one request per page, keyed by date
+        p1_requests = BATCH_DIR / "phase1_requests.jsonl"
+        p1_responses = BATCH_DIR / "phase1_responses.jsonl"
+        with open(p1_requests, 'w', encoding='utf-8') as f:
+            for data, _ in pending:
+                f.write(json.dumps(_batch_request(data['date'], build_phase_1_prompt(data))) + "\n")
+        print(f"📦 Submitting Phase 1 batch for {len(pending)} pages...")
+        client.run_batch(p1_requests, p1_responses, model=MODEL)
+        p1_parsed = _read_batch_responses(p1_responses)
 
-        with open(REPORT_PATH, 'a', encoding='utf-8') as f:
-            if not file_exists:
-                f.write(f"# Player Fact Audit Report\n")
-                f.write(f"Started on: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            f.write(f"### ❌ {r['name']} ({r['date']})\n")
-            f.write(f"- **Phase 1 Prediction:** {r['p1_predicted']}\n")
-            if r.get('reasoning'):
-                f.write(f"- **Phase 1 Reasoning:** {r['reasoning']}\n")
-            
-            if r['failures']:
-                f.write("- **Debunked Facts:**\n")
-                for fail in r['failures']:
-                    f.write(f"  - **Fact:** {fail['fact']}\n")
-                    f.write(f"    - **Reason:** {fail['reasoning']}\n")
-                    f.write(f"    - **Source:** [{fail['source']}]({fail['source']})\n")
-            else:
-                f.write("- *No specific facts debunked in Phase 2 (potential false positive in P1)*\n")
-            f.write("\n")
-            f.flush()
+        p1_results = {}
+        mismatches = []
+        for data, _ in pending:
+            print(f"🔍 Phase 1: Checking identity for {data['name']} ({data['date']})...")
+            result = p1_parsed.get(data['date'])
+            if result is None:
+                print(f"  ❌ Error in Phase 1: no batch result for {data['date']}")
+                p1_results[data['date']] = {"is_match": True, "predicted_name": "Error"}
+                continue
+            p1_results[data['date']] = interpret_phase_1(data, result)
+            if not p1_results[data['date']]['is_match']:
+                print(f"  ⚠️ Mismatch found! Target: {data['name']}, Predicted: {p1_results[data['date']]['predicted_name']}")
+                mismatches.append(data)
+
+        # Phase 2: grounded checks for mismatches only, keyed by date and fact batch
+        p2_parsed = {}
+        if mismatches:
+            p2_requests = BATCH_DIR / "phase2_requests.jsonl"
+            p2_responses = BATCH_DIR / "phase2_responses.jsonl"
+            with open(p2_requests, 'w', encoding='utf-8') as f:
+                for data in mismatches:
+                    for i, batch in enumerate(phase_2_batches(data['facts'])):
+                        prompt = build_phase_2_prompt(data['name'], batch)
+                        f.write(json.dumps(_batch_request(f"{data['date']}#{i}", prompt, grounded=True)) + "\n")
+            print(f"🚀 Submitting Phase 2 grounded batch for {len(mismatches)} mismatches...")
+            client.run_batch(p2_requests, p2_responses, model=MODEL)
+            p2_parsed = _read_batch_responses(p2_responses)
+
+        for data, digest in pending:
+            p1_result = p1_results[data['date']]
+            p2_verdicts = None
+            if not p1_result['is_match']:
+                p2_verdicts = []
+                for i, batch in enumerate(phase_2_batches(data['facts'])):
+                    verdicts = p2_parsed.get(f"{data['date']}#{i}")
+                    p2_verdicts.extend(verdicts if isinstance(verdicts, list) else error_verdicts(batch))
+            self.record(build_audit_entry(data, p1_result, p2_verdicts), digest)
+        print(f"✅ Audited {len(pending)} of {len(html_files)} pages via the Batch API.")
+
+    def generate_report(self):
+        """Renders the Markdown audit report from every mismatch in the verdict store."""
+        write_report(self.store)
 
 def main():
     parser = argparse.ArgumentParser(description="Audit AI-generated player facts.")
     parser.add_argument("--limit", type=int, help="Limit the number of files to audit.")
     parser.add_argument("--file", type=str, help="Audit a specific HTML file.")
-    parser.add_argument("--skip", type=int, default=0, help="Skip the first N files (useful for resuming).")
-    parser.add_argument("--fresh", action="store_true", help="Start a fresh report (deletes existing one).")
+    parser.add_argument("--skip", type=int, default=0, help="Skip the first N files.")
+    parser.add_argument("--fresh", action="store_true", help="Start a fresh report and forget all stored verdicts.")
+    parser.add_argument("--force", action="store_true", help="Re-audit pages even if unchanged since their last audit.")
+    parser.add_argument("--workers", type=int, default=1, help="Audit this many pages concurrently on the shared rate limiter.")
+    parser.add_argument("--min-interval", type=float, help="Seconds between Gemini calls (default 13 for the Free Tier; lower it on a paid key).")
+    parser.add_argument("--batch", action="store_true", help="Submit Phase 1 and Phase 2 through the Gemini Batch API.")
+    parser.add_argument("--render-report", action="store_true", help="Only re-render the Markdown report from stored verdicts.")
+    parser.add_argument("--import-report", action="store_true", help="Import mismatches from a hand-appended Markdown report into the verdict store.")
     args = parser.parse_args()
 
-    if args.fresh and REPORT_PATH.exists():
-        REPORT_PATH.unlink()
+    if args.import_report:
+        count = import_legacy_report(AuditStore())
+        print(f"📥 Imported {count} mismatches from {REPORT_PATH.name}")
+        return
+
+    if args.render_report:
+        count = write_report(AuditStore())
+        print(f"📝 Rendered {count} mismatches to {REPORT_PATH.name}")
+        return
+
+    if args.fresh:
+        if REPORT_PATH.exists():
+            REPORT_PATH.unlink()
+        AuditStore().clear()
+
+    # A different interval gets its own limiter rather than retuning the process-wide one
+    rate_limiter = None
+    if args.min_interval is not None:
+        rate_limiter = RateLimiter(args.min_interval, start_immediately=False)
 
     try:
         api_key = load_api_key()
-        auditor = FactAuditor(api_key)
+        auditor = FactAuditor(api_key, rate_limiter=rate_limiter)
         
         if args.file:
             html_file = PROJECT_DIR / args.file
             if html_file.exists():
-                data = auditor.scrape_facts(html_file)
-                if data:
-                    p1_result = auditor.run_phase_1(data)
-                    audit_entry = {
-                        "date": data['date'],
-                        "name": data['name'],
-                        "p1_match": p1_result['is_match'],
-                        "p1_predicted": p1_result['predicted_name'],
-                        "reasoning": p1_result.get('reasoning', ''),
-                        "failures": []
-                    }
-                    if not p1_result['is_match']:
-                        p2_verdicts = auditor.run_phase_2(data)
-                        audit_entry['failures'] = [v for v in p2_verdicts if not v['is_accurate']]
-                    auditor.results.append(audit_entry)
-                    auditor.generate_report()
+                auditor.audit_file(html_file, force=True)
             else:
                 print(f"File not found: {args.file}")
+        elif args.batch:
+            auditor.audit_all_batch(limit=args.limit, skip=args.skip, force=args.force)
         else:
-            auditor.audit_all(limit=args.limit, skip=args.skip)
+            auditor.audit_all(limit=args.limit, skip=args.skip, force=args.force, workers=args.workers)
 
     except Exception as e:
         print(f"Error: {e}")
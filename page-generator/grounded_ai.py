@@ -2,10 +2,12 @@
 # ABOUTME: Uses Gemini 3.1 Flash Lite with a Skeptical Copy Editor persona to ensure accuracy.
 
 import json
-import time
 import re
 from google import genai  # type: ignore
-from google.genai import types  # type: ignore
+from google.genai import types, errors  # type: ignore
+
+from ai_services import GeminiDailyQuotaExceeded, is_daily_quota_error
+from rate_limiter import GEMINI_RATE_LIMITER
 
 # --- CONFIGURATION ---
 MODEL = 'gemini-3.1-flash-lite'
@@ -23,19 +25,9 @@ FORBIDDEN_GENERIC_PHRASES = [
     "professional journey"
 ]
 
-# Rate limiting state
-_LAST_GEMINI_CALL_TS = time.time()
-
 def _respect_free_tier_rate_limit():
     """Enforce a conservative delay between Gemini API calls to respect Free Tier limits."""
-    global _LAST_GEMINI_CALL_TS
-    now = time.time()
-    min_interval = 13.0  # seconds
-    elapsed = now - _LAST_GEMINI_CALL_TS
-    if elapsed < min_interval:
-        sleep_for = min_interval - elapsed
-        time.sleep(sleep_for)
-    _LAST_GEMINI_CALL_TS = time.time()
+    GEMINI_RATE_LIMITER.wait()
 
 def get_gemini_client(api_key: str):
     """Returns a Gemini API client instance."""
@@ -150,7 +142,6 @@ def generate_grounded_trivia(player_dossier, api_key: str):
     Generates trivia facts and Q&A pairs anchored strictly to the provided player dossier.
     Includes a quality guard that forces retries on spoilers or low-quality filler.
     """
-    _respect_free_tier_rate_limit()
     client = get_gemini_client(api_key)
     
     player_name = player_dossier.get('name', 'Unknown Player')
@@ -232,14 +223,21 @@ Return ONLY a JSON object:
 
     max_attempts = 5
     for attempt in range(max_attempts):
-        response = client.models.generate_content(
-            model=MODEL,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.2
+        # Every Quality Guard retry is a request of its own against the shared quota
+        _respect_free_tier_rate_limit()
+        try:
+            response = client.models.generate_content(
+                model=MODEL,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    temperature=0.2
+                )
             )
-        )
+        except errors.APIError as e:
+            if is_daily_quota_error(e):
+                raise GeminiDailyQuotaExceeded(str(e)) from e
+            raise
         
         try:
             result = json.loads(response.text)
@@ -1,6 +1,10 @@
 # ABOUTME: Generates individual trivia puzzle HTML files from player data.
 # ABOUTME: Applies SEO standards, canonical tags, and structured data templates.
+import hashlib
 import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup  # type: ignore
 from datetime import datetime
 import re
@@ -9,8 +13,58 @@ from datetime import date
 import html
 from typing import Dict, List
 
-def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str) -> str:
-    """Builds and returns the HTML string for the detail page."""
+from career_chart import chart_data, chart_scripts_html
+from image_manifest import image_entries, refresh_image_manifest
+from image_variants import current_variants, variant_path
+from precompress import precompress_site
+from service_worker import DEFAULT_PRECACHE_PUZZLES, write_service_worker
+from search_index import SEARCH_INDEX_NAME, build_search_index, search_index_json
+from stats_summary import (SEARCH_INDEX_VERSION_META, STATS_SUMMARY_NAME, STATS_VERSION_META, content_version,
+                           stamp_version, stats_summary_json)
+from puzzle_store import build_puzzle_record, load_puzzle_record, page_metadata, record_dates, save_puzzle_record, search_data_for
+
+def _placeholder_style(entry: dict) -> str:
+    return f"background-image:url({entry['placeholder']})"
+
+def _image_size_attributes(entry: dict) -> str:
+    """width, height and placeholder attributes for an <img>, from its image manifest entry (none if unknown)."""
+    if not entry:
+        return ""
+    return f' width="{entry["width"]}" height="{entry["height"]}" style="{_placeholder_style(entry)}"'
+
+# How wide each image is drawn, so the browser can pick a srcset candidate before layout
+GALLERY_IMAGE_SIZES = "(max-width: 700px) 100vw, 400px"
+ANSWER_IMAGE_SIZES = "(max-width: 992px) 50vw, 300px"
+CLUE_IMAGE_SIZES = "(max-width: 992px) 100vw, 300px"
+
+def _srcset(name: str, widths: List[int], image_format: str) -> str:
+    """A srcset over an image's variants; the full-width WebP is the image itself."""
+    candidates = []
+    for width in widths:
+        path = name if image_format == 'webp' and width == widths[-1] else variant_path(name, width, image_format)
+        candidates.append(f"images/{path} {width}w")
+    return ", ".join(candidates)
+
+def _detail_image_html(name: str, attributes: str, entry: dict, sizes: str) -> str:
+    """The <img> for a detail page image, inside a <picture> offering AVIF when the image has current variants."""
+    size_attrs = _image_size_attributes(entry)
+    variants = current_variants(entry)
+    if not variants:
+        return f'<img src="images/{name}" {attributes}{size_attrs}>'
+    widths = variants['widths']
+    return (f'<picture><source type="image/avif" srcset="{_srcset(name, widths, "avif")}" sizes="{sizes}">'
+            f'<img src="images/{name}" srcset="{_srcset(name, widths, "webp")}" sizes="{sizes}" {attributes}{size_attrs}></picture>')
+
+def puzzle_image_names(date_str: str) -> List[str]:
+    return [f"answer-{date_str}.webp", f"clue-{date_str}.webp"]
+
+def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str, search_data: dict = None,
+                           images: Dict[str, dict] = None) -> str:
+    """
+    Builds and returns the HTML string for the detail page. search_data overrides the teams/years
+    derived from yearly_war, for records whose per-season team lists were not kept. images holds
+    image manifest entries by file name, which size the clue and answer images.
+    """
     name = player_data.get('name', 'N/A')
     nicknames = player_data.get('nicknames', [])
     if not nicknames:
@@ -24,6 +78,11 @@ def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str
     # Display uses only the primary nickname for the h2 heading
     primary_nickname = nicknames[0] if nicknames else ''
     display_name = html.escape(f'{name} "{primary_nickname}"' if primary_nickname else name)
+    images = images or {}
+    answer_image_html = _detail_image_html(f"answer-{date_str}.webp", f'alt="Photo of {name}" decoding="async"',
+                                           images.get(f"answer-{date_str}.webp"), ANSWER_IMAGE_SIZES)
+    clue_image_html = _detail_image_html(f"clue-{date_str}.webp", 'alt="Original trivia card" decoding="async"',
+                                         images.get(f"clue-{date_str}.webp"), CLUE_IMAGE_SIZES)
     facts_html = "\n".join([f"                        <li>{fact}</li>" for fact in facts])
 
     followup_section_html = ""
@@ -75,16 +134,8 @@ def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str
     search_data_html = ""
     quiz_data_html = ""
     if yearly_war_data:
-        years = json.dumps([item['year'] for item in yearly_war_data])
-        war_data = json.dumps([item['war'] for item in yearly_war_data])
-        teams_by_year = json.dumps([item['display_team'] for item in yearly_war_data])
-        
-        all_teams = set()
-        for item in yearly_war_data:
-            for team in item['teams']:
-                all_teams.add(team)
-        all_years = {item['year'] for item in yearly_war_data}
-        search_data = {'teams': list(all_teams), 'years': sorted(list(all_years))}
+        if search_data is None:
+            search_data = search_data_for(yearly_war_data)
         search_data_html = f'<div id="search-data" style="display:none;">{json.dumps(search_data)}</div>'
 
         quiz_data = {"answer": name, "nicknames": nicknames, "hints": facts}
@@ -99,88 +150,7 @@ def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str
         </div>
 
         <script src="https://cdn.jsdelivr.net/npm/chart.js@4.5.1" integrity="sha384-jb8JQMbMoBUzgWatfe6COACi2ljcDdZQ2OxczGA3bGNeWe+6DChMTBJemed7ZnvJ" crossorigin="anonymous"></script>
-        <script src="js/team_colors.js"></script>
-        <script>
-            const years = {years};
-            const warData = {war_data};
-            const teamsByYear = {teams_by_year};
-            const teamColors = window.TEAM_COLORS;
-
-            const waterfallData = [];
-            let cumulativeTotal = 0;
-            for (const war of warData) {{
-                waterfallData.push([cumulativeTotal, cumulativeTotal + war]);
-                cumulativeTotal += war;
-            }}
-            waterfallData.push([0, cumulativeTotal]);
-
-            const labels = [...years, 'Career Total'];
-            const backgroundColors = teamsByYear.map(team => (teamColors[team] || teamColors['Default']).bg);
-            backgroundColors.push(teamColors['Total'].bg);
-
-            const borderColors = teamsByYear.map(team => (teamColors[team] || teamColors['Default']).border);
-            borderColors.push(teamColors['Total'].border);
-
-            const ctx = document.getElementById('careerArcChart').getContext('2d');
-            new Chart(ctx, {{
-                type: 'bar',
-                data: {{
-                    labels: labels,
-                    datasets: [{{
-                        label: 'WAR',
-                        data: waterfallData,
-                        backgroundColor: backgroundColors,
-                        borderColor: borderColors,
-                        borderWidth: 2,
-                        borderRadius: 4,
-                    }}]
-                }},
-                options: {{
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: {{
-                        title: {{ display: false }},
-                        tooltip: {{
-                            callbacks: {{
-                                label: function(context) {{
-                                    const i = context.dataIndex;
-                                    if (i < warData.length) {{
-                                        return `${{years[i]}} (${{teamsByYear[i]}}): ${{warData[i].toFixed(1)}}`;
-                                    }} else {{
-                                        return `Total Career WAR: ${{cumulativeTotal.toFixed(1)}}`;
-                                    }}
-                                }}
-                            }}
-                        }},
-                        legend: {{
-                            display: true,
-                            position: 'bottom',
-                            labels: {{
-                                padding: 20,
-                                font: {{ size: 10 }},
-                                generateLabels: function(chart) {{
-                                    const uniqueTeams = [...new Set(teamsByYear)];
-                                    const legendItems = uniqueTeams.map(teamAbbr => {{
-                                        const teamInfo = teamColors[teamAbbr] || teamColors['Default'];
-                                        return {{ text: teamInfo.name, fillStyle: teamInfo.bg, strokeStyle: teamInfo.border, lineWidth: 2 }};
-                                    }});
-                                    legendItems.push({{ text: teamColors['Total'].name, fillStyle: teamColors['Total'].bg, strokeStyle: teamColors['Total'].border, lineWidth: 2 }});
-                                    return legendItems;
-                                }}
-                            }}
-                        }}
-                    }},
-                    scales: {{
-                        y: {{ title: {{ display: false }} }},
-                        x: {{ 
-                            title: {{ display: false }}, 
-                            grid: {{ display: false }},
-                            ticks: {{ maxTicksLimit: 15 }}
-                        }}
-                    }}
-                }}
-            }});
-        </script>
+{chart_scripts_html(chart_data(yearly_war_data), indent="        ")}
         """
 
     template = f"""<!DOCTYPE html>
@@ -267,7 +237,7 @@ def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str
             <div class="left-column">
                 <div class="player-profile">
                     <div class="player-photo">
-                        <img src="images/answer-{date_str}.webp" alt="Photo of {name}" decoding="async">
+                        {answer_image_html}
                     </div>
                     <div class="player-info">
                         <h2>{display_name}</h2>
@@ -286,7 +256,7 @@ def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str
             <div class="right-column">
                 <div class="original-card">
                     <h3>The Original Clue</h3>
-                    <img src="images/clue-{date_str}.webp" alt="Original trivia card" decoding="async">
+                    {clue_image_html}
                 </div>
                 {chart_html}
             </div>
@@ -299,6 +269,15 @@ def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str
 		<p class="disclaimer-footer">
 	        This site is an unofficial fan project and is not affiliated with the New York Yankees, Major League Baseball, or the YES Network. All trademarks and copyrights belong to their respective owners.
 	    </p>
+        <p class="copyright">
+            <a href="https://namethatyankeequiz.com">Name That Yankee Quiz</a> © 2026 by 
+            <a href="https://github.com/zagers/NameThatYankee">Scott Zager</a> is licensed under 
+            <a href="https://creativecommons.org/licenses/by-nc-sa/4.0/">CC BY-NC-SA 4.0</a>
+            <img src="https://mirrors.creativecommons.org/presskit/icons/cc.svg" alt="CC" style="max-width: 1em;max-height:1em;margin-left: .2em;">
+            <img src="https://mirrors.creativecommons.org/presskit/icons/by.svg" alt="BY" style="max-width: 1em;max-height:1em;margin-left: .2em;">
+            <img src="https://mirrors.creativecommons.org/presskit/icons/nc.svg" alt="NC" style="max-width: 1em;max-height:1em;margin-left: .2em;">
+            <img src="https://mirrors.creativecommons.org/presskit/icons/sa.svg" alt="SA" style="max-width: 1em;max-height:1em;margin-left: .2em;">
+        </p>
     </footer>    
 </body>
 </html>"""
@@ -306,43 +285,280 @@ def build_detail_page_html(player_data: dict, date_str: str, formatted_date: str
     return template
 
 def generate_detail_page(player_data: dict, date_str: str, formatted_date: str, project_dir: Path):
-    """Generates and saves the new HTML detail page, now with quiz and search data."""
+    """Generates and saves the HTML detail page and its canonical data/puzzles/{date}.json record."""
     print(f"  📄 Generating detail page for {date_str}...")
     
-    html_content = build_detail_page_html(player_data, date_str, formatted_date)
+    images = image_entries(project_dir / "images", puzzle_image_names(date_str))
+    html_content = build_detail_page_html(player_data, date_str, formatted_date, images=images)
     
     file_path = project_dir / f"{date_str}.html"
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(html_content)
+    save_puzzle_record(project_dir, build_puzzle_record(player_data, date_str))
     print(f"  ✅ Detail page saved successfully.")
 
-def generate_gallery_snippet(i, date_str, formatted_date, search_terms):
+# Gallery tiles are written in the exact layout BeautifulSoup's prettify() gives index.html
+# (one node per line, one space per depth, sorted attributes), so they can be spliced in as text.
+GALLERY_TILE_TEMPLATE = """<div class="gallery-container" data-search-terms={search_terms}>
+ <a class="gallery-item" href="{date_str}?reveal=true">
+  {image_html}
+ </a>
+ <div class="p-4">
+  <p class="gallery-date">
+   Trivia Date: {formatted_date}
+  </p>
+  <div class="action-links">
+   <a class="action-link reveal-link" href="{date_str}?reveal=true">
+    <svg fill="none" height="20" stroke="currentColor" stroke-linecap="round" stroke-linejoin="round" stroke-width="2" viewbox="0 0 24 24" width="20" xmlns="http://www.w3.org/2000/svg">
+     <circle cx="11" cy="11" r="8">
+     </circle>
+     <path d="m21 21-4.3-4.3">
+     </path>
+    </svg>
+    <span>
+     Reveal
+    </span>
+   </a>
+   <a class="action-link quiz-link" href="quiz?date={date_str}" rel="nofollow">
+    <svg fill="none" height="28" stroke="currentColor" stroke-linecap="round" stroke-linejoin="round" stroke-width="2" viewbox="0 0 24 24" width="28" xmlns="http://www.w3.org/2000/svg">
+     <path d="M9.09 9a3 3 0 0 1 5.83 1c0 2-3 3-3 3">
+     </path>
+     <path d="M12 17h.01">
+     </path>
+    </svg>
+    <span>
+     Quiz
+    </span>
+   </a>
+  </div>
+ </div>
+</div>"""
+
+def _quoted_attribute(value: str) -> str:
+    """Escapes and quotes an attribute value the way BeautifulSoup's minimal formatter does."""
+    value = html.escape(value, quote=False)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', "&quot;") + '"'
+
+def generate_gallery_snippet(i, date_str, formatted_date, search_terms, image: dict = None):
     """
-    Generates a single gallery card snippet with LCP-aware image loading.
+    Generates a single gallery card snippet with LCP-aware image loading. image is the clue's
+    image manifest entry; with it the tile carries the image's size and placeholder.
     """
     # Only lazy load items below the fold (index > 5)
-    loading_attr = 'loading="lazy"' if i > 5 else ''
+    loading_attr = 'loading="lazy" ' if i > 5 else ''
+    # Attributes stay in sorted order (height, loading, sizes, src, srcset, style, width) to match prettify()
+    height_attr = f'height="{image["height"]}" ' if image else ''
+    size_attrs = f' style="{_placeholder_style(image)}" width="{image["width"]}"' if image else ''
+    name = f"clue-{date_str}.webp"
+    variants = current_variants(image)
+    srcset_attrs = ('', '')
+    if variants:
+        srcset_attrs = (f'sizes="{GALLERY_IMAGE_SIZES}" ', f' srcset="{_srcset(name, variants["widths"], "webp")}"')
+    image_html = (f'<img alt="Name that Yankee trivia card from {date_str}" decoding="async" {height_attr}{loading_attr}'
+                  f'{srcset_attrs[0]}src="images/{name}"{srcset_attrs[1]}{size_attrs}/>')
+    if variants:
+        # Nested one level deeper than a bare <img>, as prettify() lays out <picture>
+        avif_srcset = _srcset(name, variants['widths'], 'avif')
+        image_html = (f'<picture>\n   <source sizes="{GALLERY_IMAGE_SIZES}" srcset="{avif_srcset}" type="image/avif"/>'
+                      f'\n   {image_html}\n  </picture>')
     
-    return f"""<div class="gallery-container" data-search-terms="{html.escape(search_terms)}">
-                <a href="{date_str}?reveal=true" class="gallery-item">
-                    <img src="images/clue-{date_str}.webp" alt="Name that Yankee trivia card from {date_str}" {loading_attr} decoding="async">
-                </a>
-                <div class="p-4">
-                    <p class="gallery-date">Trivia Date: {formatted_date}</p>
-                    <div class="action-links">
-                        <a href="{date_str}?reveal=true" class="action-link reveal-link">
-                            <svg xmlns="http://www.w3.org/2000/svg" width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><circle cx="11" cy="11" r="8"/><path d="m21 21-4.3-4.3"/></svg>
-                            <span>Reveal</span>
-                        </a>
-                        <a href="quiz?date={date_str}" class="action-link quiz-link" rel="nofollow">
-                            <svg xmlns="http://www.w3.org/2000/svg" width="28" height="28" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M9.09 9a3 3 0 0 1 5.83 1c0 2-3 3-3 3"/><path d="M12 17h.01"/></svg>
-                            <span>Quiz</span>
-                        </a>
-                    </div>
-                </div>
-            </div>"""
+    return GALLERY_TILE_TEMPLATE.format(
+        search_terms=_quoted_attribute(search_terms),
+        date_str=date_str,
+        formatted_date=html.escape(formatted_date, quote=False),
+        image_html=image_html
+    )
+
+GALLERY_OPEN_PATTERN = re.compile(r'^( *)<div class="(?:[^"]* )?gallery(?: [^"]*)?"[^>]*>$', re.MULTILINE)
+
+def splice_gallery(index_html: str, gallery_tiles: List[str]):
+    """
+    Replaces the contents of the gallery <div> in a prettified index.html with gallery_tiles,
+    leaving every other byte untouched. Returns None if the gallery region cannot be located.
+    """
+    opening = GALLERY_OPEN_PATTERN.search(index_html)
+    if not opening:
+        return None
+    indent = opening.group(1)
+    closing = index_html.find(f"\n{indent}</div>", opening.end())
+    if closing == -1:
+        return None
+
+    tile_indent = indent + " "
+    parts = [index_html[:opening.end()]]
+    for tile in gallery_tiles:
+        parts.append("\n" + tile_indent + tile.replace("\n", "\n" + tile_indent))
+    parts.append(index_html[closing:])
+    return "".join(parts)
+
+def normalize_index_page(index_html: str, gallery_tiles: List[str]):
+    """
+    Fills the gallery through BeautifulSoup and applies the footer/chevron fix-ups, for an index.html
+    that is not yet in prettified form. Returns None if there is no gallery to fill.
+    """
+    soup = BeautifulSoup(index_html, 'html.parser')
+    gallery_div = soup.select_one('.gallery')
+    if not gallery_div:
+        return None
+    gallery_div.clear()
+    for tile_html in gallery_tiles:
+        gallery_div.append(BeautifulSoup(tile_html, 'html.parser'))
+        gallery_div.append('\n')
+    
+    # Update index.html copyright and chevron
+    copyright_p = soup.select_one('footer .copyright')
+    if copyright_p:
+        copyright_p.clear()
+        new_copyright_html = f"""<a href="https://namethatyankeequiz.com">Name That Yankee Quiz</a> © 2026 by 
+            <a href="https://github.com/zagers/NameThatYankee">Scott Zager</a> is licensed under 
+            <a href="https://creativecommons.org/licenses/by-nc-sa/4.0/">CC BY-NC-SA 4.0</a>
+            <img src="https://mirrors.creativecommons.org/presskit/icons/cc.svg" alt="CC" style="max-width: 1em;max-height:1em;margin-left: .2em;">
+            <img src="https://mirrors.creativecommons.org/presskit/icons/by.svg" alt="BY" style="max-width: 1em;max-height:1em;margin-left: .2em;">
+            <img src="https://mirrors.creativecommons.org/presskit/icons/nc.svg" alt="NC" style="max-width: 1em;max-height:1em;margin-left: .2em;">
+            <img src="https://mirrors.creativecommons.org/presskit/icons/sa.svg" alt="SA" style="max-width: 1em;max-height:1em;margin-left: .2em;">"""
+        copyright_p.append(BeautifulSoup(new_copyright_html, 'html.parser'))
+
+    # Update index chevron
+    index_chevron = soup.select_one('#score-display .chevron-icon')
+    if index_chevron:
+        index_chevron['aria-hidden'] = 'true'
+
+    return soup.prettify()
+
+TEAM_NAME_MAP = {
+    'NYY': 'new york yankees', 'BOS': 'boston red sox', 'CAL': 'california angels',
+    'CHW': 'chicago white sox', 'OAK': 'oakland athletics', 'PHI': 'philadelphia phillies',
+    'SDP': 'san diego padres', 'LAD': 'los angeles dodgers', 'CHC': 'chicago cubs',
+    'NYM': 'new york mets', 'CIN': 'cincinnati reds', 'ATL': 'atlanta braves',
+    'CLE': 'cleveland indians guardians', 'SEA': 'seattle mariners', 'TOR': 'toronto blue jays',
+    'TEX': 'texas rangers', 'KCR': 'kansas city royals', 'MIN': 'minnesota twins',
+    'DET': 'detroit tigers', 'BAL': 'baltimore orioles', 'TBR': 'tampa bay rays devil',
+    'HOU': 'houston astros', 'LAA': 'los angeles angels', 'SFG': 'san francisco giants',
+    'ARI': 'arizona diamondbacks', 'COL': 'colorado rockies', 'MIL': 'milwaukee brewers',
+    'STL': 'st louis cardinals', 'PIT': 'pittsburgh pirates', 'MIA': 'miami florida marlins',
+    'WSN': 'washington nationals', 'MON': 'montreal expos'
+}
+
+# Cache of per-page metadata and of the last index output, so rebuilds only re-parse changed detail pages.
+INDEX_MANIFEST_NAME = ".index_manifest.json"
+INDEX_MANIFEST_VERSION = 1
+
+def extract_page_metadata(detail_html: str) -> dict:
+    """Recovers the name, nickname, teams and years shown on a detail page (teams/years are None without search data)."""
+    detail_soup = BeautifulSoup(detail_html, 'html.parser')
+    metadata = {'name': "Unknown", 'nickname': "", 'teams': None, 'years': None}
+
+    # Extract name and nickname from <h2>
+    h2_el = detail_soup.find('h2')
+    if h2_el:
+        full_title = h2_el.get_text(strip=True)
+        # Name format is "Name "Nickname""
+        if '"' in full_title:
+            parts = full_title.split('"')
+            metadata['name'] = parts[0].strip()
+            metadata['nickname'] = parts[1].strip()
+        else:
+            metadata['name'] = full_title
+
+    search_data_div = detail_soup.find('div', id='search-data')
+    if search_data_div:
+        search_data = json.loads(search_data_div.string or "{}")
+        metadata['teams'] = search_data.get('teams', [])
+        metadata['years'] = search_data.get('years', [])
+    return metadata
+
+def load_index_manifest(project_dir: Path) -> dict:
+    manifest_path = project_dir / INDEX_MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": INDEX_MANIFEST_VERSION, "pages": {}, "index": {}}
+    if manifest.get("version") != INDEX_MANIFEST_VERSION:
+        return {"version": INDEX_MANIFEST_VERSION, "pages": {}, "index": {}}
+    return manifest
+
+def get_page_metadata(detail_page_path: Path, manifest_pages: dict, date_str: str):
+    """
+    Returns (metadata, parsed) for a detail page, re-parsing it only when its mtime/size
+    and then its content hash differ from the manifest entry. Updates manifest_pages in place.
+    """
+    stat = detail_page_path.stat()
+    entry = manifest_pages.get(date_str)
+    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['metadata'], False
+
+    content = detail_page_path.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    parsed = not entry or entry['sha256'] != digest
+    metadata = extract_page_metadata(content.decode('utf-8')) if parsed else entry['metadata']
+    manifest_pages[date_str] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest, 'metadata': metadata}
+    return metadata, parsed
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Atomically writes content to path unless the file already holds exactly those bytes. Returns True if written."""
+    data = content.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_bytes(data)
+    temp_path.replace(path)
+    return True
+
+# Archive output modes: "full" puts every tile in index.html; "sharded" keeps only the newest
+# static_tiles there and writes the rest to archive/{YYYY-MM}.html fragments that index.js loads on demand.
+ARCHIVE_MODES = ("full", "sharded")
+DEFAULT_ARCHIVE_MODE = "full"
+DEFAULT_STATIC_TILES = 24
+ARCHIVE_SHARD_DIR = "archive"
+
+def load_project_config(project_dir: Path) -> dict:
+    """The project's automation_config.json, or an empty dict if it is missing or unreadable."""
+    try:
+        return json.loads((project_dir / "automation_config.json").read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def load_archive_settings(project_dir: Path):
+    """Reads (archive_mode, static_tiles) from the "site" section of the project's automation_config.json."""
+    site = load_project_config(project_dir).get("site", {})
+    archive_mode = site.get("archive_mode", DEFAULT_ARCHIVE_MODE)
+    if archive_mode not in ARCHIVE_MODES:
+        print(f"⚠️  Warning: Unknown archive_mode '{archive_mode}'; using '{DEFAULT_ARCHIVE_MODE}'.")
+        archive_mode = DEFAULT_ARCHIVE_MODE
+    return archive_mode, max(1, int(site.get("static_tiles", DEFAULT_STATIC_TILES)))
+
+def write_archive_shards(project_dir: Path, shard_tiles: Dict[str, List[str]]) -> int:
+    """
+    Writes one archive/{month}.html fragment per month and deletes shards for months that are no
+    longer sharded. Returns the number of shard files written or removed.
+    """
+    shard_dir = project_dir / ARCHIVE_SHARD_DIR
+    changed = 0
+    if shard_tiles:
+        shard_dir.mkdir(exist_ok=True)
+    for month, tiles in shard_tiles.items():
+        changed += write_if_changed(shard_dir / f"{month}.html", "\n".join(tiles) + "\n")
+    if shard_dir.is_dir():
+        for stale in shard_dir.glob("????-??.html"):
+            if stale.stem not in shard_tiles:
+                stale.unlink()
+                changed += 1
+    return changed
+
+def stamp_page_version(page_path: Path, meta_name: str, version: str) -> bool:
+    """Points a static page at the current version of a data file. Returns True if the page was rewritten."""
+    if not page_path.exists():
+        return False
+    return write_if_changed(page_path, stamp_version(page_path.read_text(encoding='utf-8'), meta_name, version))
 
-def rebuild_index_page(project_dir: Path):
+def rebuild_index_page(project_dir: Path, archive_mode: str = None, static_tiles: int = None):
     print("\n✍️ Rebuilding and re-sorting index.html from all available clues...")
     index_path = project_dir / "index.html"
     images_dir = project_dir / "images"
@@ -357,23 +573,18 @@ def rebuild_index_page(project_dir: Path):
         print("🤷 No clue images found in the 'images' directory.")
         return
 
+    configured_mode, configured_static = load_archive_settings(project_dir)
+    archive_mode = archive_mode or configured_mode
+    static_tiles = static_tiles or configured_static
+    image_manifest = refresh_image_manifest(images_dir)
+
+    manifest = load_index_manifest(project_dir)
+    manifest_pages = {}
+    parsed_count = 0
     gallery_tiles = []
+    shard_tiles = {}
     stats_summary = []
     date_pattern = re.compile(r"clue-(\d{4}-\d{2}-\d{2})\.webp")
-    
-    team_name_map = {
-        'NYY': 'new york yankees', 'BOS': 'boston red sox', 'CAL': 'california angels',
-        'CHW': 'chicago white sox', 'OAK': 'oakland athletics', 'PHI': 'philadelphia phillies',
-        'SDP': 'san diego padres', 'LAD': 'los angeles dodgers', 'CHC': 'chicago cubs',
-        'NYM': 'new york mets', 'CIN': 'cincinnati reds', 'ATL': 'atlanta braves',
-        'CLE': 'cleveland indians guardians', 'SEA': 'seattle mariners', 'TOR': 'toronto blue jays',
-        'TEX': 'texas rangers', 'KCR': 'kansas city royals', 'MIN': 'minnesota twins',
-        'DET': 'detroit tigers', 'BAL': 'baltimore orioles', 'TBR': 'tampa bay rays devil',
-        'HOU': 'houston astros', 'LAA': 'los angeles angels', 'SFG': 'san francisco giants',
-        'ARI': 'arizona diamondbacks', 'COL': 'colorado rockies', 'MIL': 'milwaukee brewers',
-        'STL': 'st louis cardinals', 'PIT': 'pittsburgh pirates', 'MIA': 'miami florida marlins',
-        'WSN': 'washington nationals', 'MON': 'montreal expos'
-    }
 
     for i, clue_file in enumerate(all_clue_files):
         match = date_pattern.search(clue_file.name)
@@ -387,101 +598,168 @@ def rebuild_index_page(project_dir: Path):
                 search_terms: str = formatted_date.lower().replace(',', '') 
 
                 # Metadata for stats_summary
-                player_name = "Unknown"
-                player_nickname = ""
-                teams = []
-                years = []
-
-                if detail_page_path.exists():
-                    with open(detail_page_path, 'r', encoding='utf-8') as detail_f:
-                        detail_soup = BeautifulSoup(detail_f, 'html.parser')
+                metadata = {'name': "Unknown", 'nickname': "", 'teams': None, 'years': None}
+
+                record = load_puzzle_record(project_dir, date_str)
+                if record is not None:
+                    metadata = page_metadata(record)
+                elif detail_page_path.exists():
+                    # Pages generated before canonical records existed are scraped, cached by the manifest
+                    if date_str in manifest['pages']:
+                        manifest_pages[date_str] = manifest['pages'][date_str]
+                    metadata, parsed = get_page_metadata(detail_page_path, manifest_pages, date_str)
+                    parsed_count += parsed
+
+                teams = metadata['teams'] or []
+                years = metadata['years'] or []
+                if metadata['teams'] is not None:
+                    search_terms += " " + " ".join(teams).lower()
+                    search_terms += " " + " ".join(years)
                     
-                    # Extract name and nickname from <h2>
-                    h2_el = detail_soup.find('h2')
-                    if h2_el:
-                        full_title = h2_el.get_text(strip=True)
-                        # Name format is "Name "Nickname""
-                        if '"' in full_title:
-                            parts = full_title.split('"')
-                            player_name = parts[0].strip()
-                            player_nickname = parts[1].strip()
-                        else:
-                            player_name = full_title
-
-                    search_data_div = detail_soup.find('div', id='search-data')
-                    if search_data_div:
-                        search_data_str = search_data_div.string or "{}"
-                        search_data = json.loads(search_data_str)
-                        teams = search_data.get('teams', [])
-                        years = search_data.get('years', [])
-                        
-                        search_terms += " " + " ".join(teams).lower()
-                        search_terms += " " + " ".join(years)
-                        
-                        for team_abbr in teams:
-                            if team_abbr in team_name_map:
-                                search_terms = f"{search_terms} {team_name_map.get(team_abbr, '')}"
+                    for team_abbr in teams:
+                        if team_abbr in TEAM_NAME_MAP:
+                            search_terms = f"{search_terms} {TEAM_NAME_MAP.get(team_abbr, '')}"
 
                 # Collect into stats_summary
-                stats_summary.append({
+                summary = {
                     'date': date_str,
-                    'name': player_name,
-                    'nickname': player_nickname,
+                    'name': metadata['name'],
+                    'nickname': metadata['nickname'],
                     'teams': teams,
                     'years': years
-                })
+                }
 
                 # Generate the gallery card snippet
-                snippet = generate_gallery_snippet(i, date_str, formatted_date, search_terms)
-                gallery_tiles.append(snippet)
+                snippet = generate_gallery_snippet(i, date_str, formatted_date, search_terms, image_manifest.get(clue_file.name))
+                if archive_mode == "sharded" and len(gallery_tiles) >= static_tiles:
+                    # Tells index.js which fragment holds a tile that is not in index.html
+                    summary['shard'] = date_str[:7]
+                    shard_tiles.setdefault(summary['shard'], []).append(snippet)
+                else:
+                    gallery_tiles.append(snippet)
+                stats_summary.append(summary)
             except ValueError:
                 print(f"⚠️  Warning: Skipping file with invalid date format: {clue_file.name}")
-    
-    with open(index_path, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f, 'html.parser')
-    gallery_div = soup.select_one('.gallery')
-    if not gallery_div:
-        print(f"❌ Could not find insertion point in index.html.")
-        return
-    gallery_div.clear()
-    for tile_html in gallery_tiles:
-        tile_soup = BeautifulSoup(tile_html, 'html.parser')
-        gallery_div.append(tile_soup)
-        gallery_div.append('\n')
-    
-    # Update index.html copyright and chevron
-    copyright_p = soup.select_one('footer .copyright')
-    if copyright_p:
-        copyright_p.clear()
-        new_copyright_html = f"""<a href="https://namethatyankeequiz.com">Name That Yankee Quiz</a> © 2026 by 
-            <a href="https://github.com/zagers/NameThatYankee">Scott Zager</a> is licensed under 
-            <a href="https://creativecommons.org/licenses/by-nc-sa/4.0/">CC BY-NC-SA 4.0</a>
-            <img src="https://mirrors.creativecommons.org/presskit/icons/cc.svg" alt="CC" style="max-width: 1em;max-height:1em;margin-left: .2em;">
-            <img src="https://mirrors.creativecommons.org/presskit/icons/by.svg" alt="BY" style="max-width: 1em;max-height:1em;margin-left: .2em;">
-            <img src="https://mirrors.creativecommons.org/presskit/icons/nc.svg" alt="NC" style="max-width: 1em;max-height:1em;margin-left: .2em;">
-            <img src="https://mirrors.creativecommons.org/presskit/icons/sa.svg" alt="SA" style="max-width: 1em;max-height:1em;margin-left: .2em;">"""
-        copyright_p.append(BeautifulSoup(new_copyright_html, 'html.parser'))
-
-    # Update index chevron
-    index_chevron = soup.select_one('#score-display .chevron-icon')
-    if index_chevron:
-        index_chevron['aria-hidden'] = 'true'
-
-    # Save index.html
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(soup.prettify())
-        
-    print("✅ index.html rebuilt successfully.")
 
-    # Save the consolidated stats for search
-    stats_file = project_dir / "stats_summary.json"
-    with open(stats_file, 'w', encoding='utf-8') as f:
-        json.dump(stats_summary, f, indent=4)
-    print(f"✅ {stats_file.name} updated with {len(stats_summary)} entries.")
+    if manifest_pages:
+        print(f"  🔎 Parsed {parsed_count} new or changed detail pages without records; reused {len(manifest_pages) - parsed_count} from the manifest.")
+
+    shards_changed = write_archive_shards(project_dir, shard_tiles)
+    if shard_tiles or shards_changed:
+        sharded_count = sum(len(tiles) for tiles in shard_tiles.values())
+        print(f"  🗂️  {len(gallery_tiles)} tiles in index.html, {sharded_count} in {len(shard_tiles)} archive shards ({shards_changed} files changed).")
+
+    # Save the consolidated stats for analytics, in columnar form
+    stats_text = stats_summary_json(stats_summary, len(gallery_tiles))
+    if write_if_changed(project_dir / STATS_SUMMARY_NAME, stats_text):
+        print(f"✅ {STATS_SUMMARY_NAME} updated with {len(stats_summary)} entries.")
+    else:
+        print(f"✅ {STATS_SUMMARY_NAME} unchanged ({len(stats_summary)} entries).")
+
+    # The gallery search intersects posting lists from this instead of scanning every stats entry
+    search_text = search_index_json(build_search_index(stats_summary, len(gallery_tiles)))
+    if write_if_changed(project_dir / SEARCH_INDEX_NAME, search_text):
+        print(f"✅ {SEARCH_INDEX_NAME} updated.")
+
+    # Pages request the data files with ?v=<content hash>, so they can be cached until the data changes
+    search_version = content_version(search_text)
+    stamp_page_version(project_dir / "analytics.html", STATS_VERSION_META, content_version(stats_text))
+
+    # If the tiles, data version and index.html are all as they were after the last rebuild, the output would be identical
+    tiles_digest = hashlib.sha256("\n".join(gallery_tiles + [search_version]).encode('utf-8')).hexdigest()
+    index_digest = hashlib.sha256(index_path.read_bytes()).hexdigest()
+    previous_index = manifest.get('index', {})
+    if previous_index.get('tiles') == tiles_digest and previous_index.get('output') == index_digest:
+        print("✅ index.html is already up to date.")
+    else:
+        current_html = index_path.read_text(encoding='utf-8')
+        index_html = splice_gallery(current_html, gallery_tiles)
+        if index_html is None:
+            # First rebuild of a hand-written index.html: normalize it once; later rebuilds splice
+            index_html = normalize_index_page(current_html, gallery_tiles)
+        if index_html is None:
+            print(f"❌ Could not find insertion point in index.html.")
+            return
+        index_html = stamp_version(index_html, SEARCH_INDEX_VERSION_META, search_version)
+
+        # Save index.html
+        if write_if_changed(index_path, index_html):
+            print("✅ index.html rebuilt successfully.")
+        else:
+            print("✅ index.html unchanged; not rewritten.")
+        index_digest = hashlib.sha256(index_html.encode('utf-8')).hexdigest()
+
+    # Pages without a clue image (or deleted ones) drop out of the manifest
+    new_manifest = {"version": INDEX_MANIFEST_VERSION, "pages": manifest_pages,
+                    "index": {"tiles": tiles_digest, "output": index_digest}}
+    if new_manifest != manifest:
+        write_if_changed(project_dir / INDEX_MANIFEST_NAME, json.dumps(new_manifest, indent=1, sort_keys=True))
+
+    # Covers index.html and the data files written above, so it comes after them
+    precache_puzzles = int(load_project_config(project_dir).get("site", {}).get("precache_puzzles", DEFAULT_PRECACHE_PUZZLES))
+    write_service_worker(project_dir, precache_puzzles)
+
+    # Every generation flow ends with a rebuild, so this is where compressed siblings are refreshed
+    precompress_site(project_dir)
+
+
+def rerender_detail_page(project_dir: Path, date_str: str, images: Dict[str, dict] = None) -> bool:
+    """
+    Rebuilds one detail page from its puzzle record, writing it only if the output changed. Returns True if written.
+    images holds the page's image manifest entries; they are looked up (and recorded if missing) when not given.
+    """
+    record = load_puzzle_record(project_dir, date_str)
+    if record is None:
+        raise FileNotFoundError(f"No puzzle record for {date_str}")
+    formatted_date = datetime.strptime(date_str, "%Y-%m-%d").strftime("%B %d, %Y")
+    search_data = {'teams': record.get('teams', []), 'years': record.get('years', [])}
+    if images is None:
+        images = image_entries(project_dir / "images", puzzle_image_names(date_str))
+    html_content = build_detail_page_html(record, date_str, formatted_date, search_data=search_data, images=images)
+    return write_if_changed(project_dir / f"{date_str}.html", html_content)
+
+def _rerender_worker(task):
+    project_dir, date_str, images = task
+    try:
+        return date_str, rerender_detail_page(project_dir, date_str, images), None
+    except Exception as e:
+        return date_str, False, str(e)
+
+def rerender_all_pages(project_dir: Path, workers: int = None) -> dict:
+    """
+    Re-renders every detail page from data/puzzles/ with the current template on a process pool, without
+    any network calls. Dates listed in workflow.excluded_dates (hand-built tribute pages) are left alone.
+    Returns counts of pages rendered, written, excluded and failed.
+    """
+    print("\n🖨️  Re-rendering detail pages from stored puzzle records...")
+    started = time.perf_counter()
+    excluded = set(load_project_config(project_dir).get("workflow", {}).get("excluded_dates", []))
+    all_dates = record_dates(project_dir)
+    dates = [date_str for date_str in all_dates if date_str not in excluded]
+    workers = workers or os.cpu_count() or 1
+    counts = {'rendered': 0, 'written': 0, 'excluded': len(all_dates) - len(dates), 'failed': 0}
+
+    # Measured once here, so the workers never write the shared manifest
+    image_manifest = refresh_image_manifest(project_dir / "images")
+    tasks = [(project_dir, date_str, {name: image_manifest[name] for name in puzzle_image_names(date_str) if name in image_manifest})
+             for date_str in dates]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for date_str, written, error in pool.map(_rerender_worker, tasks, chunksize=chunksize):
+            if error:
+                counts['failed'] += 1
+                print(f"  ❌ {date_str}: {error}")
+                continue
+            counts['rendered'] += 1
+            counts['written'] += written
 
+    elapsed = time.perf_counter() - started
+    print(f"✅ Re-rendered {counts['rendered']} pages in {elapsed:.2f}s: {counts['written']} changed, "
+          f"{counts['rendered'] - counts['written']} already current, {counts['excluded']} excluded, {counts['failed']} failed.")
+    return counts
 
 def add_nickname_to_page(project_dir: Path, date_str: str, nickname: str) -> bool:
-    """Adds a nickname to an existing puzzle page's quiz-data JSON.
+    """Adds a nickname to an existing puzzle's canonical record and its page's quiz-data JSON.
 
     Returns True if the nickname was added, False if the page doesn't exist
     or the nickname is already present.
@@ -499,12 +777,16 @@ def add_nickname_to_page(project_dir: Path, date_str: str, nickname: str) -> boo
         return False
 
     quiz_data = json.loads(quiz_data_div.string)
-
-    # Normalize old format to new format
-    nicknames = quiz_data.get('nicknames', [])
-    if not nicknames:
-        old = quiz_data.get('nickname', '')
-        nicknames = [old] if old else []
+    record = load_puzzle_record(project_dir, date_str)
+
+    # The record is authoritative; pages without one fall back to their quiz-data (old or new format)
+    if record is not None:
+        nicknames = list(record.get('nicknames', []))
+    else:
+        nicknames = quiz_data.get('nicknames', [])
+        if not nicknames:
+            old = quiz_data.get('nickname', '')
+            nicknames = [old] if old else []
     quiz_data.pop('nickname', None)
 
     # Check for duplicates (case-insensitive)
@@ -514,6 +796,9 @@ def add_nickname_to_page(project_dir: Path, date_str: str, nickname: str) -> boo
 
     nicknames.append(nickname)
     quiz_data['nicknames'] = nicknames
+    if record is not None:
+        record['nicknames'] = nicknames
+        save_puzzle_record(project_dir, record)
 
     # Replace only the quiz-data div content
     quiz_data_div.string = json.dumps(quiz_data, indent=4)
@@ -0,0 +1,151 @@
+# ABOUTME: Keeps images/image_manifest.json, the sidecar that records each image's size and a tiny blurred placeholder.
+# ABOUTME: The page generators read it so <img> tags reserve their space and show the placeholder while loading.
+import argparse
+import base64
+import hashlib
+import io
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from PIL import Image, ImageFilter
+
+PROJECT_DIR = Path(__file__).parent.parent
+IMAGE_MANIFEST_NAME = "image_manifest.json"
+# The puzzle images the pages show; favicons and the social card never appear in an <img>
+PUZZLE_IMAGE_PATTERNS = ("clue-*.webp", "answer-*.webp")
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 30
+
+
+def file_revision(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:12]
+
+
+def placeholder_data_uri(img: Image.Image) -> str:
+    """A blurred thumbnail at most PLACEHOLDER_SIZE pixels on a side, as a WebP data URI of a few hundred bytes."""
+    thumb = img.convert('RGB')
+    thumb.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    thumb = thumb.filter(ImageFilter.GaussianBlur(radius=1))
+    buffer = io.BytesIO()
+    thumb.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def image_entry(img: Image.Image, path: Path) -> dict:
+    """The manifest entry for the file at path, which holds img as written."""
+    return {
+        'width': img.width,
+        'height': img.height,
+        'placeholder': placeholder_data_uri(img),
+        'revision': file_revision(path),
+    }
+
+
+def load_image_manifest(images_dir: Path) -> Dict[str, dict]:
+    manifest_path = Path(images_dir) / IMAGE_MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_image_manifest(images_dir: Path, manifest: Dict[str, dict]) -> bool:
+    """Writes the manifest atomically if it changed. Returns True if written."""
+    manifest_path = Path(images_dir) / IMAGE_MANIFEST_NAME
+    if not manifest and not manifest_path.exists():
+        return False
+    content = json.dumps(manifest, indent=1, sort_keys=True)
+    if manifest_path.exists() and manifest_path.read_text(encoding='utf-8') == content:
+        return False
+    temp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    temp_path.write_text(content, encoding='utf-8')
+    temp_path.replace(manifest_path)
+    return True
+
+
+def record_image(path: Path, img: Image.Image, variants: dict = None) -> dict:
+    """
+    Records the image just written to path in its directory's manifest, reusing the decode that wrote it.
+    variants describes the responsive copies written alongside it, if any (see image_variants.py).
+    """
+    path = Path(path)
+    entry = image_entry(img, path)
+    if variants:
+        entry['variants'] = variants
+    record_entries(path.parent, {path.name: entry})
+    return entry
+
+
+def record_entries(images_dir: Path, entries: Dict[str, dict]) -> None:
+    """Merges entries made elsewhere (e.g. by worker processes) into the manifest with a single write."""
+    manifest = load_image_manifest(images_dir)
+    manifest.update(entries)
+    save_image_manifest(images_dir, manifest)
+
+
+def _current_entry(path: Path, manifest: Dict[str, dict]) -> Optional[dict]:
+    """The manifest entry for path, rebuilt from the file if it is missing or the file has changed since."""
+    entry = manifest.get(path.name)
+    if entry is not None and entry.get('revision') == file_revision(path):
+        return entry
+    try:
+        with Image.open(path) as img:
+            img.load()
+            return image_entry(img, path)
+    except (OSError, ValueError):
+        # Not a readable image; pages fall back to plain <img> tags for it
+        return None
+
+
+def image_entries(images_dir: Path, names: Iterable[str]) -> Dict[str, dict]:
+    """Entries for the named files that exist, adding any that are missing or stale to the manifest."""
+    images_dir = Path(images_dir)
+    manifest = load_image_manifest(images_dir)
+    entries = {}
+    for name in names:
+        path = images_dir / name
+        if not path.is_file():
+            continue
+        entry = _current_entry(path, manifest)
+        if entry is not None:
+            entries[name] = manifest[name] = entry
+    if entries:
+        save_image_manifest(images_dir, manifest)
+    return entries
+
+
+def refresh_image_manifest(images_dir: Path, patterns: Iterable[str] = PUZZLE_IMAGE_PATTERNS) -> Dict[str, dict]:
+    """
+    Brings the manifest up to date with every puzzle image: new or changed files are measured,
+    unchanged ones are kept and entries for deleted files are dropped. Returns the manifest.
+    """
+    images_dir = Path(images_dir)
+    manifest = load_image_manifest(images_dir)
+    refreshed = {}
+    measured = unreadable = 0
+    for pattern in patterns:
+        for path in sorted(images_dir.glob(pattern)):
+            entry = _current_entry(path, manifest)
+            if entry is None:
+                unreadable += 1
+                continue
+            measured += entry is not manifest.get(path.name)
+            refreshed[path.name] = entry
+
+    if save_image_manifest(images_dir, refreshed):
+        print(f"🖼️  Image manifest: {len(refreshed)} images, {measured} measured"
+              + (f", {unreadable} unreadable." if unreadable else "."))
+    return refreshed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record the size and placeholder of every clue and answer image in images/.")
+    parser.add_argument("--images-dir", type=Path, default=PROJECT_DIR / "images", help="Directory holding the images.")
+    args = parser.parse_args()
+    manifest = refresh_image_manifest(args.images_dir)
+    print(f"✅ {len(manifest)} images recorded in {args.images_dir / IMAGE_MANIFEST_NAME}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# ABOUTME: Picks the lowest WebP quality that keeps each clue or answer image above a per-class SSIM threshold.
+# ABOUTME: Audits images/ for the bytes that would save, rewrites files only with --write, and serves new images.
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from image_manifest import image_entry, load_image_manifest, record_entries
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+# Clue cards are flat graphics and small text, which blur visibly long before photos do
+QUALITY_POLICY = {
+    'clue': {'min_ssim': 0.99, 'min_quality': 40, 'max_quality': 90},
+    'answer': {'min_ssim': 0.98, 'min_quality': 40, 'max_quality': 90},
+}
+QUALITY_STEP = 5
+# Re-encoding an archived image loses a little more detail, so it must pay for itself
+MIN_SAVINGS = 0.05
+SSIM_WINDOW = 7
+
+
+def image_class(name: str) -> Optional[str]:
+    """'clue' or 'answer' for puzzle images, None for anything else."""
+    prefix = name.split("-", 1)[0]
+    return prefix if prefix in QUALITY_POLICY else None
+
+
+def policy_key(image_class_name: str) -> str:
+    """Identifies a class's policy, so images audited under an older one are audited again."""
+    policy = QUALITY_POLICY[image_class_name]
+    return f"{image_class_name}-ssim{policy['min_ssim']}-q{policy['min_quality']}-{policy['max_quality']}"
+
+
+def _window_means(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of every window x window block, from a summed-area table."""
+    table = np.pad(values.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+    return (table[window:, window:] - table[:-window, window:] - table[window:, :-window] + table[:-window, :-window]) / (window * window)
+
+
+def ssim(reference: np.ndarray, candidate: np.ndarray, window: int = SSIM_WINDOW) -> float:
+    """Mean structural similarity of two same-sized 8-bit grayscale images over uniform windows."""
+    x = reference.astype(np.float64)
+    y = candidate.astype(np.float64)
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    mean_x, mean_y = _window_means(x, window), _window_means(y, window)
+    var_x = _window_means(x * x, window) - mean_x * mean_x
+    var_y = _window_means(y * y, window) - mean_y * mean_y
+    covariance = _window_means(x * y, window) - mean_x * mean_y
+    scores = ((2 * mean_x * mean_y + c1) * (2 * covariance + c2)) / ((mean_x ** 2 + mean_y ** 2 + c1) * (var_x + var_y + c2))
+    return float(scores.mean())
+
+
+def encode_webp(img: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, 'WEBP', quality=quality, method=6)
+    return buffer.getvalue()
+
+
+def choose_quality(img: Image.Image, image_class_name: str) -> Tuple[int, bytes, float]:
+    """
+    Binary-searches the class's quality range (in QUALITY_STEP steps) for the lowest quality whose decode
+    stays at or above the class's SSIM threshold against img. Returns (quality, encoded bytes, SSIM).
+    Falls back to the top of the range when no quality reaches the threshold.
+    """
+    policy = QUALITY_POLICY[image_class_name]
+    img = img.convert('RGB')
+    reference = np.asarray(img.convert('L'))
+    qualities = list(range(policy['min_quality'], policy['max_quality'] + 1, QUALITY_STEP))
+    best = None
+    low, high = 0, len(qualities) - 1
+    while low <= high:
+        middle = (low + high) // 2
+        data = encode_webp(img, qualities[middle])
+        with Image.open(io.BytesIO(data)) as decoded:
+            score = ssim(reference, np.asarray(decoded.convert('L')))
+        if score >= policy['min_ssim']:
+            best = (qualities[middle], data, score)
+            high = middle - 1
+        else:
+            low = middle + 1
+    if best is None:
+        data = encode_webp(img, qualities[-1])
+        with Image.open(io.BytesIO(data)) as decoded:
+            best = (qualities[-1], data, ssim(reference, np.asarray(decoded.convert('L'))))
+    return best
+
+
+def quality_record(image_class_name: str, quality: int) -> dict:
+    """The image manifest's 'quality_audit' value for an image encoded under the class policy."""
+    return {'policy': policy_key(image_class_name), 'quality': quality}
+
+
+def _audit_worker(task):
+    path, write = task
+    try:
+        name_class = image_class(path.name)
+        current_bytes = path.stat().st_size
+        with Image.open(path) as img:
+            img.load()
+            quality, data, score = choose_quality(img, name_class)
+        result = {'name': path.name, 'class': name_class, 'bytes': current_bytes, 'projected_bytes': current_bytes,
+                  'quality': quality, 'ssim': score, 'rewritten': False, 'entry': None}
+        if len(data) <= current_bytes * (1 - MIN_SAVINGS):
+            result['projected_bytes'] = len(data)
+            if write:
+                temp_path = path.with_name(path.name + ".tmp")
+                temp_path.write_bytes(data)
+                temp_path.replace(path)
+                with Image.open(path) as rewritten:
+                    rewritten.load()
+                    result['entry'] = image_entry(rewritten, path)
+                result['rewritten'] = True
+        return result, None
+    except Exception as e:
+        return {'name': path.name}, str(e)
+
+
+def audit_archive(images_dir: Path, write: bool = False, workers: int = None) -> Dict[str, dict]:
+    """
+    Finds each clue and answer image's policy quality on a process pool and totals the projected savings by class.
+    With write=True, images that would shrink by at least MIN_SAVINGS are rewritten, and every audited image is
+    marked in the image manifest so later audits skip it until the policy or the file changes.
+    """
+    images_dir = Path(images_dir)
+    manifest = load_image_manifest(images_dir)
+    paths = []
+    already_done = 0
+    for path in sorted(images_dir.glob("*.webp")):
+        name_class = image_class(path.name)
+        if name_class is None:
+            continue
+        entry = manifest.get(path.name, {})
+        if entry.get('quality_audit', {}).get('policy') == policy_key(name_class):
+            already_done += 1
+            continue
+        paths.append(path)
+
+    report = {name_class: {'files': 0, 'bytes': 0, 'projected_bytes': 0, 'rewritten': 0} for name_class in QUALITY_POLICY}
+    started = time.perf_counter()
+    entries = {}
+    failed = 0
+    if paths:
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result, error in pool.map(_audit_worker, [(path, write) for path in paths], chunksize=chunksize):
+                if error:
+                    failed += 1
+                    print(f"  ❌ {result['name']}: {error}")
+                    continue
+                totals = report[result['class']]
+                totals['files'] += 1
+                totals['bytes'] += result['bytes']
+                totals['projected_bytes'] += result['projected_bytes']
+                totals['rewritten'] += result['rewritten']
+                if write:
+                    # Rewritten images get a new entry; their variants were made from the old file and go stale
+                    entry = result['entry'] or dict(manifest.get(result['name']) or {})
+                    if entry:
+                        entry['quality_audit'] = quality_record(result['class'], result['quality'])
+                        entries[result['name']] = entry
+    if entries:
+        record_entries(images_dir, entries)
+
+    elapsed = time.perf_counter() - started
+    print(f"🔬 Audited {len(paths) - failed} images in {elapsed:.2f}s ({already_done} already audited, {failed} failed).")
+    for name_class, totals in report.items():
+        if not totals['files']:
+            continue
+        saved = totals['bytes'] - totals['projected_bytes']
+        percent = 100 * saved / totals['bytes'] if totals['bytes'] else 0
+        action = f"{totals['rewritten']} rewritten" if write else "dry run"
+        print(f"  {name_class}: {totals['files']} files, {totals['bytes'] / 1024:.0f} KB -> "
+              f"{totals['projected_bytes'] / 1024:.0f} KB ({saved / 1024:.0f} KB, {percent:.1f}% saved; {action}).")
+    if write and any(totals['rewritten'] for totals in report.values()):
+        print("💡 Rewritten images need new variants and pages: run image_variants.py, then main.py --rerender-all.")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report (or apply with --write) the bytes per-class quality targeting would save in images/.")
+    parser.add_argument("--images-dir", type=Path, default=PROJECT_DIR / "images", help="Directory holding the images.")
+    parser.add_argument("--write", action="store_true", help="Rewrite images that would shrink enough.")
+    parser.add_argument("--workers", type=int, default=None, help="Encoder processes (default: one per CPU).")
+    args = parser.parse_args()
+    audit_archive(args.images_dir, write=args.write, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
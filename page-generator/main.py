@@ -18,6 +18,9 @@ import config_manager
 import ai_services
 import scraper
 import html_generator
+import player_index
+import precompress
+import stats_summary
 import user_interaction
 import fact_verifier
 import grounded_ai
@@ -369,11 +372,10 @@ def handle_find_image(config: dict):
         staging_dir = project_dir / "temp_player_images"
         staging_dir.mkdir(exist_ok=True)
         
-        temp_file = searcher._download_full_size_image(candidate)
-        if temp_file:
-            target_path = staging_dir / f"answer-{date_str}-direct.webp"
-            searcher.image_processor.convert_to_webp(temp_file, target_path)
-            temp_file.unlink(missing_ok=True)
+        data = searcher._download_image_bytes(candidate)
+        decoded = searcher.image_processor.decode_image_bytes(data, min_width=1, min_height=1) if data else None
+        target_path = staging_dir / f"answer-{date_str}-direct.webp"
+        if decoded and searcher.image_processor.save_webp(decoded[0], target_path, record=False):
             print(f"\n✅ Successfully saved direct image to: {target_path}")
         else:
             print(f"❌ Failed to download image from: {direct_url}")
@@ -405,8 +407,7 @@ def handle_regeneration_mode(config, project_dir, mode_input):
         print("❌ Error: stats_summary.json not found. Run a normal generation first.")
         return
         
-    with open(stats_path, 'r') as f:
-        all_stats = json.load(f)
+    all_stats = stats_summary.load_stats_summary(stats_path)
     
     # Filter dates based on input
     dates_to_process = []
@@ -602,7 +603,8 @@ Options:
 
   --refresh-player-list
                         Scrape all player names from Baseball-Reference.com
-                        to update the autocomplete list, then exit.
+                        to update the autocomplete list and its per-prefix
+                        shards in data/players/, then exit.
 
   --generate-player-list
                         Legacy alias for --refresh-player-list.
@@ -642,7 +644,13 @@ Options:
                        the new grounded pipeline. Requires selecting dates.
 
   --rebuild-index      Rebuild and re-sort index.html and update 
-                       stats_summary.json from all available clue images.
+                       stats_summary.json and search_index.json from all
+                       available clue images.
+
+  --rerender-all       Rebuild every detail page from its stored record in
+                       data/puzzles/ with the current template. Makes no
+                       network calls; only pages whose HTML changed are
+                       rewritten. Skips workflow.excluded_dates.
 
   --add-nickname       [date] [nickname]
                        Add an alternate accepted answer (nickname/easter egg)
@@ -693,6 +701,7 @@ Notes:
     config_mode = "--config" in sys.argv
     regenerate_mode = "--regenerate-facts" in sys.argv
     rebuild_index_mode = "--rebuild-index" in sys.argv
+    rerender_all_mode = "--rerender-all" in sys.argv
     add_nickname_mode = "--add-nickname" in sys.argv
     # Handle automation configuration
     if config_mode and AUTOMATION_AVAILABLE:
@@ -710,6 +719,13 @@ Notes:
         html_generator.rebuild_index_page(project_dir)
         exit()
 
+    # Handle offline re-rendering of every detail page
+    if rerender_all_mode:
+        project_dir = get_project_directory(config)
+        html_generator.rerender_all_pages(project_dir)
+        html_generator.rebuild_index_page(project_dir)
+        exit()
+
     # Handle adding a nickname to an existing puzzle
     if add_nickname_mode:
         project_dir = get_project_directory(config)
@@ -746,6 +762,8 @@ Notes:
         project_dir = get_project_directory(config)
 
         scraper.generate_master_player_list(project_dir)
+        player_index.write_player_index(project_dir, player_index.load_master_player_list(project_dir))
+        precompress.precompress_site(project_dir)
         exit() # Exit after generating the list
 
     # 1. Get project directory
@@ -774,6 +792,8 @@ Notes:
 
     if mode.upper() == 'REFRESH':
         scraper.generate_master_player_list(project_dir)
+        player_index.write_player_index(project_dir, player_index.load_master_player_list(project_dir))
+        precompress.precompress_site(project_dir)
         exit()
     elif mode.upper() == 'ALL':
         clue_files_to_process = sorted(images_dir.glob("clue-*.webp"), reverse=True)
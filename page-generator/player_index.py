@@ -0,0 +1,80 @@
+# ABOUTME: Splits the master player list into small autocomplete shards keyed by the first two letters of each name.
+# ABOUTME: Names are normalized and sorted once here so the quiz can binary-search the one shard a guess needs.
+import argparse
+import json
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_DIR = Path(__file__).parent.parent
+MASTER_LIST_NAME = "all_players.js"
+PLAYER_INDEX_DIR = Path("data") / "players"
+
+
+def normalize_name(name: str) -> str:
+    """Same result as quizEngine.normalizeText: accents stripped, lowercased and trimmed."""
+    decomposed = unicodedata.normalize("NFD", name)
+    return re.sub("[\u0300-\u036f]", "", decomposed).lower().strip()
+
+
+def shard_key(normalized: str) -> str:
+    """The shard a normalized name belongs to; characters that are unsafe in file names become "_"."""
+    return re.sub(r"[^a-z0-9]", "_", normalized[:2])
+
+
+def build_player_index(names: List[str]) -> Dict[str, dict]:
+    """
+    Groups names into shards of parallel, key-sorted "names" and "keys" (normalized names) lists.
+    Players who share a name appear once, since a guess can only name them once.
+    """
+    entries = sorted({(normalize_name(name), name) for name in names if name.strip()})
+    shards = {}
+    for key, name in entries:
+        shard = shards.setdefault(shard_key(key), {'names': [], 'keys': []})
+        shard['names'].append(name)
+        shard['keys'].append(key)
+    return shards
+
+
+def load_master_player_list(project_dir: Path) -> List[str]:
+    """Reads the names from all_players.js, which assigns one JSON array to ALL_PLAYERS."""
+    text = (Path(project_dir) / MASTER_LIST_NAME).read_text(encoding='utf-8')
+    return json.loads(text[text.index('['):text.rindex(']') + 1])
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return False
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text(content, encoding='utf-8')
+    temp_path.replace(path)
+    return True
+
+
+def write_player_index(project_dir: Path, names: List[str]) -> int:
+    """Writes data/players/{shard}.json and removes shards no name maps to. Returns the number of files changed."""
+    index_dir = Path(project_dir) / PLAYER_INDEX_DIR
+    index_dir.mkdir(parents=True, exist_ok=True)
+    shards = build_player_index(names)
+    changed = 0
+    for key, shard in shards.items():
+        changed += _write_if_changed(index_dir / f"{key}.json", json.dumps(shard, separators=(',', ':'), ensure_ascii=False))
+    for stale in index_dir.glob("*.json"):
+        if stale.stem not in shards:
+            stale.unlink()
+            changed += 1
+
+    total = sum(len(shard['names']) for shard in shards.values())
+    print(f"🔤 Autocomplete index: {total} names in {len(shards)} shards ({changed} files changed).")
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the autocomplete shards in data/players from all_players.js.")
+    parser.parse_args()
+    write_player_index(PROJECT_DIR, load_master_player_list(PROJECT_DIR))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# ABOUTME: Writes precompressed .gz and .br siblings for the generated HTML, JSON and JS the site serves.
+# ABOUTME: Skips files whose siblings are already current, so re-running after a small change is cheap.
+import argparse
+import gzip
+import os
+from pathlib import Path
+from typing import List
+
+try:
+    import brotli  # type: ignore
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+# Everything the browser downloads that the generator writes or the pages load directly
+SITE_PATTERNS = (
+    "*.html",
+    "archive/*.html",
+    # Root scripts the pages load; a "*.js" glob would also pick up dev tooling like vitest.config.js
+    "firebase-config.js",
+    "all_players.js",
+    "sw.js",
+    "js/*.js",
+    "stats_summary.json",
+    "search_index.json",
+    "precache-manifest.json",
+    "data/quiz/*.json",
+    "data/players/*.json",
+)
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+# Tiny files do not get smaller enough to be worth a second request path
+MIN_SIZE = 256
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+def active_encodings() -> List[str]:
+    return [encoding for encoding in ENCODING_SUFFIXES if encoding != "br" or BROTLI_AVAILABLE]
+
+
+def sibling_path(path: Path, encoding: str) -> Path:
+    return path.with_name(path.name + ENCODING_SUFFIXES[encoding])
+
+
+def is_current(path: Path, sibling: Path) -> bool:
+    """A sibling is current when it carries its source's exact mtime, which precompress_file stamps on it."""
+    try:
+        return sibling.stat().st_mtime_ns == path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def precompress_file(path: Path, force: bool = False) -> bool:
+    """Writes the missing or stale compressed siblings of one file. Returns True if any were written."""
+    stat = path.stat()
+    stale = [encoding for encoding in active_encodings() if force or not is_current(path, sibling_path(path, encoding))]
+    if not stale or stat.st_size < MIN_SIZE:
+        return False
+
+    data = path.read_bytes()
+    for encoding in stale:
+        sibling = sibling_path(path, encoding)
+        temp_path = sibling.with_name(sibling.name + ".tmp")
+        temp_path.write_bytes(_compress(data, encoding))
+        os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        temp_path.replace(sibling)
+    return True
+
+
+def site_files(project_dir: Path) -> List[Path]:
+    files = set()
+    for pattern in SITE_PATTERNS:
+        files.update(path for path in Path(project_dir).glob(pattern) if path.is_file())
+    return sorted(files)
+
+
+def remove_orphans(project_dir: Path) -> int:
+    """Deletes compressed siblings whose source file no longer exists. Returns the number removed."""
+    removed = 0
+    for pattern in SITE_PATTERNS:
+        for suffix in ENCODING_SUFFIXES.values():
+            for sibling in Path(project_dir).glob(pattern + suffix):
+                if not sibling.with_suffix("").exists():
+                    sibling.unlink()
+                    removed += 1
+    return removed
+
+
+def precompress_site(project_dir: Path, force: bool = False) -> int:
+    """Brings every site file's compressed siblings up to date. Returns the number of files compressed."""
+    compressed = sum(precompress_file(path, force=force) for path in site_files(project_dir))
+    removed = remove_orphans(project_dir)
+    if compressed or removed:
+        encodings = "/".join(active_encodings())
+        print(f"🗜️  Precompressed {compressed} files ({encodings}); removed {removed} orphaned siblings.")
+    return compressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write .gz/.br siblings for the site's generated files.")
+    parser.add_argument("--force", action="store_true", help="Recompress every file even if its siblings are current.")
+    args = parser.parse_args()
+
+    if not BROTLI_AVAILABLE:
+        print("⚠️  Warning: 'brotli' is not installed; writing gzip siblings only.")
+    count = precompress_site(PROJECT_DIR, force=args.force)
+    print(f"✅ {count} files compressed.")
+
+
+if __name__ == "__main__":
+    main()
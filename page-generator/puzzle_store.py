@@ -0,0 +1,346 @@
+# ABOUTME: Canonical per-puzzle JSON records stored at data/puzzles/{date}.json next to the detail pages.
+# ABOUTME: Index rebuilds, audits, batch prep and SEO passes read these instead of scraping generated HTML.
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+from bs4 import BeautifulSoup  # type: ignore
+
+PROJECT_DIR = Path(__file__).parent.parent
+PUZZLES_DIR = Path("data") / "puzzles"
+# Small per-puzzle payloads quiz.js fetches instead of the whole detail page, kept in sync with the records
+QUIZ_DIR = Path("data") / "quiz"
+QUIZ_BUNDLE_NAME = "all.json"
+
+
+def puzzle_path(project_dir: Path, date_str: str) -> Path:
+    return Path(project_dir) / PUZZLES_DIR / f"{date_str}.json"
+
+
+def quiz_path(project_dir: Path, date_str: str) -> Path:
+    return Path(project_dir) / QUIZ_DIR / f"{date_str}.json"
+
+
+def normalize_nicknames(player_data: dict) -> list:
+    """Returns the nickname list, accepting the older single 'nickname' field."""
+    nicknames = player_data.get('nicknames', [])
+    if not nicknames:
+        single = player_data.get('nickname', '')
+        # A few hand-written pages store a list under the singular key
+        nicknames = single if isinstance(single, list) else ([single] if single else [])
+    return list(nicknames)
+
+
+def search_data_for(yearly_war: list) -> dict:
+    """Teams and years a player appeared in, as embedded in the detail page's #search-data."""
+    all_teams = set()
+    for item in yearly_war:
+        for team in item['teams']:
+            all_teams.add(team)
+    all_years = {item['year'] for item in yearly_war}
+    return {'teams': list(all_teams), 'years': sorted(list(all_years))}
+
+
+def rendered_followup_qa(followup_qa: list) -> list:
+    """The follow-up Q&A pairs a detail page actually shows: the first 3, skipping blank ones."""
+    rendered = []
+    for qa in followup_qa[:3]:
+        question = str(qa.get('question', '')).strip()
+        answer = str(qa.get('answer', '')).strip()
+        if question and answer:
+            rendered.append({'question': question, 'answer': answer})
+    return rendered
+
+
+def build_puzzle_record(player_data: dict, date_str: str, search_data: Optional[dict] = None) -> dict:
+    """Builds the canonical record for a puzzle from the same player data its detail page is rendered from."""
+    yearly_war = player_data.get('yearly_war', [])
+    if search_data is None:
+        search_data = search_data_for(yearly_war) if yearly_war else {'teams': [], 'years': []}
+    return {
+        'date': date_str,
+        'name': player_data.get('name', 'N/A'),
+        'nicknames': normalize_nicknames(player_data),
+        'facts': list(player_data.get('facts', [])),
+        'followup_qa': rendered_followup_qa(player_data.get('followup_qa', [])),
+        'career_totals': player_data.get('career_totals', {}),
+        'yearly_war': yearly_war,
+        'teams': search_data['teams'],
+        'years': search_data['years'],
+    }
+
+
+def _write_atomic(path: Path, content: str) -> bool:
+    """Atomically writes content unless the file already holds exactly that text. Returns True if written."""
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(content, encoding='utf-8')
+    temp_path.replace(path)
+    return True
+
+
+def save_puzzle_record(project_dir: Path, record: dict) -> bool:
+    """Atomically writes a record and its quiz payload, skipping files that are unchanged. Returns True if the record was written."""
+    written = _write_atomic(puzzle_path(project_dir, record['date']), json.dumps(record, indent=2, ensure_ascii=False) + "\n")
+    save_quiz_data(project_dir, record)
+    return written
+
+
+def load_puzzle_record(project_dir: Path, date_str: str) -> Optional[dict]:
+    path = puzzle_path(project_dir, date_str)
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError:
+        print(f"⚠️  Warning: Ignoring unreadable puzzle record {path}")
+        return None
+
+
+def update_puzzle_record(project_dir: Path, date_str: str, **fields) -> Optional[dict]:
+    """Merges fields into an existing record and saves it. Returns None if the puzzle has no record yet."""
+    record = load_puzzle_record(project_dir, date_str)
+    if record is None:
+        return None
+    record.update(fields)
+    save_puzzle_record(project_dir, record)
+    return record
+
+
+def page_metadata(record: dict) -> dict:
+    """The name/nickname/teams/years the index shows; teams and years are None when the page has no search data."""
+    has_search_data = bool(record.get('yearly_war') or record.get('teams') or record.get('years'))
+    nicknames = record.get('nicknames', [])
+    return {
+        'name': record['name'],
+        'nickname': nicknames[0] if nicknames else "",
+        'teams': record.get('teams', []) if has_search_data else None,
+        'years': record.get('years', []) if has_search_data else None,
+    }
+
+
+def audited_facts(record: dict) -> list:
+    """Every statement the fact auditor checks: the facts plus each follow-up answer."""
+    return record.get('facts', []) + [qa['answer'] for qa in record.get('followup_qa', [])]
+
+
+def quiz_payload(record: dict) -> dict:
+    """What the quiz page needs for a puzzle: the answer, accepted nicknames and the hints in reveal order."""
+    return {'answer': record['name'], 'nicknames': record.get('nicknames', []), 'hints': record.get('facts', [])}
+
+
+def _compact_json(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+def save_quiz_data(project_dir: Path, record: dict) -> bool:
+    """Writes data/quiz/{date}.json for a record unless it is already current. Returns True if written."""
+    return _write_atomic(quiz_path(project_dir, record['date']), _compact_json(quiz_payload(record)))
+
+
+def validate_quiz_payload(payload) -> list:
+    """Returns the reasons a quiz payload would break quiz.js; an empty list means it is usable."""
+    if not isinstance(payload, dict):
+        return ["payload is not an object"]
+    problems = []
+    if not isinstance(payload.get('answer'), str) or not payload['answer'].strip():
+        problems.append("answer is missing")
+    hints = payload.get('hints')
+    if not isinstance(hints, list) or not hints:
+        problems.append("hints are missing")
+    elif not all(isinstance(hint, str) and hint.strip() for hint in hints):
+        problems.append("hints contain a blank or non-text entry")
+    if not isinstance(payload.get('nicknames'), list):
+        problems.append("nicknames is not a list")
+    return problems
+
+
+def record_dates(project_dir: Path) -> list:
+    return sorted(path.stem for path in (Path(project_dir) / PUZZLES_DIR).glob("????-??-??.json"))
+
+
+def sync_quiz_data(project_dir: Path) -> int:
+    """Writes the quiz payload of every record and removes payloads whose record is gone. Returns the files changed."""
+    changed = 0
+    dates = set()
+    for date_str in record_dates(project_dir):
+        record = load_puzzle_record(project_dir, date_str)
+        if record is None:
+            continue
+        dates.add(date_str)
+        changed += save_quiz_data(project_dir, record)
+    for orphan in (Path(project_dir) / QUIZ_DIR).glob("????-??-??.json"):
+        if orphan.stem not in dates:
+            orphan.unlink()
+            changed += 1
+    return changed
+
+
+def build_quiz_bundle(project_dir: Path) -> dict:
+    """Every quiz payload keyed by date, newest first."""
+    bundle = {}
+    for date_str in reversed(record_dates(project_dir)):
+        record = load_puzzle_record(project_dir, date_str)
+        if record is not None:
+            bundle[date_str] = quiz_payload(record)
+    return bundle
+
+
+def write_quiz_bundle(project_dir: Path) -> bool:
+    return _write_atomic(Path(project_dir) / QUIZ_DIR / QUIZ_BUNDLE_NAME, _compact_json(build_quiz_bundle(project_dir)))
+
+
+def check_quiz_data(project_dir: Path) -> list:
+    """Lists every quiz payload that is missing, unreadable, invalid or out of step with its record (and a stale bundle)."""
+    problems = []
+    dates = set()
+    for date_str in record_dates(project_dir):
+        record = load_puzzle_record(project_dir, date_str)
+        if record is None:
+            continue
+        dates.add(date_str)
+        path = quiz_path(project_dir, date_str)
+        try:
+            payload = json.loads(path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            problems.append(f"{date_str}: quiz data is missing")
+            continue
+        except json.JSONDecodeError:
+            problems.append(f"{date_str}: quiz data is not valid JSON")
+            continue
+        problems.extend(f"{date_str}: {problem}" for problem in validate_quiz_payload(payload))
+        if payload != quiz_payload(record):
+            problems.append(f"{date_str}: quiz data does not match the puzzle record")
+    for orphan in sorted((Path(project_dir) / QUIZ_DIR).glob("????-??-??.json")):
+        if orphan.stem not in dates:
+            problems.append(f"{orphan.stem}: quiz data has no puzzle record")
+    bundle_path = Path(project_dir) / QUIZ_DIR / QUIZ_BUNDLE_NAME
+    if bundle_path.exists() and bundle_path.read_text(encoding='utf-8') != _compact_json(build_quiz_bundle(project_dir)):
+        problems.append(f"{QUIZ_BUNDLE_NAME}: quiz bundle is out of date")
+    return problems
+
+
+def _json_array(script_text: str, name: str) -> list:
+    match = re.search(rf"const {name} = (\[.*?\]);", script_text, re.DOTALL)
+    return json.loads(match.group(1)) if match else []
+
+
+def record_from_html(html_text: str, date_str: str) -> dict:
+    """
+    Reconstructs a puzzle record from an already generated detail page, for backfilling.
+    Per-year team lists cannot be recovered from the chart, so each year keeps only its display team.
+    """
+    soup = BeautifulSoup(html_text, 'html.parser')
+
+    quiz_data = {}
+    quiz_data_div = soup.find(id='quiz-data')
+    if quiz_data_div and quiz_data_div.get_text(strip=True):
+        try:
+            quiz_data = json.loads(quiz_data_div.get_text())
+        except json.JSONDecodeError:
+            quiz_data = {}
+
+    name = quiz_data.get('answer')
+    h2_el = soup.find('h2')
+    if not name and h2_el:
+        full_title = h2_el.get_text(strip=True)
+        name = full_title.split('"')[0].strip() if '"' in full_title else full_title
+    nicknames = normalize_nicknames(quiz_data)
+    if not nicknames and h2_el and '"' in h2_el.get_text(strip=True):
+        nicknames = [h2_el.get_text(strip=True).split('"')[1].strip()]
+
+    # The visible list wins over quiz-data hints, which older batch patches did not always keep in sync
+    facts = [li.get_text(strip=True) for li in soup.select('.player-info ul li')] or quiz_data.get('hints', [])
+    followup_qa = [{'question': btn.get_text(strip=True), 'answer': btn.get('data-answer', '').strip()}
+                   for btn in soup.select('.followup-btn')]
+
+    career_totals = {}
+    table = soup.select_one('.stats-table-container table')
+    if table:
+        headers = [th.get_text(strip=True) for th in table.select('thead th')]
+        values = [td.get_text(strip=True) for td in table.select('tbody td')]
+        career_totals = dict(zip(headers, values))
+
+    years, war_data, teams_by_year = [], [], []
+    chart_island = soup.find('script', id='career-chart-data')
+    chart_script = soup.find('script', string=re.compile(r"const warData"))
+    if chart_island and chart_island.string:
+        chart = json.loads(chart_island.string)
+        years, war_data, teams_by_year = chart['years'], chart['war'], chart['teams']
+    elif chart_script:
+        # Pages not yet migrated to js/careerChart.js inline the arrays in their chart script
+        script_text = chart_script.string
+        years = _json_array(script_text, "years")
+        war_data = _json_array(script_text, "warData")
+        teams_by_year = _json_array(script_text, "teamsByYear")
+    yearly_war = [{'year': year, 'teams': [team], 'display_team': team, 'war': war}
+                  for year, war, team in zip(years, war_data, teams_by_year)]
+
+    search_data = {'teams': [], 'years': []}
+    search_data_div = soup.find('div', id='search-data')
+    if search_data_div and search_data_div.get_text(strip=True):
+        search_data = json.loads(search_data_div.get_text())
+
+    return build_puzzle_record({
+        'name': name or "Unknown",
+        'nicknames': nicknames,
+        'facts': facts,
+        'followup_qa': followup_qa,
+        'career_totals': career_totals,
+        'yearly_war': yearly_war,
+    }, date_str, search_data={'teams': search_data.get('teams', []), 'years': search_data.get('years', [])})
+
+
+def backfill(project_dir: Path, force: bool = False) -> int:
+    """Writes a record for every detail page that lacks one (or all of them with force). Returns the count written."""
+    written = 0
+    for html_file in sorted(Path(project_dir).glob("????-??-??.html")):
+        date_str = html_file.stem
+        if not force and puzzle_path(project_dir, date_str).exists():
+            continue
+        record = record_from_html(html_file.read_text(encoding='utf-8'), date_str)
+        if save_puzzle_record(project_dir, record):
+            written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage canonical per-puzzle JSON records.")
+    parser.add_argument("--backfill", action="store_true", help="Create records for detail pages that do not have one yet.")
+    parser.add_argument("--force", action="store_true", help="With --backfill, re-extract records for every page.")
+    parser.add_argument("--sync-quiz", action="store_true", help=f"Write {QUIZ_DIR}/{{date}}.json for every record and drop orphans.")
+    parser.add_argument("--quiz-bundle", action="store_true", help=f"Also write every quiz payload to {QUIZ_DIR}/{QUIZ_BUNDLE_NAME}.")
+    parser.add_argument("--check-quiz", action="store_true", help="Report quiz payloads that are missing, invalid or stale; exits 1 if any.")
+    args = parser.parse_args()
+
+    if not (args.backfill or args.sync_quiz or args.quiz_bundle or args.check_quiz):
+        parser.print_help()
+        return
+
+    if args.backfill:
+        count = backfill(PROJECT_DIR, force=args.force)
+        print(f"✅ Wrote {count} puzzle records to {PUZZLES_DIR}/")
+    if args.backfill or args.sync_quiz:
+        count = sync_quiz_data(PROJECT_DIR)
+        print(f"✅ Updated {count} quiz data files in {QUIZ_DIR}/")
+    if args.quiz_bundle:
+        if write_quiz_bundle(PROJECT_DIR):
+            print(f"✅ Wrote {QUIZ_DIR}/{QUIZ_BUNDLE_NAME}")
+        else:
+            print(f"✅ {QUIZ_DIR}/{QUIZ_BUNDLE_NAME} already up to date")
+    if args.check_quiz:
+        problems = check_quiz_data(PROJECT_DIR)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print("✅ All quiz data files match their puzzle records.")
+
+
+if __name__ == "__main__":
+    main()
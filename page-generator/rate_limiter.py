@@ -0,0 +1,36 @@
+# ABOUTME: Thread-safe minimum-interval rate limiter shared by concurrent API and scraping workers.
+# ABOUTME: Callers reserve the next free slot under a lock and sleep outside it.
+import threading
+import time
+
+
+class RateLimiter:
+    """Spaces calls at least min_interval seconds apart across all threads.
+
+    Each wait() reserves the next free slot under a lock and then sleeps
+    until it arrives, so concurrent callers queue up behind each other
+    without holding the lock while they sleep.
+    """
+
+    def __init__(self, min_interval: float, start_immediately: bool = True):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        self._next_slot = now if start_immediately else now + min_interval
+
+    def wait(self) -> float:
+        """Blocks until this caller's slot arrives and returns the seconds slept."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+# Process-wide limiter for Gemini text calls. One request every 13 seconds keeps
+# any 60s window within the Free Tier limit of 5 requests per minute; callers on
+# a paid key may lower min_interval.
+GEMINI_RATE_LIMITER = RateLimiter(13.0, start_immediately=False)
@@ -0,0 +1,56 @@
+# ABOUTME: Builds search_index.json, an inverted index from search tokens to puzzle ids for the gallery search.
+# ABOUTME: Mirrors galleryFilter.checkMatch so index.js can filter by intersecting posting lists.
+import json
+from typing import Dict, List
+
+SEARCH_INDEX_NAME = "search_index.json"
+
+
+def _add(postings: Dict[str, List[int]], key: str, puzzle_id: int):
+    ids = postings.setdefault(key, [])
+    # Puzzles are visited in id order, so checking the tail keeps each list sorted and unique
+    if not ids or ids[-1] != puzzle_id:
+        ids.append(puzzle_id)
+
+
+def build_search_index(stats_summary: List[dict], static_count: int) -> dict:
+    """
+    Inverts the stats summary into posting lists of puzzle ids, where an id is the puzzle's position
+    in stats_summary (newest first). Puzzles with an id of static_count or more are in archive shards.
+
+    - exact: puzzle day ("08" and "8"), puzzle year and career years, matched whole
+    - months: puzzle month number to puzzles; index.js also matches month names against these
+    - teams: team abbreviation to puzzles; index.js matches full team names from its own map
+    - decades: "90s" and "1990s" style keys for career years
+    - names: lowercased words of names and nicknames, matched as substrings and only for solved puzzles
+    """
+    index = {'dates': [], 'static': static_count, 'exact': {}, 'months': {}, 'teams': {}, 'decades': {}, 'names': {}}
+    for puzzle_id, puzzle in enumerate(stats_summary):
+        year, month, day = puzzle['date'].split('-')
+        index['dates'].append(puzzle['date'])
+        for key in (year, day, str(int(day))):
+            _add(index['exact'], key, puzzle_id)
+        _add(index['months'], month, puzzle_id)
+
+        for abbr in puzzle['teams']:
+            _add(index['teams'], abbr, puzzle_id)
+
+        for career_year in puzzle['years']:
+            _add(index['exact'], career_year.lower(), puzzle_id)
+            _add(index['decades'], f"{career_year[:3]}0s", puzzle_id)
+            if len(career_year) in (4, 5):
+                _add(index['decades'], f"{career_year[2]}0s", puzzle_id)
+            if career_year.endswith('s'):
+                # A four-digit search also finds decade entries such as "1990s" written as career years
+                _add(index['decades'], career_year[:3], puzzle_id)
+
+        for word in f"{puzzle['name']} {puzzle['nickname'] or ''}".lower().split():
+            _add(index['names'], word, puzzle_id)
+
+    for postings in ('exact', 'months', 'teams', 'decades', 'names'):
+        index[postings] = dict(sorted(index[postings].items()))
+    return index
+
+
+def search_index_json(index: dict) -> str:
+    return json.dumps(index, separators=(',', ':'), ensure_ascii=False)
@@ -4,8 +4,11 @@ import re
 import os
 import glob
 import argparse
+from pathlib import Path
 from bs4 import BeautifulSoup
 
+from puzzle_store import load_puzzle_record
+
 def extract_metadata(soup, date_stem=None):
     """
     Extract player name and date from the BeautifulSoup object.
@@ -103,7 +106,11 @@ def process_file(file_path, dry_run=True):
     soup = BeautifulSoup(content, 'html.parser')
     date_stem = os.path.basename(file_path).replace('.html', '')
     
-    player_name, date = extract_metadata(soup, date_stem)
+    record = load_puzzle_record(Path(file_path).parent, date_stem)
+    if record is not None:
+        player_name, date = record['name'], date_stem
+    else:
+        player_name, date = extract_metadata(soup, date_stem)
     if not player_name or not date:
         print(f"Skipping {file_path}: Metadata not found")
         return
@@ -0,0 +1,182 @@
+# ABOUTME: Generates sw.js and precache-manifest.json, which list the site shell and newest puzzles with content hashes.
+# ABOUTME: Both files are rewritten only when a covered file's hash changes, which is what tells browsers to update.
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_DIR = Path(__file__).parent.parent
+SERVICE_WORKER_NAME = "sw.js"
+PRECACHE_MANIFEST_NAME = "precache-manifest.json"
+DEFAULT_PRECACHE_PUZZLES = 7
+
+# The pages, styles, scripts and data every visit needs
+SHELL_PATTERNS = (
+    "index.html",
+    "quiz.html",
+    "analytics.html",
+    "instructions.html",
+    "style.css",
+    "manifest.json",
+    "firebase-config.js",
+    "js/*.js",
+    "stats_summary.json",
+    "search_index.json",
+    "images/favicon.png",
+)
+# Per-puzzle files precached for the newest puzzles; patterns cover the AVIF variants <picture> prefers
+PUZZLE_FILES = (
+    "{date}.html",
+    "images/clue-{date}.webp",
+    "images/answer-{date}.webp",
+    "images/variants/clue-{date}-*w.avif",
+    "images/variants/answer-{date}-*w.avif",
+    "data/quiz/{date}.json",
+)
+
+# Kept in Python like the page templates; the version line is the only part that changes between builds
+SERVICE_WORKER_TEMPLATE = """// Generated by page-generator/service_worker.py from precache-manifest.json. Do not edit by hand.
+const MANIFEST_VERSION = '__MANIFEST_VERSION__';
+const CACHE_NAME = 'name-that-yankee-precache';
+const MANIFEST_URL = `precache-manifest.json?v=${MANIFEST_VERSION}`;
+
+// Each asset is stored under its revision, so an unchanged file is never downloaded again
+function revisionedUrl(path, revision) {
+    return new URL(`${path}?__rev=${revision}`, self.registration.scope).href;
+}
+
+async function precache() {
+    const cache = await caches.open(CACHE_NAME);
+    const response = await fetch(MANIFEST_URL, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+    const manifest = await response.clone().json();
+    await Promise.all(Object.entries(manifest.assets).map(async ([path, revision]) => {
+        const key = revisionedUrl(path, revision);
+        if (await cache.match(key)) return;
+        try {
+            const asset = await fetch(path, { cache: 'reload' });
+            if (asset.ok) await cache.put(key, asset);
+        } catch (err) {
+            console.warn(`Could not precache ${path}:`, err);
+        }
+    }));
+    await cache.put(MANIFEST_URL, response);
+}
+
+async function removeOutdatedEntries() {
+    const cache = await caches.open(CACHE_NAME);
+    const manifest = await (await cache.match(MANIFEST_URL)).json();
+    const current = new Set(Object.entries(manifest.assets).map(([path, revision]) => revisionedUrl(path, revision)));
+    current.add(new URL(MANIFEST_URL, self.registration.scope).href);
+    const keys = await cache.keys();
+    await Promise.all(keys.filter(request => !current.has(request.url)).map(request => cache.delete(request)));
+}
+
+let assetsPromise = null;
+function currentAssets() {
+    assetsPromise = assetsPromise || caches.open(CACHE_NAME)
+        .then(cache => cache.match(MANIFEST_URL))
+        .then(response => (response ? response.json() : { assets: {} }))
+        .then(manifest => manifest.assets);
+    return assetsPromise;
+}
+
+async function respond(request) {
+    const url = new URL(request.url);
+    let path = url.pathname.slice(new URL(self.registration.scope).pathname.length) || 'index.html';
+    const assets = await currentAssets();
+    if (!(path in assets) && `${path}.html` in assets) path = `${path}.html`;
+    const revision = assets[path];
+    // Pages ask for data at a newer ?v= than this worker knows about until it updates
+    const requestedVersion = url.searchParams.get('v');
+    if (!revision || (requestedVersion && requestedVersion !== revision)) return fetch(request);
+
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(revisionedUrl(path, revision));
+    if (request.mode === 'navigate') {
+        // Pages go to the network first so a new puzzle shows at once; the precached copy covers offline visits
+        try {
+            return await fetch(request);
+        } catch (err) {
+            return cached || Response.error();
+        }
+    }
+    return cached || fetch(request);
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(removeOutdatedEntries().then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    const { request } = event;
+    if (request.method !== 'GET' || new URL(request.url).origin !== self.location.origin) return;
+    event.respondWith(respond(request));
+});
+"""
+
+
+def file_revision(path: Path) -> str:
+    """The same 12-character SHA-256 prefix stats_summary.content_version puts in ?v=, so the two can be compared."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+
+
+def recent_puzzle_dates(project_dir: Path, count: int) -> List[str]:
+    clue_files = sorted(Path(project_dir).glob("images/clue-????-??-??.webp"), reverse=True)
+    return [clue.stem[len("clue-"):] for clue in clue_files[:count]]
+
+
+def precache_paths(project_dir: Path, puzzle_count: int = DEFAULT_PRECACHE_PUZZLES) -> List[str]:
+    """Site-relative paths of the shell assets and the newest puzzles' files that exist."""
+    project_dir = Path(project_dir)
+    paths = []
+    for pattern in SHELL_PATTERNS:
+        paths.extend(sorted(path.relative_to(project_dir).as_posix() for path in project_dir.glob(pattern) if path.is_file()))
+    for date_str in recent_puzzle_dates(project_dir, puzzle_count):
+        for pattern in PUZZLE_FILES:
+            matches = project_dir.glob(pattern.format(date=date_str))
+            paths.extend(sorted(path.relative_to(project_dir).as_posix() for path in matches if path.is_file()))
+    return paths
+
+
+def build_precache_manifest(project_dir: Path, puzzle_count: int = DEFAULT_PRECACHE_PUZZLES) -> dict:
+    assets: Dict[str, str] = {path: file_revision(Path(project_dir) / path) for path in precache_paths(project_dir, puzzle_count)}
+    version = hashlib.sha256(json.dumps(assets, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return {'version': version, 'assets': assets}
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return False
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text(content, encoding='utf-8')
+    temp_path.replace(path)
+    return True
+
+
+def write_service_worker(project_dir: Path, puzzle_count: int = DEFAULT_PRECACHE_PUZZLES) -> bool:
+    """Writes precache-manifest.json and sw.js if any covered file changed. Returns True if they were rewritten."""
+    manifest = build_precache_manifest(project_dir, puzzle_count)
+    manifest_text = json.dumps(manifest, indent=1)
+    changed = _write_if_changed(Path(project_dir) / PRECACHE_MANIFEST_NAME, manifest_text)
+    service_worker = SERVICE_WORKER_TEMPLATE.replace("__MANIFEST_VERSION__", manifest['version'])
+    changed |= _write_if_changed(Path(project_dir) / SERVICE_WORKER_NAME, service_worker)
+    if changed:
+        print(f"📦 Service worker precache updated: {len(manifest['assets'])} files, version {manifest['version']}.")
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate sw.js and precache-manifest.json.")
+    parser.add_argument("--puzzles", type=int, default=DEFAULT_PRECACHE_PUZZLES, help="How many of the newest puzzles to precache.")
+    args = parser.parse_args()
+    write_service_worker(PROJECT_DIR, args.puzzles)
+
+
+if __name__ == "__main__":
+    main()
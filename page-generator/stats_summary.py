@@ -0,0 +1,93 @@
+# ABOUTME: Reads and writes stats_summary.json in its compact columnar form, with a content-hash version.
+# ABOUTME: Pages carry the version in a <meta> tag so browsers cache the data files until they change.
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import List, Union
+
+STATS_SUMMARY_NAME = "stats_summary.json"
+STATS_FORMAT = 2
+
+# <meta> names the generator stamps with each data file's version; the page scripts append it as ?v=
+STATS_VERSION_META = "stats-summary-version"
+SEARCH_INDEX_VERSION_META = "search-index-version"
+
+
+def content_version(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+
+def year_ranges(years: List[str]) -> list:
+    """Collapses runs of consecutive seasons: ["1996", "1997", "1998", "2001"] -> [[1996, 1998], 2001]."""
+    runs = []
+    for year in map(int, years):
+        if runs and year == runs[-1][1] + 1:
+            runs[-1][1] = year
+        else:
+            runs.append([year, year])
+    return [start if start == end else [start, end] for start, end in runs]
+
+
+def expand_years(ranges: list) -> List[str]:
+    years = []
+    for entry in ranges:
+        start, end = entry if isinstance(entry, list) else (entry, entry)
+        years.extend(str(year) for year in range(start, end + 1))
+    return years
+
+
+def compact_stats_summary(entries: List[dict], static_count: int = None) -> dict:
+    """
+    Turns per-puzzle entries into columns: one list per field, teams as ids into a shared table
+    (most common first) and career years as ranges. Entries past static_count are in archive shards.
+    """
+    team_counts = Counter(team for entry in entries for team in entry['teams'])
+    team_table = sorted(team_counts, key=lambda team: (-team_counts[team], team))
+    team_ids = {team: i for i, team in enumerate(team_table)}
+    return {
+        'format': STATS_FORMAT,
+        'static': len(entries) if static_count is None else static_count,
+        'team_table': team_table,
+        'date': [entry['date'] for entry in entries],
+        'name': [entry['name'] for entry in entries],
+        'nickname': [entry['nickname'] for entry in entries],
+        'teams': [[team_ids[team] for team in entry['teams']] for entry in entries],
+        'years': [year_ranges(entry['years']) for entry in entries],
+    }
+
+
+def expand_stats_summary(data: Union[dict, list]) -> List[dict]:
+    """Rebuilds the per-puzzle entries from the columnar form. Lists from older generators pass through."""
+    if isinstance(data, list):
+        return data
+    entries = []
+    for i, date_str in enumerate(data['date']):
+        entry = {
+            'date': date_str,
+            'name': data['name'][i],
+            'nickname': data['nickname'][i],
+            'teams': [data['team_table'][team_id] for team_id in data['teams'][i]],
+            'years': expand_years(data['years'][i]),
+        }
+        if i >= data['static']:
+            entry['shard'] = date_str[:7]
+        entries.append(entry)
+    return entries
+
+
+def stats_summary_json(entries: List[dict], static_count: int = None) -> str:
+    return json.dumps(compact_stats_summary(entries, static_count), separators=(',', ':'), ensure_ascii=False)
+
+
+def load_stats_summary(path: Path) -> List[dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return expand_stats_summary(json.load(f))
+
+
+def stamp_version(html_text: str, meta_name: str, version: str) -> str:
+    """Sets the content of the page's <meta name=meta_name> tag, whatever its attribute order. Unchanged if absent."""
+    def set_content(match):
+        return re.sub(r'content="[^"]*"', f'content="{version}"', match.group(0), count=1)
+    return re.sub(rf'<meta\b[^>]*\bname="{re.escape(meta_name)}"[^>]*>', set_content, html_text)
@@ -28,7 +28,10 @@ mkdir -p tests/fixtures/www/
 [ ! -L tests/fixtures/www/js ] && ln -s ../../../js tests/fixtures/www/js
 [ ! -L tests/fixtures/www/images ] && ln -s ../../../images tests/fixtures/www/images
 [ ! -L tests/fixtures/www/firebase-config.js ] && ln -s ../../../firebase-config.js tests/fixtures/www/firebase-config.js
-[ ! -L tests/fixtures/www/all_players.js ] && ln -s ../../../all_players.js tests/fixtures/www/all_players.js
+# Player-name shards (data/players) and per-puzzle quiz data (data/quiz) are fetched at runtime
+[ ! -L tests/fixtures/www/data ] && ln -s ../../../data tests/fixtures/www/data
+# quiz.html no longer loads the full player list
+rm -f tests/fixtures/www/all_players.js
 
 # Copy core pages and a representative historical page for E2E tests
 # Use || true to prevent script exit if files are identical
@@ -38,6 +41,15 @@ cp instructions.html tests/fixtures/www/instructions.html || true
 cp analytics.html tests/fixtures/www/analytics.html || true
 cp style.css tests/fixtures/www/style.css || true
 cp stats_summary.json tests/fixtures/www/stats_summary.json || true
+# index.js takes its puzzle dates from the search index; sharded archives add archive/{month}.html
+cp search_index.json tests/fixtures/www/search_index.json || true
+# Lets the E2E pages actually register the service worker instead of failing quietly
+cp sw.js tests/fixtures/www/sw.js || true
+cp precache-manifest.json tests/fixtures/www/precache-manifest.json || true
+if [ -d archive ]; then
+  rm -rf tests/fixtures/www/archive
+  cp -R archive tests/fixtures/www/archive
+fi
 cp 2026-04-19.html tests/fixtures/www/2026-04-19.html || true
 cp 2026-07-04.html tests/fixtures/www/2026-07-04.html || true
 cp 2026-05-04.html tests/fixtures/www/2026-05-04.html || true
@@ -1,5 +1,5 @@
 # ABOUTME: Local development server with support for extensionless URLs.
-# ABOUTME: Handles routing for static assets and HTML files without .html suffixes.
+# ABOUTME: Handles routing for static assets and HTML files without .html suffixes, and serves precompressed .br/.gz siblings.
 
 import http.server
 import socketserver
@@ -12,6 +12,31 @@ PORT = int(os.environ.get("PORT", 8000))
 # Default to current working directory
 DIRECTORY = os.path.abspath(os.environ.get("DIRECTORY", "."))
 
+# Precompressed siblings written by page-generator/precompress.py, in order of preference
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+def parse_accept_encoding(header):
+    """Returns the set of content codings a client accepts, honouring q=0 exclusions."""
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    if "*" in accepted:
+        accepted.update(coding for coding, _ in PRECOMPRESSED)
+    return accepted
+
 class CleanURLHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         # Python 3.7+ supports the directory parameter
@@ -38,6 +63,43 @@ class CleanURLHandler(http.server.SimpleHTTPRequestHandler):
                     
         return translated
 
+    def precompressed_variant(self, path):
+        """Returns (coding, sibling path) for the best current precompressed sibling the client accepts, or None."""
+        if not os.path.isfile(path):
+            return None
+        accepted = parse_accept_encoding(self.headers.get("Accept-Encoding"))
+        source_mtime = os.stat(path).st_mtime_ns
+        for coding, suffix in PRECOMPRESSED:
+            sibling = path + suffix
+            # precompress.py stamps siblings with their source's mtime; anything else is stale
+            if coding in accepted and os.path.isfile(sibling) and os.stat(sibling).st_mtime_ns == source_mtime:
+                return coding, sibling
+        return None
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and urllib.parse.urlparse(self.path).path.endswith("/"):
+            path = os.path.join(path, "index.html")
+        variant = self.precompressed_variant(path)
+        if variant is None:
+            return super().send_head()
+
+        coding, sibling = variant
+        f = open(sibling, "rb")
+        try:
+            fs = os.fstat(f.fileno())
+            self.send_response(200)
+            self.send_header("Content-type", self.guess_type(path))
+            self.send_header("Content-Encoding", coding)
+            self.send_header("Content-Length", str(fs.st_size))
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Last-Modified", self.date_time_string(fs.st_mtime))
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
 if __name__ == "__main__":
     if not os.path.exists(DIRECTORY):
         print(f"Error: Directory '{DIRECTORY}' does not exist.")
@@ -0,0 +1,82 @@
+// Generated by page-generator/service_worker.py from precache-manifest.json. Do not edit by hand.
+const MANIFEST_VERSION = '2768185d7480';
+const CACHE_NAME = 'name-that-yankee-precache';
+const MANIFEST_URL = `precache-manifest.json?v=${MANIFEST_VERSION}`;
+
+// Each asset is stored under its revision, so an unchanged file is never downloaded again
+function revisionedUrl(path, revision) {
+    return new URL(`${path}?__rev=${revision}`, self.registration.scope).href;
+}
+
+async function precache() {
+    const cache = await caches.open(CACHE_NAME);
+    const response = await fetch(MANIFEST_URL, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+    const manifest = await response.clone().json();
+    await Promise.all(Object.entries(manifest.assets).map(async ([path, revision]) => {
+        const key = revisionedUrl(path, revision);
+        if (await cache.match(key)) return;
+        try {
+            const asset = await fetch(path, { cache: 'reload' });
+            if (asset.ok) await cache.put(key, asset);
+        } catch (err) {
+            console.warn(`Could not precache ${path}:`, err);
+        }
+    }));
+    await cache.put(MANIFEST_URL, response);
+}
+
+async function removeOutdatedEntries() {
+    const cache = await caches.open(CACHE_NAME);
+    const manifest = await (await cache.match(MANIFEST_URL)).json();
+    const current = new Set(Object.entries(manifest.assets).map(([path, revision]) => revisionedUrl(path, revision)));
+    current.add(new URL(MANIFEST_URL, self.registration.scope).href);
+    const keys = await cache.keys();
+    await Promise.all(keys.filter(request => !current.has(request.url)).map(request => cache.delete(request)));
+}
+
+let assetsPromise = null;
+function currentAssets() {
+    assetsPromise = assetsPromise || caches.open(CACHE_NAME)
+        .then(cache => cache.match(MANIFEST_URL))
+        .then(response => (response ? response.json() : { assets: {} }))
+        .then(manifest => manifest.assets);
+    return assetsPromise;
+}
+
+async function respond(request) {
+    const url = new URL(request.url);
+    let path = url.pathname.slice(new URL(self.registration.scope).pathname.length) || 'index.html';
+    const assets = await currentAssets();
+    if (!(path in assets) && `${path}.html` in assets) path = `${path}.html`;
+    const revision = assets[path];
+    // Pages ask for data at a newer ?v= than this worker knows about until it updates
+    const requestedVersion = url.searchParams.get('v');
+    if (!revision || (requestedVersion && requestedVersion !== revision)) return fetch(request);
+
+    const cache = await caches.open(CACHE_NAME);
+    const cached = await cache.match(revisionedUrl(path, revision));
+    if (request.mode === 'navigate') {
+        // Pages go to the network first so a new puzzle shows at once; the precached copy covers offline visits
+        try {
+            return await fetch(request);
+        } catch (err) {
+            return cached || Response.error();
+        }
+    }
+    return cached || fetch(request);
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(removeOutdatedEntries().then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    const { request } = event;
+    if (request.method !== 'GET' || new URL(request.url).origin !== self.location.origin) return;
+    event.respondWith(respond(request));
+});
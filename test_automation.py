@@ -181,6 +181,7 @@ def main():
 
 import json
 import html_generator
+from stats_summary import load_stats_summary
 
 def test_rebuild_index_generates_stats_summary(tmp_path):
     # Setup mock project structure
@@ -210,8 +211,7 @@ def test_rebuild_index_generates_stats_summary(tmp_path):
     stats_file = project_dir / "stats_summary.json"
     assert stats_file.exists()
     
-    with open(stats_file, 'r') as f:
-        data = json.load(f)
+    data = load_stats_summary(stats_file)
     
     assert len(data) == 1
     assert data[0]['date'] == date_str
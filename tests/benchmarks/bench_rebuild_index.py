@@ -0,0 +1,91 @@
+# ABOUTME: Benchmarks html_generator.rebuild_index_page on synthetic archives of 250, 2,500 and 25,000 puzzles.
+# ABOUTME: Times a cold rebuild, a no-op rebuild, a rebuild after one edited page and one after a new puzzle.
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "page-generator"))
+from html_generator import build_detail_page_html, rebuild_index_page  # type: ignore
+
+TEAMS = ["NYY", "BOS", "OAK", "SDP", "TOR", "HOU"]
+
+
+def synthetic_player(n: int) -> dict:
+    start_year = 1950 + n % 50
+    return {
+        "name": f"Player {n}",
+        "nickname": f"Nick {n}" if n % 3 == 0 else "",
+        "facts": [f"Synthetic fact {k} about player {n}." for k in range(6)],
+        "followup_qa": [{"question": f"Question {k}?", "answer": f"Answer {k}."} for k in range(3)],
+        "career_totals": {"WAR": "12.3", "G": "1000"},
+        "yearly_war": [
+            {"year": str(start_year + y), "war": 1.5, "display_team": TEAMS[(n + y) % len(TEAMS)], "teams": [TEAMS[(n + y) % len(TEAMS)]]}
+            for y in range(10)
+        ],
+    }
+
+
+def datetime_format(date_str: str) -> str:
+    return date.fromisoformat(date_str).strftime("%B %d, %Y")
+
+
+def add_puzzle(project_dir: Path, n: int):
+    date_str = (date(1900, 1, 1) + timedelta(days=n)).isoformat()
+    formatted_date = datetime_format(date_str)
+    (project_dir / "images" / f"clue-{date_str}.webp").write_bytes(b"")
+    (project_dir / f"{date_str}.html").write_text(build_detail_page_html(synthetic_player(n), date_str, formatted_date), encoding="utf-8")
+    return date_str
+
+
+def build_project(root: Path, size: int) -> Path:
+    project_dir = root / f"archive-{size}"
+    (project_dir / "images").mkdir(parents=True)
+    shutil.copy(REPO_ROOT / "index.html", project_dir / "index.html")
+    for n in range(size):
+        add_puzzle(project_dir, n)
+    return project_dir
+
+
+def timed(project_dir: Path) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        rebuild_index_page(project_dir)
+    return time.perf_counter() - start
+
+
+def bench(root: Path, size: int) -> dict:
+    project_dir = build_project(root, size)
+    results = {"cold": timed(project_dir), "no-op": timed(project_dir)}
+
+    edited = project_dir / f"{(date(1900, 1, 1) + timedelta(days=size // 2)).isoformat()}.html"
+    edited.write_text(edited.read_text(encoding="utf-8").replace("Synthetic fact 0", "Edited fact 0"), encoding="utf-8")
+    os.utime(edited, ns=(time.time_ns(), time.time_ns()))
+    results["one edited"] = timed(project_dir)
+
+    add_puzzle(project_dir, size)
+    results["one added"] = timed(project_dir)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental index rebuilds on synthetic archives.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 2500, 25000], help="Archive sizes to benchmark.")
+    args = parser.parse_args()
+
+    print(f"{'puzzles':>8} {'cold':>10} {'no-op':>10} {'one edited':>12} {'one added':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            r = bench(Path(tmp), size)
+            print(f"{size:>8} {r['cold']:>9.2f}s {r['no-op']:>9.2f}s {r['one edited']:>11.2f}s {r['one added']:>11.2f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
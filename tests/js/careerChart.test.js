@@ -0,0 +1,51 @@
+// ABOUTME: Tests the shared career-arc chart module used by player detail pages.
+// ABOUTME: Verifies the waterfall data, colors and that the chart reads the JSON data island.
+
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import { buildCareerChartConfig, initCareerChart } from '../../js/careerChart.js';
+
+const teamColors = {
+    'NYY': { bg: 'navy-bg', border: 'navy', name: 'Yankees' },
+    'Total': { bg: 'total-bg', border: 'total', name: 'Career' },
+    'Default': { bg: 'default-bg', border: 'default', name: 'Other' }
+};
+const data = { years: ['1997', '1998'], war: [-0.5, 5.5], teams: ['OAK', 'NYY'] };
+
+describe('Career chart', () => {
+    beforeEach(() => {
+        document.body.innerHTML = `
+            <canvas id="careerArcChart"></canvas>
+            <script type="application/json" id="career-chart-data">${JSON.stringify(data)}</script>
+        `;
+        HTMLCanvasElement.prototype.getContext = vi.fn(() => ({}));
+        window.TEAM_COLORS = teamColors;
+        window.Chart = vi.fn(function (ctx, config) { this.config = config; });
+    });
+
+    it('should build a cumulative waterfall ending in a career total bar', () => {
+        const config = buildCareerChartConfig(data, teamColors);
+        const dataset = config.data.datasets[0];
+
+        expect(config.data.labels).toEqual(['1997', '1998', 'Career Total']);
+        expect(dataset.data).toEqual([[0, -0.5], [-0.5, 5], [0, 5]]);
+        expect(dataset.backgroundColor).toEqual(['default-bg', 'navy-bg', 'total-bg']);
+
+        const label = config.options.plugins.tooltip.callbacks.label;
+        expect(label({ dataIndex: 1 })).toBe('1998 (NYY): 5.5');
+        expect(label({ dataIndex: 2 })).toBe('Total Career WAR: 5.0');
+    });
+
+    it('should render from the data island', () => {
+        const chart = initCareerChart();
+
+        expect(window.Chart).toHaveBeenCalledTimes(1);
+        expect(chart.config.data.labels).toEqual(['1997', '1998', 'Career Total']);
+    });
+
+    it('should do nothing on pages without chart data', () => {
+        document.body.innerHTML = '<canvas id="careerArcChart"></canvas>';
+
+        expect(initCareerChart()).toBeNull();
+        expect(window.Chart).not.toHaveBeenCalled();
+    });
+});
@@ -1,32 +1,26 @@
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { JSDOM } from 'jsdom';
 
-// Mock the gallery filter function
-vi.mock('../../js/galleryFilter.js', () => ({
-    checkMatch: vi.fn((puzzle, isCompleted, tokens) => {
-        if (tokens.length === 0) return true;
-        const searchStr = tokens.join(' ');
-        if (puzzle.name.toLowerCase().includes(searchStr)) return true;
-        if (puzzle.teams.some(t => t.toLowerCase().includes(searchStr))) return true;
-        return false;
-    })
-}));
-
 import { initIndex } from '../../js/index.js';
 
 describe('Index DOM tests', () => {
-    const sampleStats = [
-        { date: "2025-05-15", name: "Derek Jeter", teams: ["NYY"], years: ["1995"] },
-        { date: "2025-06-01", name: "Aaron Judge", teams: ["NYY"], years: ["2016"] },
-        { date: "2026-04-12", name: "Gerrit Cole", teams: ["NYY"], years: ["2020"] }
-    ];
+    // search_index.json for Derek Jeter (1995), Aaron Judge (2016) and Gerrit Cole (2020)
+    const sampleIndex = {
+        dates: ["2025-05-15", "2025-06-01", "2026-04-12"],
+        static: 3,
+        exact: { "2025": [0, 1], "2026": [2], "15": [0], "01": [1], "1": [1], "12": [2], "1995": [0], "2016": [1], "2020": [2] },
+        months: { "04": [2], "05": [0], "06": [1] },
+        teams: { "NYY": [0, 1, 2] },
+        decades: { "1990s": [0], "90s": [0], "2010s": [1], "10s": [1], "2020s": [2], "20s": [2] },
+        names: { "aaron": [1], "cole": [2], "derek": [0], "gerrit": [2], "jeter": [0], "judge": [1] }
+    };
 
     beforeEach(() => {
         // Mock global fetch
         global.fetch = vi.fn().mockImplementation(() =>
             Promise.resolve({
                 ok: true,
-                json: () => Promise.resolve(sampleStats),
+                json: () => Promise.resolve(sampleIndex),
             })
         );
 
@@ -98,6 +92,8 @@ describe('Index DOM tests', () => {
     });
 
     it('should filter items when search bar is typed into', async () => {
+        // Names only match once the puzzle is solved
+        global.localStorage.setItem('nameThatYankeeCompletedPuzzles', JSON.stringify(['2025-06-01']));
         await initIndex();
         // Wait for fetch to complete
         await new Promise(resolve => setTimeout(resolve, 0));
@@ -143,4 +139,30 @@ describe('Index DOM tests', () => {
         expect(containers[0].style.display).toBe('none'); // Jeter (completed)
         expect(containers[1].style.display).toBe(''); // Judge (not completed)
     });
+
+    it('should load archive shards that hold matches for a search', async () => {
+        // Don Mattingly (1984) is past the static tiles, so his tile is in the 2025-03 shard
+        const shardedIndex = structuredClone(sampleIndex);
+        shardedIndex.dates.push("2025-03-30");
+        shardedIndex.exact["1984"] = [3];
+        shardedIndex.teams.NYY.push(3);
+        global.fetch = vi.fn().mockImplementation((url) => Promise.resolve(url.startsWith('archive/')
+            ? { ok: true, text: () => Promise.resolve('<div class="gallery-container"><a class="reveal-link" href="2025-03-30?reveal=true">Reveal</a></div>') }
+            : { ok: true, json: () => Promise.resolve(shardedIndex) }));
+
+        await initIndex();
+        expect(document.querySelector('.load-more')).not.toBeNull();
+
+        const searchBar = document.getElementById('search-bar');
+        searchBar.value = '1984';
+        searchBar.dispatchEvent(new Event('input'));
+        await new Promise(resolve => setTimeout(resolve, 0));
+
+        expect(global.fetch).toHaveBeenCalledWith('archive/2025-03.html');
+        const containers = document.querySelectorAll('.gallery-container');
+        expect(containers).toHaveLength(4);
+        expect(containers[3].style.display).toBe(''); // Mattingly, from the shard
+        expect(containers[0].style.display).toBe('none');
+        expect(document.querySelector('.load-more').hidden).toBe(true);
+    });
 });
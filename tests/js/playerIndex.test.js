@@ -0,0 +1,58 @@
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import { PlayerIndex, shardKey } from '../../js/playerIndex.js';
+import { getAutocompleteSuggestions } from '../../js/quizEngine.js';
+
+describe('PlayerIndex', () => {
+    const deShard = {
+        names: ['Dennis Rasmussen', 'Derek Jeter', 'Derek Lowe', 'Dérrick May'],
+        keys: ['dennis rasmussen', 'derek jeter', 'derek lowe', 'derrick may']
+    };
+
+    beforeEach(() => {
+        global.fetch = vi.fn((url) => Promise.resolve(url === 'data/players/de.json'
+            ? { ok: true, json: () => Promise.resolve(deShard) }
+            : { ok: false, status: 404 }));
+    });
+
+    it('should name shards by the first two normalized characters', () => {
+        expect(shardKey('derek jeter')).toBe('de');
+        expect(shardKey('a.j. burnett')).toBe('a_');
+    });
+
+    it('should binary-search a sorted shard for prefix matches', () => {
+        expect(getAutocompleteSuggestions('Dere', deShard)).toEqual(['Derek Jeter', 'Derek Lowe']);
+        expect(getAutocompleteSuggestions('derr', deShard)).toEqual(['Dérrick May']);
+        expect(getAutocompleteSuggestions('dez', deShard)).toEqual([]);
+        expect(getAutocompleteSuggestions('d', deShard)).toEqual([]);
+    });
+
+    it('should fetch only the shard a guess needs, once', async () => {
+        const index = new PlayerIndex();
+        expect(index.isLoaded('Derek')).toBe(false);
+        await index.load('Derek');
+        await index.load('Dennis');
+
+        expect(global.fetch).toHaveBeenCalledTimes(1);
+        expect(index.suggest('derek')).toEqual(['Derek Jeter', 'Derek Lowe']);
+        expect(index.has('derek jeter')).toBe(true);
+        expect(index.has('derek smith')).toBe(false);
+    });
+
+    it('should treat a missing shard as empty without refetching it', async () => {
+        const index = new PlayerIndex();
+        await index.load('Zz Top');
+        await index.load('Zz Top');
+
+        expect(global.fetch).toHaveBeenCalledTimes(1);
+        expect(index.isLoaded('zz')).toBe(true);
+        expect(index.suggest('zz')).toEqual([]);
+    });
+
+    it('should suggest and accept pinned tribute names first', async () => {
+        const index = new PlayerIndex(['Dean Tribute']);
+        await index.load('de');
+
+        expect(index.suggest('de', 3)).toEqual(['Dean Tribute', 'Dennis Rasmussen', 'Derek Jeter']);
+        expect(index.has('dean tribute')).toBe(true);
+    });
+});
@@ -59,6 +59,9 @@ vi.mock('../../js/quizEngine.js', () => {
 
 import { initQuiz } from '../../js/quiz.js';
 
+// Guesses are checked once the player-name shard for their first two letters has loaded
+const settle = () => new Promise(resolve => setTimeout(resolve, 0));
+
 describe('Quiz DOM tests', () => {
     beforeEach(() => {
         document.body.innerHTML = `
@@ -137,6 +140,7 @@ describe('Quiz DOM tests', () => {
 
         guessInput.value = 'Derek Jeter';
         submitBtn.click();
+        await settle();
 
         expect(document.getElementById('quiz-area').style.display).toBe('none');
         expect(document.getElementById('success-area').style.display).toBe('block');
@@ -164,6 +168,7 @@ describe('Quiz DOM tests', () => {
 
         guessInput.value = 'Not A Real Player';
         submitBtn.click();
+        await settle();
 
         expect(feedbackMsg.textContent).toContain('not a valid MLB player');
         expect(feedbackMsg.className).toBe('incorrect');
@@ -179,6 +184,7 @@ describe('Quiz DOM tests', () => {
 
         guessInput.value = 'Babe Ruth'; // Triggers INCORRECT_VALID_PLAYER in our mock
         submitBtn.click();
+        await settle();
 
         expect(feedbackMsg.textContent).toBe('Incorrect. Try again!');
         expect(hintsContainer.style.display).toBe('block');
@@ -203,6 +209,7 @@ describe('Quiz DOM tests', () => {
         // Guess wrong again to exhaust quiz
         guessInput.value = 'Babe Ruth';
         submitBtn.click();
+        await settle();
 
         expect(submitBtn.disabled).toBe(true);
         expect(guessInput.disabled).toBe(true);
@@ -229,6 +236,7 @@ describe('Quiz DOM tests', () => {
 
         guessInput.value = 'de';
         guessInput.dispatchEvent(new Event('input')); // Generate suggestions
+        await settle();
 
         // Arrow down
         const arrowDownEvent = new window.KeyboardEvent('keydown', { key: 'ArrowDown', bubbles: true });
@@ -252,6 +260,7 @@ describe('Quiz DOM tests', () => {
         // Enter should submit Highlighted Item
         const enterEvent = new window.KeyboardEvent('keydown', { key: 'Enter', bubbles: true });
         guessInput.dispatchEvent(enterEvent);
+        await settle();
 
         // The mock logic will handle this as CORRECT
         expect(document.getElementById('success-area').style.display).toBe('block');
@@ -267,6 +276,7 @@ describe('Quiz DOM tests', () => {
         // First guess wrong
         guessInput.value = 'Babe Ruth';
         submitBtn.click();
+        await settle();
         
         // Use a hint
         hintBtn.click();
@@ -274,6 +284,7 @@ describe('Quiz DOM tests', () => {
         // Second guess right
         guessInput.value = 'Derek Jeter';
         submitBtn.click();
+        await settle();
 
         shareBtn.click();
 
@@ -332,4 +343,18 @@ describe('Quiz DOM tests', () => {
         expect(navigator.share).toHaveBeenCalled();
         expect(navigator.clipboard.writeText).toHaveBeenCalled();
     });
+
+    it('should load quiz data from the JSON payload without fetching the detail page', async () => {
+        global.fetch = vi.fn((url) => Promise.resolve(url === 'data/quiz/2025-07-11.json'
+            ? { ok: true, json: () => Promise.resolve({ answer: "Derek Jeter", nicknames: ["The Captain"], hints: ["Hint 1", "Hint 2", "Hint 3"] }) }
+            : { ok: false }));
+
+        await initQuiz();
+
+        expect(global.fetch).not.toHaveBeenCalledWith('2025-07-11.html');
+        document.getElementById('guess-input').value = 'Derek Jeter';
+        document.getElementById('submit-guess').click();
+        await settle();
+        expect(document.getElementById('success-area').style.display).toBe('block');
+    });
 });
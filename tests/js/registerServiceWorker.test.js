@@ -0,0 +1,19 @@
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { registerServiceWorker } from '../../js/registerServiceWorker.js';
+
+describe('registerServiceWorker', () => {
+    afterEach(() => {
+        delete navigator.serviceWorker;
+    });
+
+    it('registers sw.js relative to the page once it has loaded', () => {
+        const register = vi.fn(() => Promise.resolve());
+        Object.defineProperty(navigator, 'serviceWorker', { value: { register }, configurable: true });
+
+        registerServiceWorker();
+        expect(register).not.toHaveBeenCalled();
+
+        window.dispatchEvent(new Event('load'));
+        expect(register).toHaveBeenCalledWith('sw.js');
+    });
+});
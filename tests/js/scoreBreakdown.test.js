@@ -57,6 +57,8 @@ vi.mock('../../js/quizEngine.js', () => {
 import { initQuiz } from '../../js/quiz.js';
 import { initIndex } from '../../js/index.js';
 
+const settle = () => new Promise(resolve => setTimeout(resolve, 0));
+
 describe('Score Breakdown Feature', () => {
     
     describe('Quiz Logic - Recording Breakdown', () => {
@@ -117,6 +119,7 @@ describe('Score Breakdown Feature', () => {
 
             guessInput.value = 'Bernie Williams';
             submitBtn.click();
+            await settle();
 
             const breakdown = JSON.parse(localStorage.getItem('nameThatYankeeScoreBreakdown'));
             expect(breakdown).not.toBeNull();
@@ -133,6 +136,7 @@ describe('Score Breakdown Feature', () => {
             hintBtn.click(); // 1 hint used
             guessInput.value = 'Bernie Williams';
             submitBtn.click();
+            await settle();
 
             const breakdown = JSON.parse(localStorage.getItem('nameThatYankeeScoreBreakdown'));
             expect(breakdown["1"]).toBe(1);
@@ -152,6 +156,7 @@ describe('Score Breakdown Feature', () => {
             hintBtn.click(); // 2 hints used
             guessInput.value = 'Bernie Williams';
             submitBtn.click();
+            await settle();
 
             const breakdown = JSON.parse(localStorage.getItem('nameThatYankeeScoreBreakdown'));
             expect(breakdown["2"]).toBe(1);
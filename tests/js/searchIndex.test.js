@@ -0,0 +1,61 @@
+import { describe, it, expect } from 'vitest';
+import { checkMatch, matchSearchIndex } from '../../js/galleryFilter.js';
+
+// Mirrors page-generator/search_index.py for the puzzles below
+function buildIndex(puzzles) {
+    const index = { dates: [], static: puzzles.length, exact: {}, months: {}, teams: {}, decades: {}, names: {} };
+    const add = (postings, key, id) => {
+        postings[key] = postings[key] || [];
+        if (postings[key].at(-1) !== id) postings[key].push(id);
+    };
+    puzzles.forEach((p, id) => {
+        const [year, month, day] = p.date.split('-');
+        index.dates.push(p.date);
+        [year, day, String(parseInt(day, 10))].forEach(key => add(index.exact, key, id));
+        add(index.months, month, id);
+        p.teams.forEach(abbr => add(index.teams, abbr, id));
+        p.years.forEach(y => {
+            add(index.exact, y.toLowerCase(), id);
+            add(index.decades, `${y.substring(0, 3)}0s`, id);
+            if (y.length === 4 || y.length === 5) add(index.decades, `${y[2]}0s`, id);
+            if (y.endsWith('s')) add(index.decades, y.substring(0, 3), id);
+        });
+        `${p.name} ${p.nickname || ''}`.toLowerCase().split(/\s+/).filter(Boolean).forEach(w => add(index.names, w, id));
+    });
+    return index;
+}
+
+describe('matchSearchIndex', () => {
+    const puzzles = [
+        { date: "2026-04-19", name: "Lou Piniella", nickname: "Sweet Lou", teams: ["NYY", "BAL", "KCR", "CLE"], years: ["1970", "1980", "1978"] },
+        { date: "2026-03-09", name: "Derek Jeter", nickname: "The Captain", teams: ["NYY"], years: ["1995", "2014"] },
+        { date: "2025-12-01", name: "Wade Boggs", nickname: "", teams: ["BOS", "NYY", "TBR"], years: ["1982", "1999"] },
+        { date: "2026-05-04", name: "John Sterling", nickname: "The Voice of the Yankees", teams: [], years: [] }
+    ];
+    const index = buildIndex(puzzles);
+
+    it('should match everything when there are no tokens', () => {
+        expect(matchSearchIndex(index, [], () => false)).toBeNull();
+    });
+
+    it('should agree with checkMatch for every token pair', () => {
+        const tokens = ['nyy', 'yankees', 'boston', 'devil', '1970', '1995', '90s', '1980s', '70s', 'march', 'mar',
+            'may', '2026', '04', '4', '09', '9', '2026-03-09', 'lou', 'the', 'jeter', 'voice', 'a', 's', 'nomatch'];
+        const solved = [new Set(), new Set([0, 1, 2, 3]), new Set([1])];
+        for (const completed of solved) {
+            for (const first of tokens) {
+                for (const second of [undefined, ...tokens]) {
+                    const query = second ? [first, second] : [first];
+                    const expected = puzzles.map((p, id) => id).filter(id => checkMatch(puzzles[id], completed.has(id), query));
+                    const actual = [...matchSearchIndex(index, query, id => completed.has(id))].sort((a, b) => a - b);
+                    expect(actual, query.join(' ')).toEqual(expected);
+                }
+            }
+        }
+    });
+
+    it('should protect spoilers (no name match if unsolved)', () => {
+        expect(matchSearchIndex(index, ['jeter'], () => false).size).toBe(0);
+        expect([...matchSearchIndex(index, ['jeter'], id => id === 1)]).toEqual([1]);
+    });
+});
@@ -0,0 +1,35 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import { expandStatsSummary, expandYears, versionedUrl } from '../../js/statsSummary.js';
+
+describe('statsSummary', () => {
+    beforeEach(() => {
+        document.head.innerHTML = '';
+    });
+
+    it('should expand year ranges in season order', () => {
+        expect(expandYears([1964, [1968, 1970], 1978])).toEqual(['1964', '1968', '1969', '1970', '1978']);
+    });
+
+    it('should rebuild entries from the columnar summary', () => {
+        const compact = {
+            format: 2, static: 2, team_table: ['NYY', 'BAL'],
+            date: ['2026-04-21', '2026-03-30'], name: ['Lou Piniella', 'John Sterling'], nickname: ['Sweet Lou', ''],
+            teams: [[1, 0], []], years: [[[1969, 1970], 1978], []]
+        };
+        expect(expandStatsSummary(compact)).toEqual([
+            { date: '2026-04-21', name: 'Lou Piniella', nickname: 'Sweet Lou', teams: ['BAL', 'NYY'], years: ['1969', '1970', '1978'] },
+            { date: '2026-03-30', name: 'John Sterling', nickname: '', teams: [], years: [] }
+        ]);
+    });
+
+    it('should pass through summaries from older generators', () => {
+        const legacy = [{ date: '2025-05-15', name: 'Derek Jeter', teams: ['NYY'], years: ['1995'] }];
+        expect(expandStatsSummary(legacy)).toBe(legacy);
+    });
+
+    it('should version data URLs from the page meta tag', () => {
+        expect(versionedUrl('stats_summary.json', 'stats-summary-version')).toBe('stats_summary.json');
+        document.head.innerHTML = '<meta name="stats-summary-version" content="a2157c047871">';
+        expect(versionedUrl('stats_summary.json', 'stats-summary-version')).toBe('stats_summary.json?v=a2157c047871');
+    });
+});
@@ -132,7 +132,8 @@ def test_generate_grounded_trivia_retries_on_generic_questions():
     bad_response_text = '{"facts": ["Fact 1", "Fact 2", "Fact 3"], "qa": [{"question": "Did he play for the Yankees?", "answer": "Yes"}], "claims": []}'
     good_response_text = '{"facts": ["Fact 1", "Fact 2", "Fact 3"], "qa": [{"question": "What is Martinez known for?", "answer": "The pickoff play"}], "claims": []}'
 
-    with patch("grounded_ai.genai.Client") as mock_genai_client:
+    with patch("grounded_ai.genai.Client") as mock_genai_client, \
+         patch("grounded_ai._respect_free_tier_rate_limit") as mock_wait:
         mock_client = MagicMock()
         mock_genai_client.return_value = mock_client
         
@@ -149,6 +150,8 @@ def test_generate_grounded_trivia_retries_on_generic_questions():
         
         # Should have retried and returned the second (good) response
         assert mock_client.models.generate_content.call_count == 2
+        # Each retry waits its turn on the shared rate limiter
+        assert mock_wait.call_count == 2
         assert result["qa"][0]["question"] == "What is Martinez known for?"
 
 
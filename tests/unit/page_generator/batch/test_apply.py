@@ -59,3 +59,22 @@ def test_patch_html():
     # I'll support both in implementation and check "hints" or "facts" depending on what I implemented.
     assert quiz_json.get("facts") == ["New Hint 1", "New Hint 2", "New Hint 3"] or \
            quiz_json.get("hints") == ["New Hint 1", "New Hint 2", "New Hint 3"]
+
+def test_patched_record_matches_rendered_page():
+    from batch.apply import patch_html, patched_record_fields
+    new_data = {
+        "facts": ["Hint 1"],
+        "qa": [
+            {"question": "Q1?", "answer": "A1."},
+            {"question": " ", "answer": "Blank question."},
+            {"question": "Q3?", "answer": "A3."},
+            {"question": "Q4?", "answer": "A4."}
+        ]
+    }
+    html = '<html><body><div class="player-info"><h2>Scott Brosius</h2><ul></ul></div></body></html>'
+
+    soup = BeautifulSoup(patch_html(html, new_data, player_name="Scott Brosius"), 'html.parser')
+    shown = [{"question": btn.get_text(strip=True), "answer": btn['data-answer']} for btn in soup.select('.followup-btn')]
+
+    assert shown == [{"question": "Q1?", "answer": "A1."}, {"question": "Q3?", "answer": "A3."}]
+    assert patched_record_fields(new_data)['followup_qa'] == shown
@@ -34,7 +34,7 @@ def test_submit_batch():
             src="files/test-file"
         )
 
-def test_download_results():
+def test_download_results(tmp_path):
     mock_client = MagicMock()
     with patch('google.genai.Client', return_value=mock_client):
         client = BatchClient(api_key="test_key")
@@ -45,11 +45,166 @@ def test_download_results():
         mock_job.dest.file_name = "files/results-file"
         mock_client.batches.get.return_value = mock_job
         
-        mock_client.files.download.return_value = b"test results data"
+        def _download(file, destination):
+            Path(destination).write_bytes(b"test results data")
+        mock_client.files.download.side_effect = _download
         
-        client.download_results("batches/test-job", "output.jsonl")
+        output = tmp_path / "output.jsonl"
+        client.download_results("batches/test-job", output)
         
         mock_client.batches.get.assert_called_once_with(name="batches/test-job")
+        # Streamed to a file rather than returned as bytes
         mock_client.files.download.assert_called_once_with(
-            file="files/results-file"
+            file="files/results-file", destination=str(tmp_path / "output.jsonl.tmp")
         )
+        assert output.read_bytes() == b"test results data"
+
+def _request_line(date_str, padding=0):
+    import json
+    return json.dumps({"key": date_str, "request": {"contents": [{"parts": [{"text": "x" * padding}]}]}}) + "\n"
+
+def test_split_requests_respects_chunk_size(tmp_path):
+    from batch.client import split_requests
+
+    requests_file = tmp_path / "requests.jsonl"
+    lines = [_request_line(f"2025-04-0{i}", padding=100) for i in range(1, 6)]
+    requests_file.write_text("".join(lines))
+
+    chunks = split_requests(requests_file, max_chunk_bytes=len(lines[0]) * 2)
+
+    assert len(chunks) == 3
+    assert all(c.stat().st_size <= len(lines[0]) * 2 for c in chunks)
+    assert "".join(c.read_text() for c in chunks) == "".join(lines)
+
+def test_split_requests_small_file_is_not_split(tmp_path):
+    from batch.client import split_requests
+
+    requests_file = tmp_path / "requests.jsonl"
+    requests_file.write_text(_request_line("2025-04-01"))
+
+    assert split_requests(requests_file) == [requests_file]
+
+def test_merge_results_keyed_by_date(tmp_path):
+    import json
+    from batch.client import merge_results
+
+    part1 = tmp_path / "a.jsonl"
+    part2 = tmp_path / "b.jsonl"
+    part1.write_text(json.dumps({"key": "2025-04-02", "response": {"v": 1}}) + "\n")
+    part2.write_text(json.dumps({"key": "2025-04-01", "response": {}}) + "\n" +
+                     json.dumps({"key": "2025-04-02", "response": {"v": 2}}) + "\n")
+    output = tmp_path / "responses.jsonl"
+
+    assert merge_results([part1, part2], output) == 2
+    merged = [json.loads(l) for l in output.read_text().splitlines()]
+    assert [m["key"] for m in merged] == ["2025-04-01", "2025-04-02"]
+    assert merged[1]["response"] == {"v": 2}
+
+def test_run_batch_polls_with_backoff_and_merges(tmp_path):
+    import json
+    mock_client = MagicMock()
+    with patch('google.genai.Client', return_value=mock_client):
+        client = BatchClient(api_key="test_key")
+
+    requests_file = tmp_path / "requests.jsonl"
+    lines = [_request_line("2025-04-01", padding=50), _request_line("2025-04-02", padding=50)]
+    requests_file.write_text("".join(lines))
+
+    uploads = iter(["files/chunk-1", "files/chunk-2"])
+    def _upload(file, config):
+        f = MagicMock()
+        f.name = next(uploads)
+        return f
+    mock_client.files.upload.side_effect = _upload
+
+    def _create(model, src):
+        job = MagicMock()
+        job.name = src.replace("files/chunk", "batches/job")
+        return job
+    mock_client.batches.create.side_effect = _create
+
+    # job-1 finishes on the first poll, job-2 on the second
+    polls = {"batches/job-1": ["SUCCEEDED"], "batches/job-2": ["RUNNING", "SUCCEEDED"]}
+    def _get(name):
+        job = MagicMock()
+        job.name = name
+        job.state = f"JOB_STATE_{polls[name].pop(0)}"
+        job.dest.file_name = name.replace("batches/", "results/")
+        return job
+    mock_client.batches.get.side_effect = _get
+
+    def _download(file, destination):
+        date_str = "2025-04-01" if file.endswith("1") else "2025-04-02"
+        Path(destination).write_text(json.dumps({"key": date_str, "response": {}}) + "\n")
+    mock_client.files.download.side_effect = _download
+
+    output = tmp_path / "responses.jsonl"
+    with patch('batch.client.time.sleep') as mock_sleep:
+        states = client.run_batch(requests_file, output, max_chunk_bytes=len(lines[0]), poll_interval=10)
+
+    assert states == {"batches/job-1": "SUCCEEDED", "batches/job-2": "SUCCEEDED"}
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [10, 20]
+    merged = [json.loads(l)["key"] for l in output.read_text().splitlines()]
+    assert merged == ["2025-04-01", "2025-04-02"]
+    # The uploaded chunk files are removed; the original requests file stays
+    assert sorted(p.name for p in tmp_path.glob("requests*")) == ["requests.jsonl"]
+
+def test_run_batch_keeps_polling_after_a_failed_download(tmp_path):
+    import json
+    mock_client = MagicMock()
+    with patch('google.genai.Client', return_value=mock_client):
+        client = BatchClient(api_key="test_key")
+
+    requests_file = tmp_path / "requests.jsonl"
+    lines = [_request_line("2025-04-01", padding=50), _request_line("2025-04-02", padding=50)]
+    requests_file.write_text("".join(lines))
+
+    jobs = iter(["batches/job-1", "batches/job-2"])
+    def _submit(path, model):
+        job = MagicMock()
+        job.name = next(jobs)
+        return job
+
+    polls = {"batches/job-1": ["SUCCEEDED"], "batches/job-2": ["RUNNING", "SUCCEEDED"]}
+    def _get(name):
+        job = MagicMock()
+        job.name = name
+        job.state = f"JOB_STATE_{polls[name].pop(0)}"
+        job.dest.file_name = name.replace("batches/", "results/")
+        return job
+    mock_client.batches.get.side_effect = _get
+
+    def _download(file, destination):
+        if file.endswith("1"):
+            raise ConnectionError("connection reset")
+        Path(destination).write_text(json.dumps({"key": "2025-04-02", "response": {}}) + "\n")
+    mock_client.files.download.side_effect = _download
+
+    output = tmp_path / "responses.jsonl"
+    with patch.object(client, 'submit_batch', side_effect=_submit), patch('batch.client.time.sleep'):
+        states = client.run_batch(requests_file, output, max_chunk_bytes=len(lines[0]))
+
+    assert states == {"batches/job-1": "DOWNLOAD_FAILED", "batches/job-2": "SUCCEEDED"}
+    assert [json.loads(l)["key"] for l in output.read_text().splitlines()] == ["2025-04-02"]
+
+def test_run_batch_cancels_created_jobs_when_a_submit_fails(tmp_path):
+    mock_client = MagicMock()
+    with patch('google.genai.Client', return_value=mock_client):
+        client = BatchClient(api_key="test_key")
+
+    requests_file = tmp_path / "requests.jsonl"
+    lines = [_request_line("2025-04-01", padding=50), _request_line("2025-04-02", padding=50)]
+    requests_file.write_text("".join(lines))
+
+    def _submit(path, model):
+        if path.endswith("part002.jsonl"):
+            raise RuntimeError("upload failed")
+        job = MagicMock()
+        job.name = "batches/job-1"
+        return job
+
+    with patch.object(client, 'submit_batch', side_effect=_submit), pytest.raises(RuntimeError, match="upload failed"):
+        client.run_batch(requests_file, tmp_path / "responses.jsonl", max_chunk_bytes=len(lines[0]))
+
+    mock_client.batches.cancel.assert_called_once_with(name="batches/job-1")
+    mock_client.batches.get.assert_not_called()
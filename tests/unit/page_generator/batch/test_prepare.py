@@ -26,3 +26,64 @@ def test_build_request():
     assert "Test Player" in str(request)
     assert "Skeptical Storyteller" in str(request)
     assert "2025-04-01" in str(request)
+
+def _write_page(root, date_str, name):
+    (root / f"{date_str}.html").write_text(f"<html><body><h2>{name}</h2></body></html>", encoding="utf-8")
+
+def test_prepare_batch_parallel_writes_dossiers_and_checkpoints(tmp_path):
+    import json
+    from batch import prepare
+
+    (tmp_path / "page-generator" / "batch").mkdir(parents=True)
+    _write_page(tmp_path, "2025-04-01", "Scott Brosius")
+    _write_page(tmp_path, "2025-04-02", 'Don Mattingly "Donnie Baseball"')
+    _write_page(tmp_path, "2025-04-03", "Tony Kubek")
+
+    drivers = []
+    def _new_driver():
+        driver = MagicMock()
+        drivers.append(driver)
+        return driver
+
+    stats = {"career_totals": {"WAR": "1.0"}, "yearly_war": [], "transactions": [], "awards": []}
+    with patch.object(prepare.scraper, "get_driver", side_effect=_new_driver), \
+         patch.object(prepare.scraper, "search_and_scrape_player", return_value=stats), \
+         patch.object(prepare.scraper, "get_sabr_bio", return_value="word " * 600), \
+         patch.object(prepare.scraper, "get_mlb_bio") as mock_mlb, \
+         patch.object(prepare.HostScheduler, "wait", return_value=0):
+        prepare.prepare_batch(tmp_path, workers=3)
+
+    mock_mlb.assert_not_called()
+    state = json.loads((tmp_path / "page-generator" / "batch" / "state.json").read_text())
+    assert {d: e["status"] for d, e in state.items()} == {
+        "2025-04-01": "scraped", "2025-04-02": "scraped", "2025-04-03": "scraped"
+    }
+    assert state["2025-04-02"]["data"]["player"] == "Don Mattingly"
+
+    dossier = json.loads((tmp_path / "temp" / "dossiers" / "2025-04-03.json").read_text())
+    assert dossier["name"] == "Tony Kubek"
+    assert dossier["career_totals"] == {"WAR": "1.0"}
+
+    lines = (tmp_path / "temp" / "requests.jsonl").read_text().strip().split("\n")
+    assert len(lines) == 3
+    # Every worker driver is shut down at the end
+    assert drivers and all(d.quit.called for d in drivers)
+
+def test_prepare_batch_skips_checkpointed_dates(tmp_path):
+    import json
+    from batch import prepare
+
+    batch_dir = tmp_path / "page-generator" / "batch"
+    batch_dir.mkdir(parents=True)
+    (batch_dir / "state.json").write_text(json.dumps({"2025-04-01": {"status": "scraped"}}))
+    _write_page(tmp_path, "2025-04-01", "Scott Brosius")
+    _write_page(tmp_path, "2025-04-02", "Tony Kubek")
+
+    with patch.object(prepare.scraper, "get_driver", return_value=MagicMock()), \
+         patch.object(prepare.scraper, "search_and_scrape_player", return_value=None) as mock_scrape, \
+         patch.object(prepare.scraper, "get_sabr_bio", return_value=""), \
+         patch.object(prepare.scraper, "get_mlb_bio", return_value=None), \
+         patch.object(prepare.HostScheduler, "wait", return_value=0):
+        prepare.prepare_batch(tmp_path, workers=2)
+
+    assert [c.args[0] for c in mock_scrape.call_args_list] == ["Tony Kubek"]
@@ -0,0 +1,102 @@
+# ABOUTME: Unit tests for the batch self-correction loop.
+# ABOUTME: Verifies work prioritization, concurrent correction and clean stops on daily quota.
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Ensure page-generator is in sys.path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent / "page-generator"))
+
+from ai_services import GeminiDailyQuotaExceeded
+from batch import self_correct
+
+GOOD_RESULT = {
+    "facts": ["Hint one.", "Hint two.", "Hint three."],
+    "qa": [{"question": "Q?", "answer": "A."}],
+    "claims": []
+}
+
+def _make_corrector(tmp_path, state, workers=1):
+    batch_dir = tmp_path / "page-generator" / "batch"
+    batch_dir.mkdir(parents=True)
+    (batch_dir / "state.json").write_text(json.dumps(state))
+    dossier_dir = tmp_path / "temp" / "dossiers"
+    dossier_dir.mkdir(parents=True)
+    for date_str in state:
+        if date_str != "2025-04-09":  # leave one date without a dossier
+            (dossier_dir / f"{date_str}.json").write_text(json.dumps({"name": "Player"}))
+        (tmp_path / f"{date_str}.html").write_text("<html><body><div class='player-info'><h2>Player</h2></div></body></html>")
+
+    with patch.object(self_correct.config_manager, "load_config", return_value={"gemini_api_key": "test"}), \
+         patch.object(self_correct.genai, "Client"):
+        return self_correct.SelfCorrector(tmp_path, workers=workers)
+
+def test_work_queue_orders_by_likely_success(tmp_path):
+    state = {
+        "2025-04-01": {"status": "scraped", "data": {"player": "Never Tried"}},
+        "2025-04-02": {"status": "failed", "data": {"player": "Many Bad", "last_failure": {"reason": "verification", "bad_claims": 4}}},
+        "2025-04-03": {"status": "failed", "data": {"player": "One Bad", "last_failure": {"reason": "verification", "bad_claims": 1}}},
+        "2025-04-04": {"status": "completed", "data": {"player": "Done"}},
+        "2025-04-05": {"status": "failed", "data": {"player": "Apply Failure"}},
+        "2025-04-06": {"status": "scraped", "data": {"player": "Spoiler", "last_failure": {"reason": "quality"}}},
+        "2025-04-09": {"status": "scraped", "data": {"player": "No Dossier"}},
+    }
+    corrector = _make_corrector(tmp_path, state)
+
+    assert corrector.build_work_queue() == [
+        "2025-04-03", "2025-04-02", "2025-04-05", "2025-04-01", "2025-04-06", "2025-04-09"
+    ]
+
+def test_concurrent_run_completes_all_dates(tmp_path):
+    state = {f"2025-04-0{i}": {"status": "failed", "data": {"player": "Player"}} for i in range(1, 5)}
+    corrector = _make_corrector(tmp_path, state, workers=3)
+
+    with patch.object(self_correct, "generate_grounded_trivia", return_value=GOOD_RESULT):
+        corrector.run()
+
+    saved = json.loads(corrector.state_file.read_text())
+    assert all(entry["status"] == "completed" for entry in saved.values())
+
+def test_concurrent_run_stops_at_limit(tmp_path):
+    state = {f"2025-04-0{i}": {"status": "failed", "data": {"player": "Player"}} for i in range(1, 8)}
+    corrector = _make_corrector(tmp_path, state, workers=4)
+
+    with patch.object(self_correct, "generate_grounded_trivia", return_value=GOOD_RESULT) as mock_gen:
+        corrector.run(limit=2)
+
+    saved = json.loads(corrector.state_file.read_text())
+    assert sum(entry["status"] == "completed" for entry in saved.values()) == 2
+    assert mock_gen.call_count == 2
+
+def test_run_stops_cleanly_on_daily_quota(tmp_path):
+    state = {f"2025-04-0{i}": {"status": "failed", "data": {"player": "Player"}} for i in range(1, 5)}
+    corrector = _make_corrector(tmp_path, state)
+
+    responses = [GOOD_RESULT, GeminiDailyQuotaExceeded("quota")]
+    with patch.object(self_correct, "generate_grounded_trivia", side_effect=responses) as mock_gen:
+        corrector.run()
+
+    assert mock_gen.call_count == 2
+    saved = json.loads(corrector.state_file.read_text())
+    assert saved["2025-04-01"]["status"] == "completed"
+    # The interrupted and untouched dates keep their state for the next run
+    assert saved["2025-04-02"] == {"status": "failed", "data": {"player": "Player"}}
+    assert saved["2025-04-03"]["status"] == "failed"
+
+def test_failed_correction_records_bad_claim_count(tmp_path):
+    state = {"2025-04-01": {"status": "scraped", "data": {"player": "Player"}}}
+    corrector = _make_corrector(tmp_path, state)
+
+    result = dict(GOOD_RESULT, claims=["He debuted in 1999.", "He hit 12 homers in 1999."])
+    with patch.object(self_correct, "generate_grounded_trivia", return_value=result):
+        assert corrector.correct_player("2025-04-01", "Player", {"name": "Player"}) is False
+
+    saved = json.loads(corrector.state_file.read_text())
+    assert saved["2025-04-01"]["data"] == {
+        "player": "Player",
+        "last_failure": {"reason": "verification", "bad_claims": 2}
+    }
@@ -24,3 +24,18 @@ def test_state_management():
         new_manager = StateManager(state_path)
         assert new_manager.get_status("2025-04-01") == "scraped"
         assert new_manager.get_data("2025-04-01")["player"] == "Don Mattingly"
+
+def test_host_scheduler_spaces_same_host():
+    from batch.utils import HostScheduler
+    from unittest.mock import patch
+
+    scheduler = HostScheduler({"sabr.org": 5.0})
+    with patch("rate_limiter.time.monotonic", return_value=100.0), \
+         patch("rate_limiter.time.sleep") as mock_sleep:
+        assert scheduler.wait("sabr.org") == 0
+        assert scheduler.wait("sabr.org") == 5.0
+        assert scheduler.wait("sabr.org") == 10.0
+        # Other hosts get their own independent slots
+        assert scheduler.wait("mlb.com") == 0
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [5.0, 10.0]
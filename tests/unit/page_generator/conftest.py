@@ -0,0 +1,14 @@
+# ABOUTME: Shared fixtures for the page-generator unit tests.
+# ABOUTME: Provides a factory for the small puzzle images the image manifest and variant tests write.
+import pytest
+from PIL import Image
+
+
+@pytest.fixture
+def write_webp():
+    """Returns a function that saves a solid-color WebP of the given size to path and returns the image."""
+    def write(path, size, color='navy'):
+        img = Image.new('RGB', size, color=color)
+        img.save(path, 'WEBP')
+        return img
+    return write
@@ -4,10 +4,13 @@ import json
 from bs4 import BeautifulSoup
 import sys
 import os
+from unittest.mock import patch
 
 # Add page-generator to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../page-generator')))
+import html_generator
 from html_generator import rebuild_index_page
+from stats_summary import content_version, load_stats_summary
 
 def test_rebuild_index_persists_html_without_metadata(tmp_path: Path):
     """
@@ -60,3 +63,154 @@ def test_rebuild_index_handles_missing_index_gracefully(tmp_path: Path, capsys):
     
     captured = capsys.readouterr()
     assert "Error: index.html not found" in captured.out
+
+def _make_project(tmp_path: Path, dates):
+    project_dir = tmp_path / "project"
+    (project_dir / "images").mkdir(parents=True)
+    (project_dir / "index.html").write_text('<div class="gallery"></div>', encoding='utf-8')
+    for date_str in dates:
+        (project_dir / "images" / f"clue-{date_str}.webp").write_text("fake image data")
+        _write_detail_page(project_dir, date_str, "Scott Brosius", ["NYY"])
+    return project_dir
+
+def _write_detail_page(project_dir: Path, date_str: str, name: str, teams):
+    search_data = json.dumps({"teams": teams, "years": ["1998"]})
+    (project_dir / f"{date_str}.html").write_text(
+        f'<h2>{name}</h2><div id="search-data" style="display:none;">{search_data}</div>', encoding='utf-8')
+
+def test_rebuild_index_reparses_only_changed_pages(tmp_path: Path):
+    """A second rebuild reuses manifest metadata and only re-parses the edited detail page."""
+    project_dir = _make_project(tmp_path, ["2026-04-20", "2026-04-21"])
+    rebuild_index_page(project_dir)
+
+    _write_detail_page(project_dir, "2026-04-21", "Tony Kubek", ["NYY"])
+    with patch('html_generator.extract_page_metadata', wraps=html_generator.extract_page_metadata) as extract:
+        rebuild_index_page(project_dir)
+
+    assert extract.call_count == 1
+    stats = load_stats_summary(project_dir / "stats_summary.json")
+    assert [s['name'] for s in stats] == ["Tony Kubek", "Scott Brosius"]
+
+def test_rebuild_index_skips_identical_output(tmp_path: Path):
+    """When nothing changed, index.html and stats_summary.json are not rewritten."""
+    project_dir = _make_project(tmp_path, ["2026-04-20"])
+    rebuild_index_page(project_dir)
+    index_mtime = (project_dir / "index.html").stat().st_mtime_ns
+    stats_mtime = (project_dir / "stats_summary.json").stat().st_mtime_ns
+
+    with patch('html_generator.BeautifulSoup', wraps=html_generator.BeautifulSoup) as soup:
+        rebuild_index_page(project_dir)
+
+    soup.assert_not_called()
+    assert (project_dir / "index.html").stat().st_mtime_ns == index_mtime
+    assert (project_dir / "stats_summary.json").stat().st_mtime_ns == stats_mtime
+
+def test_rebuild_index_restores_hand_edited_index(tmp_path: Path):
+    """A hand-edited index.html is rebuilt even when no detail page changed."""
+    project_dir = _make_project(tmp_path, ["2026-04-20"])
+    rebuild_index_page(project_dir)
+    expected = (project_dir / "index.html").read_text(encoding='utf-8')
+
+    (project_dir / "index.html").write_text('<div class="gallery"></div>', encoding='utf-8')
+    rebuild_index_page(project_dir)
+
+    assert (project_dir / "index.html").read_text(encoding='utf-8') == expected
+
+def test_rebuild_index_splices_prettified_index_without_parsing(tmp_path: Path):
+    """Once index.html is in prettified form, adding a puzzle splices tiles as text and matches a full re-render."""
+    project_dir = _make_project(tmp_path, ["2026-04-20"])
+    rebuild_index_page(project_dir)
+
+    (project_dir / "images" / "clue-2026-04-21.webp").write_text("fake image data")
+    _write_detail_page(project_dir, "2026-04-21", "Tony Kubek", ["NYY", "BOS"])
+    with patch('html_generator.normalize_index_page') as normalize:
+        rebuild_index_page(project_dir)
+    normalize.assert_not_called()
+
+    spliced = (project_dir / "index.html").read_text(encoding='utf-8')
+    (project_dir / "index.html").write_text('<div class="gallery"></div>', encoding='utf-8')
+    rebuild_index_page(project_dir)
+    assert (project_dir / "index.html").read_text(encoding='utf-8') == spliced
+
+def test_gallery_snippet_matches_prettified_markup():
+    """Tiles are emitted exactly as BeautifulSoup would prettify them, including attribute escaping."""
+    for terms in ['plain terms', 'with "quotes" & <tags>', "both \"double\" and 'single'"]:
+        snippet = html_generator.generate_gallery_snippet(7, "2026-04-20", "April 20, 2026", terms)
+        assert BeautifulSoup(snippet, 'html.parser').prettify().rstrip("\n") == snippet
+
+def test_rebuild_index_sharded_keeps_first_page_constant(tmp_path: Path):
+    """In sharded mode index.html holds only the newest tiles; older ones go to month shards named in stats_summary."""
+    project_dir = _make_project(tmp_path, ["2026-03-30", "2026-03-31", "2026-04-01", "2026-04-02"])
+    rebuild_index_page(project_dir, archive_mode="sharded", static_tiles=2)
+    first_page = (project_dir / "index.html").read_text(encoding='utf-8')
+
+    assert "2026-04-02?reveal=true" in first_page and "2026-04-01?reveal=true" in first_page
+    assert "2026-03-31?reveal=true" not in first_page
+    shard = (project_dir / "archive" / "2026-03.html").read_text(encoding='utf-8')
+    assert shard.index("2026-03-31?reveal=true") < shard.index("2026-03-30?reveal=true")
+    stats = load_stats_summary(project_dir / "stats_summary.json")
+    assert [s.get('shard') for s in stats] == [None, None, "2026-03", "2026-03"]
+
+    (project_dir / "images" / "clue-2026-04-03.webp").write_text("fake image data")
+    _write_detail_page(project_dir, "2026-04-03", "Tony Kubek", ["NYY"])
+    rebuild_index_page(project_dir, archive_mode="sharded", static_tiles=2)
+
+    assert len((project_dir / "index.html").read_text(encoding='utf-8')) == len(first_page)
+    assert sorted(p.name for p in (project_dir / "archive").glob("*.html")) == ["2026-03.html", "2026-04.html"]
+    assert "2026-04-01?reveal=true" in (project_dir / "archive" / "2026-04.html").read_text(encoding='utf-8')
+
+def test_rebuild_index_full_mode_removes_stale_shards(tmp_path: Path):
+    """Switching back to full mode puts every tile in index.html and deletes the shard fragments."""
+    project_dir = _make_project(tmp_path, ["2026-03-31", "2026-04-01"])
+    rebuild_index_page(project_dir, archive_mode="sharded", static_tiles=1)
+    assert (project_dir / "archive" / "2026-03.html").exists()
+
+    rebuild_index_page(project_dir)
+
+    assert "2026-03-31?reveal=true" in (project_dir / "index.html").read_text(encoding='utf-8')
+    assert list((project_dir / "archive").iterdir()) == []
+    stats = load_stats_summary(project_dir / "stats_summary.json")
+    assert all('shard' not in s for s in stats)
+
+def test_load_archive_settings_reads_site_section(tmp_path: Path):
+    assert html_generator.load_archive_settings(tmp_path) == ("full", html_generator.DEFAULT_STATIC_TILES)
+    (tmp_path / "automation_config.json").write_text(json.dumps({"site": {"archive_mode": "sharded", "static_tiles": 12}}))
+    assert html_generator.load_archive_settings(tmp_path) == ("sharded", 12)
+
+def test_rebuild_index_writes_search_index(tmp_path: Path):
+    """search_index.json maps tokens to sorted puzzle ids (positions in stats_summary) and records the static count."""
+    project_dir = _make_project(tmp_path, ["2026-03-31", "2026-04-01", "2026-04-02"])
+    _write_detail_page(project_dir, "2026-04-01", "Tony Kubek", ["NYY", "BAL"])
+    rebuild_index_page(project_dir, archive_mode="sharded", static_tiles=2)
+
+    index = json.loads((project_dir / "search_index.json").read_text(encoding='utf-8'))
+    stats = load_stats_summary(project_dir / "stats_summary.json")
+    assert index['dates'] == [s['date'] for s in stats] == ["2026-04-02", "2026-04-01", "2026-03-31"]
+    assert index['static'] == 2
+    assert index['teams'] == {"BAL": [1], "NYY": [0, 1, 2]}
+    assert index['names']['kubek'] == [1] and index['names']['brosius'] == [0, 2]
+    assert index['months'] == {"03": [2], "04": [0, 1]}
+    assert index['exact']['1'] == [1] and index['exact']['01'] == [1] and index['exact']['1998'] == [0, 1, 2]
+    assert index['decades']['90s'] == index['decades']['1990s'] == [0, 1, 2]
+
+def test_rebuild_index_versions_data_files(tmp_path: Path):
+    """Data files are minified and columnar; the pages that fetch them carry their content hash."""
+    project_dir = _make_project(tmp_path, ["2026-04-20", "2026-04-21"])
+    (project_dir / "index.html").write_text(
+        '<meta content="" name="search-index-version"/>\n<div class="gallery">\n</div>', encoding='utf-8')
+    (project_dir / "analytics.html").write_text('<meta name="stats-summary-version" content="">', encoding='utf-8')
+    rebuild_index_page(project_dir)
+
+    stats_text = (project_dir / "stats_summary.json").read_text(encoding='utf-8')
+    stats = json.loads(stats_text)
+    assert "\n" not in stats_text and stats['team_table'] == ["NYY"] and stats['years'] == [[1998], [1998]]
+    version = content_version(stats_text)
+    assert f'content="{version}"' in (project_dir / "analytics.html").read_text(encoding='utf-8')
+    search_version = content_version((project_dir / "search_index.json").read_text(encoding='utf-8'))
+    assert f'<meta content="{search_version}" name="search-index-version"/>' in (project_dir / "index.html").read_text(encoding='utf-8')
+
+    # A rebuild that changes the data also moves the versions
+    _write_detail_page(project_dir, "2026-04-21", "Tony Kubek", ["NYY"])
+    rebuild_index_page(project_dir)
+    assert content_version((project_dir / "stats_summary.json").read_text(encoding='utf-8')) != version
+    assert search_version not in (project_dir / "index.html").read_text(encoding='utf-8')
@@ -0,0 +1,104 @@
+# ABOUTME: Unit tests for the audit dashboard's incremental log tail, file cache and failures API.
+# ABOUTME: Verifies only appended log bytes are parsed and the verdict store is reloaded only when it changes.
+import os
+from unittest.mock import MagicMock
+
+import audit_dashboard  # type: ignore
+from audit_dashboard import FileCache, LogTail  # type: ignore
+from audit_store import AuditStore  # type: ignore
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_log_tail_counts_only_appended_lines(tmp_path):
+    log = tmp_path / "audit.log"
+    _append(log, "Phase 1: Checking identity for Scott Brosius (1998-05-01)...\nPhase 2: ok\n")
+    tail = LogTail(log)
+    tail.update()
+    assert tail.processed == 1
+    assert tail.current_player == "Scott Brosius"
+
+    first_offset = tail.offset
+    _append(log, "Phase 1: Checking identity for Tony Kubek (1998-05-02)...\n")
+    tail.update()
+    assert tail.processed == 2
+    assert tail.current_player == "Tony Kubek"
+    assert tail.offset > first_offset
+
+    tail.update()
+    assert tail.processed == 2
+
+
+def test_log_tail_buffers_partial_lines(tmp_path):
+    log = tmp_path / "audit.log"
+    _append(log, "Phase 1: Checking identity for Scott Bro")
+    tail = LogTail(log)
+    tail.update()
+    assert tail.processed == 0
+
+    _append(log, "sius (1998-05-01)...\n")
+    tail.update()
+    assert tail.processed == 1
+    assert tail.current_player == "Scott Brosius"
+
+
+def test_log_tail_resets_when_log_is_truncated(tmp_path):
+    log = tmp_path / "audit.log"
+    _append(log, "Phase 1: Checking identity for A (1)\nPhase 1: Checking identity for B (2)\n")
+    tail = LogTail(log)
+    tail.update()
+    assert tail.processed == 2
+
+    log.write_text("Phase 1: Checking identity for C (3)\n", encoding="utf-8")
+    tail.update()
+    assert tail.processed == 1
+    assert tail.current_player == "C"
+
+
+def test_file_cache_reloads_only_on_change(tmp_path):
+    path = tmp_path / "fact_audit_results.jsonl"
+    loader = MagicMock(side_effect=lambda: path.read_text() if path.exists() else "")
+    cache = FileCache(path, loader)
+
+    assert cache.get() == ""
+    path.write_text("one", encoding="utf-8")
+    assert cache.get() == "one"
+    assert cache.get() == "one"
+    assert loader.call_count == 2
+
+    path.write_text("two!", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get() == "two!"
+    assert loader.call_count == 3
+
+
+def _mismatch(date, name, failures=()):
+    return {"date": date, "name": name, "p1_match": False, "p1_predicted": "Someone Else", "reasoning": "",
+            "failures": [{"fact": f, "is_accurate": False, "reasoning": "Wrong", "source": "bref"} for f in failures]}
+
+
+def test_failures_api_filters_and_paginates(tmp_path, monkeypatch):
+    store = AuditStore(tmp_path / "results.jsonl")
+    store.record(_mismatch("2025-04-01", "Scott Brosius", ["Won the 1983 Cy Young Award."]), "a")
+    store.record(_mismatch("2025-04-02", "Tony Kubek"), "b")
+    store.record(_mismatch("2025-05-01", "Tippy Martinez", ["Made the 1983 All-Star team."]), "c")
+    store.record({**_mismatch("2025-05-02", "Gary Roenicke"), "p1_match": True}, "d")
+    monkeypatch.setattr(audit_dashboard, "STORE_CACHE", FileCache(store.path, lambda: AuditStore(store.path)))
+
+    everything = audit_dashboard.query_failures("")
+    assert everything["total"] == 3
+    assert [f["date"] for f in everything["failures"]] == ["2025-05-01", "2025-04-02", "2025-04-01"]
+
+    april = audit_dashboard.query_failures("date=2025-04&type=debunked")
+    assert [f["name"] for f in april["failures"]] == ["Scott Brosius"]
+    assert april["failures"][0]["debunked"][0]["text"] == "Won the 1983 Cy Young Award."
+
+    assert [f["name"] for f in audit_dashboard.query_failures("player=kubek")["failures"]] == ["Tony Kubek"]
+
+    second_page = audit_dashboard.query_failures("offset=2&limit=2")
+    assert second_page["total"] == 3
+    assert [f["date"] for f in second_page["failures"]] == ["2025-04-01"]
@@ -18,6 +18,9 @@ from automation.automated_workflow import AutomatedWorkflow
 from automation.image_processor import ImageProcessor
 from automation.player_image_search import PlayerImageSearch
 from automation.git_integration import GitIntegration
+from image_manifest import load_image_manifest
+from image_quality import policy_key
+from image_variants import current_variants, variant_files
 
 
 class TestAutomatedWorkflow:
@@ -229,17 +232,54 @@ class TestAutomatedWorkflow:
             assert player_info['facts'] == []
             assert player_info['followup_qa'] == []
 
-    def test_find_player_image_success(self, automated_workflow, temp_dir):
-        """Test successful player image finding."""
+    def test_find_player_image_success(self, automated_workflow, temp_dir, images_dir):
+        """Test that the search is asked to write the best candidate as the answer image."""
         mock_file = temp_dir / "answer.webp"
-        mock_file.touch()
-        with patch.object(automated_workflow.player_image_search, 'download_and_process_player_image') as mock_download:
-            mock_download.return_value = [mock_file]
-            
+        
+        def _download(player_name, date_str, api_key, answer_path):
+            Image.new('RGB', (400, 600), color='navy').save(answer_path, 'WEBP')
+            return [mock_file]
+        
+        with patch.object(automated_workflow.player_image_search, 'download_and_process_player_image', side_effect=_download):
             result = automated_workflow._find_player_image("Test Player", "2025-03-06")
             
-            assert result is not None
-            assert result.name == "answer-2025-03-06.webp"
+            assert result == images_dir / "answer-2025-03-06.webp"
+
+    def test_answer_image_flow_writes_variants_and_stages_them(self, automated_workflow, temp_dir, images_dir):
+        """Test a searched answer image from download to commit: encoded once with variants, all of them staged in git."""
+        import io
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 1200), color='navy').save(buffer, 'JPEG')
+        search = automated_workflow.player_image_search
+        with patch.object(search, '_get_image_candidates_from_bing') as mock_bing, \
+             patch.object(search, '_get_image_candidates_from_google') as mock_google, \
+             patch.object(search, '_download_image_bytes') as mock_download, \
+             patch('ai_services.analyze_player_image') as mock_analyze:
+            mock_bing.return_value = [{'direct_url': 'url', 'source_page': 'page'}]
+            mock_google.return_value = []
+            mock_download.return_value = buffer.getvalue()
+            mock_analyze.return_value = {'priority': 1}
+            
+            with patch.object(ImageProcessor, 'convert_to_webp') as mock_convert:
+                answer_path = automated_workflow._find_player_image("Test Player", "2025-03-06")
+        
+        assert answer_path == images_dir / "answer-2025-03-06.webp"
+        # Encoded from the decoded download under the answer policy, never from the staged q85 copy
+        mock_convert.assert_not_called()
+        entry = load_image_manifest(images_dir)[answer_path.name]
+        assert entry["quality_audit"]["policy"] == policy_key("answer")
+        assert not (temp_dir / "temp_player_images" / "image_manifest.json").exists()
+        variants = current_variants(entry)
+        assert variants is not None
+        files = variant_files(answer_path.name, variants['widths'])
+        assert all((images_dir / f).is_file() for f in files)
+        
+        (temp_dir / "2025-03-06.html").touch()
+        with patch.object(automated_workflow.git_integration, 'add_files') as mock_add, \
+             patch.object(automated_workflow.git_integration, 'commit'):
+            assert automated_workflow._perform_git_operations("2025-03-06") is True
+        staged = {Path(f).relative_to(images_dir).as_posix() for f in mock_add.call_args[0][0] if Path(f).parent != temp_dir}
+        assert staged == {answer_path.name, "image_manifest.json", *files}
 
     def test_find_player_image_unknown_player(self, automated_workflow):
         """Test player image finding for 'Unknown' player."""
@@ -0,0 +1,62 @@
+# ABOUTME: Unit tests for the career chart data island and the migration off inline chart scripts.
+# ABOUTME: Verifies migrated pages keep their chart data and that migration is idempotent.
+import json
+
+import career_chart  # type: ignore
+import html_generator  # type: ignore
+import puzzle_store  # type: ignore
+
+YEARLY_WAR = [
+    {"year": "1997", "teams": ["OAK"], "display_team": "OAK", "war": -0.1},
+    {"year": "1998", "teams": ["NYY"], "display_team": "NYY", "war": 5.3},
+]
+PLAYER_DATA = {"name": "Scott Brosius", "facts": ["Won the 1998 World Series MVP."], "yearly_war": YEARLY_WAR}
+
+INLINE_PAGE = """<html><body>
+    <canvas id="careerArcChart"></canvas>
+    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.5.1"></script>
+    <script>
+      const years = ["1997", "1998"];
+            const warData = [-0.1, 5.3];
+            const teamsByYear = ["OAK", "NYY"];
+            const teamColors = { 'NYY': { bg: 'x', border: 'y', name: 'Yankees' } };
+            new Chart(ctx, {});
+    </script>
+    <script type="module" src="js/detail.js"></script>
+</body></html>"""
+
+
+def _island(html_text):
+    start = html_text.index(f'id="{career_chart.CHART_DATA_ID}">') + len(f'id="{career_chart.CHART_DATA_ID}">')
+    return json.loads(html_text[start:html_text.index("</script>", start)])
+
+
+def test_detail_page_uses_data_island_instead_of_inline_script():
+    html_text = html_generator.build_detail_page_html(PLAYER_DATA, "2025-04-01", "April 01, 2025")
+    assert "const warData" not in html_text
+    assert _island(html_text) == {"years": ["1997", "1998"], "war": [-0.1, 5.3], "teams": ["OAK", "NYY"]}
+    assert '<script type="module" src="js/careerChart.js"></script>' in html_text
+
+
+def test_migrate_page_replaces_inline_script_once():
+    migrated = career_chart.migrate_page(INLINE_PAGE)
+
+    assert "const teamColors" not in migrated
+    assert _island(migrated) == {"years": ["1997", "1998"], "war": [-0.1, 5.3], "teams": ["OAK", "NYY"]}
+    # Pages that carried their own color map gain the shared one
+    assert migrated.index("js/team_colors.js") < migrated.index("js/careerChart.js") < migrated.index("js/detail.js")
+    assert puzzle_store.record_from_html(migrated, "2025-04-01")["yearly_war"] == \
+        puzzle_store.record_from_html(INLINE_PAGE, "2025-04-01")["yearly_war"]
+    assert career_chart.migrate_page(migrated) is None
+
+
+def test_migrate_pages_reports_savings_and_only_writes_with_apply(tmp_path, capsys):
+    (tmp_path / "2025-04-01.html").write_text(INLINE_PAGE, encoding="utf-8")
+
+    totals = career_chart.migrate_pages(tmp_path)
+    assert totals["migrated"] == 1 and totals["before"] > totals["after"]
+    assert (tmp_path / "2025-04-01.html").read_text(encoding="utf-8") == INLINE_PAGE
+    assert "Would migrate 1 of 1 pages" in capsys.readouterr().out
+
+    career_chart.migrate_pages(tmp_path, apply=True)
+    assert career_chart.migrate_pages(tmp_path)["migrated"] == 0
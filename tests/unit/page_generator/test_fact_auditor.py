@@ -0,0 +1,215 @@
+# ABOUTME: Unit tests for the two-phase fact auditor and its verdict store.
+# ABOUTME: Verifies that unchanged puzzles are skipped and edited puzzles are re-audited.
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest  # type: ignore
+
+import fact_auditor  # type: ignore
+from audit_store import AuditStore, content_hash  # type: ignore
+
+PAGE_TEMPLATE = """<html><body>
+<div class="player-info"><h2>{name}</h2><ul><li>{fact}</li></ul>
+<button class="followup-btn" data-answer="An answer.">Q?</button></div>
+</body></html>"""
+
+
+def _write_page(directory, date_str, name="Scott Brosius", fact="Won the 1998 World Series MVP."):
+    path = directory / f"{date_str}.html"
+    path.write_text(PAGE_TEMPLATE.format(name=name, fact=fact), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def auditor(tmp_path, monkeypatch):
+    monkeypatch.setattr(fact_auditor, "PROJECT_DIR", tmp_path)
+    monkeypatch.setattr(fact_auditor, "REPORT_PATH", tmp_path / "FACT_AUDIT_REPORT.md")
+    monkeypatch.setattr(fact_auditor, "VERIFICATION_REPORT_PATH", tmp_path / "BATCH_VERIFICATION_REPORT.md")
+    monkeypatch.setattr(fact_auditor, "BATCH_DIR", tmp_path / "temp" / "audit_batch")
+    with patch.object(fact_auditor.genai, "Client"):
+        auditor = fact_auditor.FactAuditor("test", store=AuditStore(tmp_path / "results.jsonl"))
+    auditor.run_phase_1 = MagicMock(return_value={"is_match": True, "predicted_name": "Scott Brosius", "reasoning": ""})
+    auditor.run_phase_2 = MagicMock(return_value=[])
+    return auditor
+
+
+def test_content_hash_covers_name_and_facts():
+    base = {"name": "Scott Brosius", "facts": ["A", "B"]}
+    assert content_hash(base) == content_hash(dict(base))
+    assert content_hash(base) != content_hash({"name": "Scott Brosius", "facts": ["A", "C"]})
+    assert content_hash(base) != content_hash({"name": "Tony Kubek", "facts": ["A", "B"]})
+
+
+def test_audit_all_skips_unchanged_pages(auditor, tmp_path):
+    _write_page(tmp_path, "2025-04-01")
+    _write_page(tmp_path, "2025-04-02", name="Tony Kubek")
+
+    auditor.audit_all()
+    assert auditor.run_phase_1.call_count == 2
+
+    # A second run over the same archive costs nothing
+    auditor.audit_all()
+    assert auditor.run_phase_1.call_count == 2
+
+    # Adding one puzzle and editing another audits exactly those two
+    _write_page(tmp_path, "2025-04-03", name="Tim Foli")
+    _write_page(tmp_path, "2025-04-01", fact="Hit two homers in the 1998 World Series.")
+    auditor.audit_all()
+    audited = [c.args[0]['date'] for c in auditor.run_phase_1.call_args_list[2:]]
+    assert sorted(audited) == ["2025-04-01", "2025-04-03"]
+
+
+def test_store_persists_across_instances(auditor, tmp_path):
+    _write_page(tmp_path, "2025-04-01")
+    auditor.audit_all()
+
+    reloaded = AuditStore(tmp_path / "results.jsonl")
+    record = reloaded.get("2025-04-01")
+    assert record["p1_match"] is True
+    assert reloaded.is_current("2025-04-01", record["content_hash"])
+
+
+def test_api_errors_are_not_cached(auditor, tmp_path):
+    _write_page(tmp_path, "2025-04-01")
+    auditor.run_phase_1.return_value = {"is_match": True, "predicted_name": "Error"}
+
+    auditor.audit_all()
+    auditor.audit_all()
+
+    assert auditor.run_phase_1.call_count == 2
+    assert auditor.store.get("2025-04-01") is None
+
+
+def test_force_reaudits_unchanged_pages(auditor, tmp_path):
+    _write_page(tmp_path, "2025-04-01")
+    auditor.audit_all()
+    auditor.audit_all(force=True)
+    assert auditor.run_phase_1.call_count == 2
+
+
+def test_concurrent_audit_covers_every_page(auditor, tmp_path):
+    for day in range(1, 7):
+        _write_page(tmp_path, f"2025-04-0{day}", name=f"Player {day}")
+
+    auditor.audit_all(workers=3)
+
+    assert auditor.run_phase_1.call_count == 6
+    assert sorted(auditor.store.records) == [f"2025-04-0{day}" for day in range(1, 7)]
+
+
+class FakeBatchClient:
+    """Answers batch requests from canned per-key responses instead of the Batch API."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.submitted = []
+
+    def run_batch(self, jsonl_path, output_path, model=None):
+        keys = [json.loads(line)["key"] for line in open(jsonl_path, encoding="utf-8")]
+        self.submitted.append(keys)
+        with open(output_path, "w", encoding="utf-8") as f:
+            for key in keys:
+                text = json.dumps(self.answers[key])
+                f.write(json.dumps({"key": key, "response": {"candidates": [{"content": {"parts": [{"text": text}]}}]}}) + "\n")
+
+
+def test_batch_mode_only_sends_mismatches_to_phase_2(auditor, tmp_path):
+    _write_page(tmp_path, "2025-04-01")
+    _write_page(tmp_path, "2025-04-02", name="Tony Kubek", fact="Won the 1983 Cy Young Award.")
+    fake = FakeBatchClient({
+        "2025-04-01": {"primary_identity": "Scott Brosius", "is_fully_consistent": True},
+        "2025-04-02": {"primary_identity": "LaMarr Hoyt", "is_fully_consistent": False, "reasoning": "Cy Young"},
+        "2025-04-02#0": [{"fact": "Won the 1983 Cy Young Award.", "is_accurate": False, "reasoning": "Hoyt won it", "source": "bref"}],
+        "2025-04-02#1": [{"fact": "An answer.", "is_accurate": True, "reasoning": "", "source": ""}],
+    })
+
+    auditor.audit_all_batch(batch_client=fake)
+
+    assert fake.submitted == [["2025-04-02", "2025-04-01"], ["2025-04-02#0", "2025-04-02#1"]]
+    auditor.run_phase_1.assert_not_called()
+    record = auditor.store.get("2025-04-02")
+    assert record["p1_match"] is False
+    assert [f["fact"] for f in record["failures"]] == ["Won the 1983 Cy Young Award."]
+    assert "Tony Kubek (2025-04-02)" in (tmp_path / "FACT_AUDIT_REPORT.md").read_text()
+    assert auditor.store.get("2025-04-01")["p1_match"] is True
+
+
+def test_report_is_rendered_from_store_without_duplicates(auditor, tmp_path):
+    path = _write_page(tmp_path, "2025-04-01")
+    auditor.run_phase_1.return_value = {"is_match": False, "predicted_name": "Tony Kubek", "reasoning": "Yankees"}
+
+    auditor.audit_file(path)
+    auditor.audit_file(path, force=True)
+    report = (tmp_path / "FACT_AUDIT_REPORT.md").read_text()
+    assert report.count("### ❌ Scott Brosius (2025-04-01)") == 1
+
+    auditor.run_phase_1.return_value = {"is_match": True, "predicted_name": "Scott Brosius", "reasoning": ""}
+    auditor.audit_file(path, force=True)
+    assert "Scott Brosius" not in (tmp_path / "FACT_AUDIT_REPORT.md").read_text()
+
+
+def test_import_legacy_report_moves_sections(auditor, tmp_path):
+    (tmp_path / "FACT_AUDIT_REPORT.md").write_text(
+        "# Player Fact Audit Report\nStarted on: 2026-05-15 15:39:45\n\n"
+        "### ❌ Tony Kubek (2025-04-02)\n"
+        "- **Phase 1 Prediction:** LaMarr Hoyt\n"
+        "- **Debunked Facts:**\n"
+        "  - **Fact:** Won the 1983 Cy Young Award.\n"
+        "    - **Reason:** Hoyt won it\n"
+        "    - **Source:** [bref](bref)\n\n"
+        "## 2025-03-29 - James Edward Key\nFact verification failed for the following claims:\n- A claim\n\n",
+        encoding="utf-8")
+
+    assert fact_auditor.import_legacy_report(auditor.store) == 1
+
+    record = auditor.store.get("2025-04-02")
+    assert record["p1_predicted"] == "LaMarr Hoyt"
+    assert record["failures"][0] == {"fact": "Won the 1983 Cy Young Award.", "is_accurate": False, "reasoning": "Hoyt won it", "source": "bref"}
+    assert record["content_hash"] == ""
+    assert "## 2025-03-29 - James Edward Key" in (tmp_path / "BATCH_VERIFICATION_REPORT.md").read_text()
+    assert "James Edward Key" not in (tmp_path / "FACT_AUDIT_REPORT.md").read_text()
+    assert "### ❌ Tony Kubek (2025-04-02)" in (tmp_path / "FACT_AUDIT_REPORT.md").read_text()
+
+
+def test_first_mismatch_keeps_entries_of_existing_report(auditor, tmp_path):
+    (tmp_path / "FACT_AUDIT_REPORT.md").write_text(
+        "# Player Fact Audit Report\nStarted on: 2026-05-15 15:39:45\n\n"
+        "### ❌ Tony Kubek (2025-04-02)\n"
+        "- **Phase 1 Prediction:** LaMarr Hoyt\n"
+        "- *No specific facts debunked in Phase 2 (potential false positive in P1)*\n\n"
+        "## 2025-03-29 - James Edward Key\nFact verification failed for the following claims:\n- A claim\n\n",
+        encoding="utf-8")
+    path = _write_page(tmp_path, "2025-04-01")
+    auditor.run_phase_1.return_value = {"is_match": False, "predicted_name": "Tim Foli", "reasoning": ""}
+
+    auditor.audit_file(path)
+
+    report = (tmp_path / "FACT_AUDIT_REPORT.md").read_text()
+    assert "### ❌ Tony Kubek (2025-04-02)" in report
+    assert "### ❌ Scott Brosius (2025-04-01)" in report
+    assert auditor.store.get("2025-04-02")["p1_predicted"] == "LaMarr Hoyt"
+    assert "## 2025-03-29 - James Edward Key" in (tmp_path / "BATCH_VERIFICATION_REPORT.md").read_text()
+
+
+def test_min_interval_uses_its_own_limiter(tmp_path, monkeypatch):
+    monkeypatch.setattr(fact_auditor, "REPORT_PATH", tmp_path / "FACT_AUDIT_REPORT.md")
+    monkeypatch.setattr("sys.argv", ["fact_auditor.py", "--min-interval", "4", "--file", "missing.html"])
+    shared_interval = fact_auditor.GEMINI_RATE_LIMITER.min_interval
+    with patch.object(fact_auditor, "load_api_key", return_value="test"), \
+         patch.object(fact_auditor, "FactAuditor") as auditor_class:
+        fact_auditor.main()
+
+    limiter = auditor_class.call_args.kwargs["rate_limiter"]
+    assert limiter is not fact_auditor.GEMINI_RATE_LIMITER
+    assert limiter.min_interval == 4
+    assert fact_auditor.GEMINI_RATE_LIMITER.min_interval == shared_interval
+
+
+def test_scrape_facts_prefers_canonical_record(auditor, tmp_path):
+    path = _write_page(tmp_path, "2025-04-01")
+    (tmp_path / "data" / "puzzles").mkdir(parents=True)
+    (tmp_path / "data" / "puzzles" / "2025-04-01.json").write_text(json.dumps({
+        "date": "2025-04-01", "name": "Scott Brosius", "facts": ["Record fact."],
+        "followup_qa": [{"question": "Q?", "answer": "Record answer."}]}), encoding="utf-8")
+
+    assert auditor.scrape_facts(path) == {"name": "Scott Brosius", "facts": ["Record fact.", "Record answer."], "date": "2025-04-01"}
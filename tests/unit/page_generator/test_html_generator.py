@@ -124,3 +124,46 @@ class TestAddNicknameToPage:
         soup = BeautifulSoup(page.read_text(), "html.parser")
         updated = json.loads(soup.find(id="quiz-data").string)
         assert updated["nicknames"] == ["Captain"]
+
+def test_rerender_all_pages_rewrites_only_changed_pages(tmp_path, sample_player_data):
+    """Pages are rebuilt from their records, unchanged ones are not rewritten, and excluded dates are skipped."""
+    from puzzle_store import build_puzzle_record, save_puzzle_record
+    for date_str in ["2025-04-01", "2025-04-02", "2026-07-04"]:
+        save_puzzle_record(tmp_path, build_puzzle_record(sample_player_data, date_str, search_data={"teams": ["NYY", "BOS"], "years": ["1996"]}))
+    (tmp_path / "2026-07-04.html").write_text("<p>Hand-built tribute</p>", encoding="utf-8")
+    (tmp_path / "automation_config.json").write_text(json.dumps({"workflow": {"excluded_dates": ["2026-07-04"]}}))
+
+    counts = html_generator.rerender_all_pages(tmp_path, workers=2)
+    assert counts == {"rendered": 2, "written": 2, "excluded": 1, "failed": 0}
+    assert (tmp_path / "2026-07-04.html").read_text(encoding="utf-8") == "<p>Hand-built tribute</p>"
+
+    page = (tmp_path / "2025-04-01.html").read_text(encoding="utf-8")
+    # Stored teams win over the per-season list, which records rebuilt from old pages cannot recover
+    assert json.loads(BeautifulSoup(page, "html.parser").find(id="search-data").string)["teams"] == ["NYY", "BOS"]
+
+    mtime = (tmp_path / "2025-04-01.html").stat().st_mtime_ns
+    assert html_generator.rerender_all_pages(tmp_path, workers=2)["written"] == 0
+    assert (tmp_path / "2025-04-01.html").stat().st_mtime_ns == mtime
+
+def test_pages_carry_image_dimensions_and_placeholders(tmp_path, sample_player_data):
+    """Clue and answer images with manifest entries get width, height and an inline placeholder."""
+    from PIL import Image  # type: ignore
+    from puzzle_store import build_puzzle_record, save_puzzle_record
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    Image.new('RGB', (584, 320)).save(images_dir / "clue-2025-04-01.webp", 'WEBP')
+    Image.new('RGB', (300, 400)).save(images_dir / "answer-2025-04-01.webp", 'WEBP')
+    save_puzzle_record(tmp_path, build_puzzle_record(sample_player_data, "2025-04-01"))
+
+    html_generator.rerender_detail_page(tmp_path, "2025-04-01")
+    soup = BeautifulSoup((tmp_path / "2025-04-01.html").read_text(encoding="utf-8"), "html.parser")
+    answer = soup.find("img", src="images/answer-2025-04-01.webp")
+    clue = soup.find("img", src="images/clue-2025-04-01.webp")
+    assert (answer["width"], answer["height"]) == ("300", "400")
+    assert (clue["width"], clue["height"]) == ("584", "320")
+    assert clue["style"].startswith("background-image:url(data:image/webp;base64,")
+
+    entry = json.loads((images_dir / "image_manifest.json").read_text(encoding="utf-8"))["clue-2025-04-01.webp"]
+    snippet = html_generator.generate_gallery_snippet(7, "2025-04-01", "April 01, 2025", "terms", entry)
+    assert BeautifulSoup(snippet, "html.parser").prettify().rstrip("\n") == snippet
+    assert 'height="320"' in snippet and 'width="584"' in snippet
@@ -0,0 +1,43 @@
+# ABOUTME: Unit tests for the image manifest sidecar that records each puzzle image's size and placeholder.
+# ABOUTME: Verifies backfill measures only new or changed files, drops deleted ones and tolerates unreadable images.
+import json
+
+from PIL import Image
+
+import image_manifest  # type: ignore
+
+
+def test_placeholder_is_a_tiny_webp_data_uri():
+    placeholder = image_manifest.placeholder_data_uri(Image.new('RGB', (584, 320), color='red'))
+    assert placeholder.startswith("data:image/webp;base64,")
+    assert len(placeholder) < 500
+
+
+def test_refresh_image_manifest_backfills_and_tracks_changes(tmp_path, capsys, write_webp):
+    write_webp(tmp_path / "clue-2025-04-01.webp", (584, 320))
+    write_webp(tmp_path / "answer-2025-04-01.webp", (300, 400))
+    (tmp_path / "clue-2025-04-02.webp").write_text("not an image")
+    write_webp(tmp_path / "social-card.webp", (1200, 630))
+
+    manifest = image_manifest.refresh_image_manifest(tmp_path)
+    assert sorted(manifest) == ["answer-2025-04-01.webp", "clue-2025-04-01.webp"]
+    assert (manifest["clue-2025-04-01.webp"]['width'], manifest["clue-2025-04-01.webp"]['height']) == (584, 320)
+    assert json.loads((tmp_path / "image_manifest.json").read_text(encoding='utf-8')) == manifest
+    assert "2 measured, 1 unreadable" in capsys.readouterr().out
+
+    # Unchanged files are not rewritten; a replaced image is measured again and a deleted one dropped
+    assert image_manifest.refresh_image_manifest(tmp_path) == manifest
+    assert capsys.readouterr().out == ""
+    write_webp(tmp_path / "clue-2025-04-01.webp", (400, 600), color='white')
+    (tmp_path / "answer-2025-04-01.webp").unlink()
+    manifest = image_manifest.refresh_image_manifest(tmp_path)
+    assert list(manifest) == ["clue-2025-04-01.webp"]
+    assert manifest["clue-2025-04-01.webp"]['height'] == 600
+
+
+def test_image_entries_records_missing_entries(tmp_path, write_webp):
+    write_webp(tmp_path / "answer-2025-04-01.webp", (300, 400))
+
+    entries = image_manifest.image_entries(tmp_path, ["answer-2025-04-01.webp", "clue-2025-04-01.webp"])
+    assert list(entries) == ["answer-2025-04-01.webp"]
+    assert image_manifest.load_image_manifest(tmp_path) == entries
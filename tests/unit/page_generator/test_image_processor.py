@@ -12,7 +12,8 @@ import sys
 # Add the page-generator directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "page-generator"))
 
-from automation.image_processor import ImageProcessor
+from automation.image_processor import ImageProcessor, dhash, hash_distance
+from image_manifest import file_revision, load_image_manifest
 
 
 class TestImageProcessor:
@@ -87,6 +88,65 @@ class TestImageProcessor:
             assert img.format == 'WEBP'
             assert img.size == (400, 300)
 
+    def test_convert_to_webp_records_dimensions(self, image_processor, sample_png, temp_dir):
+        """Test that the written image's size and placeholder land in the sidecar manifest."""
+        output_path = temp_dir / "clue-2025-04-01.webp"
+        
+        assert image_processor.convert_to_webp(sample_png, output_path) is True
+        
+        entry = load_image_manifest(temp_dir)["clue-2025-04-01.webp"]
+        assert (entry['width'], entry['height']) == (400, 300)
+        assert entry['placeholder'].startswith("data:image/webp;base64,")
+        assert entry['revision'] == file_revision(output_path)
+
+    def test_puzzle_screenshot_writes_variants(self, image_processor, sample_png, temp_dir):
+        """Test that clue images get responsive variants recorded in the manifest."""
+        clue_path = image_processor.process_puzzle_screenshot(sample_png, temp_dir, "2025-04-01")
+        
+        entry = load_image_manifest(temp_dir)[clue_path.name]
+        assert entry['variants'] == {'revision': entry['revision'], 'widths': [320, 400]}
+        assert (temp_dir / "variants" / "clue-2025-04-01-400w.avif").exists()
+
+    def test_decode_image_bytes_uses_reduced_scale_jpeg_decode(self, image_processor):
+        """Test that a large JPEG is decoded at reduced scale and the scale back to the original is reported."""
+        import io
+        buffer = io.BytesIO()
+        Image.new('RGB', (4000, 3000), color='green').save(buffer, 'JPEG')
+        
+        img, scale = image_processor.decode_image_bytes(buffer.getvalue())
+        
+        assert img.size == (2000, 1500)
+        assert scale == 2.0
+        assert img.mode == 'RGB'
+        cropped = image_processor.crop_image(img, [0, 0, 500, 500], scale)
+        assert cropped.size == (1000, 750)
+        assert image_processor.crop_image(img, [0, 0, 10, 10], scale) is None
+
+    def test_decode_image_bytes_rejects_small_or_unreadable_images(self, image_processor):
+        """Test that undersized images are rejected from the header and garbage bytes do not raise."""
+        import io
+        buffer = io.BytesIO()
+        Image.new('RGB', (150, 400)).save(buffer, 'PNG')
+        
+        assert image_processor.decode_image_bytes(buffer.getvalue()) is None
+        assert image_processor.decode_image_bytes(b"not an image") is None
+
+    def test_dhash_matches_resized_copies_and_separates_different_images(self, sample_png, sample_jpg):
+        """Test that a resized, recompressed copy hashes close to its original and another image does not."""
+        import io
+        with Image.open(sample_png) as original:
+            original.load()
+        buffer = io.BytesIO()
+        original.resize((200, 150)).save(buffer, 'JPEG', quality=60)
+        with Image.open(sample_jpg) as other:
+            other_hash = dhash(other)
+        
+        copy_hash = dhash(Image.open(buffer))
+        
+        assert len(dhash(original)) == 16
+        assert hash_distance(dhash(original), copy_hash) <= 6
+        assert hash_distance(dhash(original), other_hash) > 6
+
     def test_convert_to_webp_jpg_to_webp(self, image_processor, sample_jpg, temp_dir):
         """Test converting JPG to WEBP."""
         output_path = temp_dir / "output.webp"
@@ -272,6 +332,30 @@ class TestImageProcessor:
         assert (output_dir / "test1.webp").exists()
         assert (output_dir / "test2.webp").exists()
 
+    def test_batch_process_images_skips_unchanged_inputs(self, image_processor, sample_png, sample_jpg, temp_dir):
+        """Test that a rerun skips inputs already converted with the same settings."""
+        input_dir = temp_dir / "input"
+        output_dir = temp_dir / "output"
+        input_dir.mkdir()
+        import shutil
+        shutil.copy(sample_png, input_dir / "test1.png")
+        shutil.copy(sample_jpg, input_dir / "test2.jpg")
+        
+        first = image_processor.batch_process_images(input_dir, output_dir, pattern="*", workers=2)
+        assert [(r['output'].name, r['skipped']) for r in first] == [("test1.webp", False), ("test2.webp", False)]
+        assert all(r['seconds'] > 0 for r in first)
+        
+        # Only the changed input is converted again
+        Image.new('RGB', (100, 100), color='white').save(input_dir / "test1.png")
+        second = image_processor.batch_process_images(input_dir, output_dir, pattern="*", workers=1)
+        assert [(r['output'].name, r['skipped']) for r in second] == [("test2.webp", True), ("test1.webp", False)]
+        with Image.open(output_dir / "test1.webp") as img:
+            assert img.size == (100, 100)
+        
+        # New encoder settings convert everything again
+        third = ImageProcessor(quality=60).batch_process_images(input_dir, output_dir, pattern="*", workers=1)
+        assert not any(r['skipped'] for r in third)
+
     def test_batch_process_images_empty_directory(self, image_processor, temp_dir):
         """Test batch processing with empty directory."""
         input_dir = temp_dir / "input"
@@ -0,0 +1,64 @@
+# ABOUTME: Unit tests for the per-class quality policy that picks the lowest WebP quality above an SSIM threshold.
+# ABOUTME: Verifies the SSIM measure, the quality search, and that archive audits only rewrite files on request.
+import numpy as np
+from PIL import Image, ImageDraw
+
+import image_quality  # type: ignore
+from image_manifest import load_image_manifest, refresh_image_manifest  # type: ignore
+
+
+def _card(size=(400, 240)):
+    """A flat graphic with text-like strokes, like a clue card."""
+    img = Image.new('RGB', size, color='white')
+    draw = ImageDraw.Draw(img)
+    for y in range(20, size[1] - 20, 24):
+        draw.text((20, y), "NAME THAT YANKEE 1996 NYY", fill='navy')
+    return img
+
+
+def test_ssim_is_one_for_identical_images_and_drops_with_noise():
+    reference = np.asarray(_card().convert('L'))
+    noisy = np.clip(reference + np.random.default_rng(0).normal(0, 25, reference.shape), 0, 255).astype(np.uint8)
+    assert image_quality.ssim(reference, reference) == 1.0
+    assert image_quality.ssim(reference, noisy) < 0.9
+
+
+def test_choose_quality_picks_lowest_quality_meeting_the_threshold():
+    img = _card()
+    quality, data, score = image_quality.choose_quality(img, 'clue')
+    policy = image_quality.QUALITY_POLICY['clue']
+    assert score >= policy['min_ssim']
+    assert policy['min_quality'] <= quality <= policy['max_quality']
+    if quality > policy['min_quality']:
+        # One step lower would have fallen below the threshold
+        lower = image_quality.encode_webp(img, quality - image_quality.QUALITY_STEP)
+        with Image.open(__import__('io').BytesIO(lower)) as decoded:
+            assert image_quality.ssim(np.asarray(img.convert('L')), np.asarray(decoded.convert('L'))) < policy['min_ssim']
+    assert data == image_quality.encode_webp(img, quality)
+
+
+def test_audit_archive_reports_then_rewrites_on_request(tmp_path, capsys):
+    path = tmp_path / "clue-2025-04-01.webp"
+    # A scanned card's grain makes a lossless encode far larger than the policy needs
+    grain = np.random.default_rng(1).normal(0, 6, (240, 400, 3))
+    scan = Image.fromarray(np.clip(np.asarray(_card(), dtype=np.float64) + grain, 0, 255).astype(np.uint8))
+    scan.save(path, 'WEBP', lossless=True)
+    Image.new('RGB', (64, 64)).save(tmp_path / "social-card.webp", 'WEBP')
+    refresh_image_manifest(tmp_path)
+    original = path.read_bytes()
+
+    report = image_quality.audit_archive(tmp_path, workers=1)
+    assert report['clue']['files'] == 1 and report['answer']['files'] == 0
+    assert report['clue']['projected_bytes'] < report['clue']['bytes']
+    assert path.read_bytes() == original
+    assert "dry run" in capsys.readouterr().out
+
+    report = image_quality.audit_archive(tmp_path, write=True, workers=1)
+    assert report['clue']['rewritten'] == 1
+    assert path.stat().st_size == report['clue']['projected_bytes']
+    entry = load_image_manifest(tmp_path)["clue-2025-04-01.webp"]
+    assert entry['quality_audit']['policy'] == image_quality.policy_key('clue')
+    assert refresh_image_manifest(tmp_path)["clue-2025-04-01.webp"] == entry
+
+    # Audited images are skipped until the policy changes
+    assert image_quality.audit_archive(tmp_path, workers=1)['clue']['files'] == 0
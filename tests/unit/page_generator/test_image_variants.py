@@ -0,0 +1,60 @@
+# ABOUTME: Unit tests for the responsive WebP and AVIF variants written beside each puzzle image.
+# ABOUTME: Verifies the widths produced, that backfills skip current variants, and the <picture> markup pages emit.
+from PIL import Image
+
+import html_generator  # type: ignore
+import image_variants  # type: ignore
+from image_manifest import load_image_manifest, record_image  # type: ignore
+
+
+def test_write_variants_adds_narrower_widths_and_avif(tmp_path, write_webp):
+    path = tmp_path / "answer-2025-04-01.webp"
+    img = write_webp(path, (1020, 1432))
+
+    variants = image_variants.write_variants(path, img)
+    assert variants['widths'] == [320, 640, 1020]
+    written = sorted(p.name for p in (tmp_path / "variants").iterdir())
+    assert written == sorted(f.split("/")[1] for f in image_variants.variant_files(path.name, variants['widths']))
+    with Image.open(tmp_path / "variants" / "answer-2025-04-01-320w.avif") as avif:
+        assert avif.size == (320, 449)
+    # The full-width WebP is the image itself
+    assert not (tmp_path / "variants" / "answer-2025-04-01-1020w.webp").exists()
+
+
+def test_update_variants_skips_current_images_and_removes_stale_files(tmp_path, capsys, write_webp):
+    write_webp(tmp_path / "clue-2025-04-01.webp", (584, 320))
+    write_webp(tmp_path / "clue-2025-04-02.webp", (300, 200))
+
+    manifest = image_variants.update_variants(tmp_path, workers=1)
+    assert manifest["clue-2025-04-01.webp"]['variants']['widths'] == [320, 584]
+    assert manifest["clue-2025-04-02.webp"]['variants']['widths'] == [300]
+    assert load_image_manifest(tmp_path) == manifest
+    assert "Wrote variants for 2 images" in capsys.readouterr().out
+
+    image_variants.update_variants(tmp_path, workers=1)
+    assert "Wrote variants" not in capsys.readouterr().out
+
+    # A replaced image gets new variants; a deleted one's are removed
+    write_webp(tmp_path / "clue-2025-04-01.webp", (200, 100), color='white')
+    (tmp_path / "clue-2025-04-02.webp").unlink()
+    manifest = image_variants.update_variants(tmp_path, workers=1)
+    assert manifest["clue-2025-04-01.webp"]['variants']['widths'] == [200]
+    assert sorted(p.name for p in (tmp_path / "variants").iterdir()) == ["clue-2025-04-01-200w.avif"]
+
+
+def test_pages_offer_variants_through_picture(tmp_path, write_webp):
+    path = tmp_path / "clue-2025-04-01.webp"
+    img = write_webp(path, (584, 320))
+    entry = record_image(path, img, image_variants.write_variants(path, img))
+
+    snippet = html_generator.generate_gallery_snippet(0, "2025-04-01", "April 01, 2025", "terms", entry)
+    assert 'srcset="images/variants/clue-2025-04-01-320w.avif 320w, images/variants/clue-2025-04-01-584w.avif 584w" type="image/avif"' in snippet
+    assert 'srcset="images/variants/clue-2025-04-01-320w.webp 320w, images/clue-2025-04-01.webp 584w"' in snippet
+
+    page = html_generator.build_detail_page_html({'name': "Derek Jeter"}, "2025-04-01", "April 01, 2025",
+                                                 images={"clue-2025-04-01.webp": entry})
+    assert '<picture><source type="image/avif" srcset="images/variants/clue-2025-04-01-320w.avif 320w' in page
+    # Variants made from an older version of the image are not offered
+    entry['revision'] = "changed"
+    snippet = html_generator.generate_gallery_snippet(0, "2025-04-01", "April 01, 2025", "terms", entry)
+    assert "<picture>" not in snippet and "srcset" not in snippet
@@ -10,8 +10,10 @@ import tempfile
 from pathlib import Path
 from PIL import Image, ImageDraw
 from unittest.mock import Mock, patch, MagicMock
+import io
 import sys
 import base64
+import numpy as np
 
 # Add the page-generator directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "page-generator"))
@@ -20,6 +22,21 @@ from automation.player_image_search import PlayerImageSearch
 from automation.image_processor import ImageProcessor
 
 
+def _jpeg_bytes(size, color='blue'):
+    """Encoded JPEG bytes, as a candidate download would return them."""
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color=color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def _picture_bytes(size, seed):
+    """JPEG bytes of a blocky random picture; different seeds give pictures that hash far apart."""
+    blocks = np.random.default_rng(seed).integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(blocks).resize(size, Image.Resampling.NEAREST).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
 class TestPlayerImageSearch:
     """Test cases for PlayerImageSearch functionality."""
 
@@ -60,21 +77,15 @@ class TestPlayerImageSearch:
 
     def test_find_first_yankee_image_basic(self, player_search, temp_dir):
         """Test finding images with prioritization logic."""
-        # Create a mock temp file
-        test_img = temp_dir / "test.jpg"
-        test_img.touch()
-
         with patch.object(player_search, '_get_image_candidates_from_bing') as mock_bing, \
              patch.object(player_search, '_get_image_candidates_from_google') as mock_google, \
-             patch.object(player_search, '_download_full_size_image') as mock_download, \
-             patch.object(player_search.image_processor, 'get_image_info') as mock_info, \
+             patch.object(player_search, '_download_image_bytes') as mock_download, \
              patch('ai_services.analyze_player_image') as mock_analyze:
             
             # Mock candidate
             mock_bing.return_value = [{'direct_url': 'http://ex.com/1.jpg', 'source_page': 'http://ex.com/1'}]
             mock_google.return_value = []
-            mock_download.return_value = test_img
-            mock_info.return_value = {'width': 400, 'height': 600}
+            mock_download.return_value = _jpeg_bytes((400, 600))
             
             # Mock Priority 1 find
             mock_analyze.return_value = {'priority': 1, 'reasoning': 'Perfect'}
@@ -83,29 +94,21 @@ class TestPlayerImageSearch:
             
             assert len(results) == 1
             assert results[0]['priority'] == 1
-            assert results[0]['temp_file'] == test_img
+            assert results[0]['image'].size == (400, 600)
+            # Gemini is given the decoded image rather than a file to open again
+            assert mock_analyze.call_args[0][0] is results[0]['image']
 
     def test_find_first_yankee_image_collects_three(self, player_search, temp_dir):
         """Test that it collects up to 3 high-priority matches."""
         with patch.object(player_search, '_get_image_candidates_from_bing') as mock_bing, \
              patch.object(player_search, '_get_image_candidates_from_google') as mock_google, \
-             patch.object(player_search, '_download_full_size_image') as mock_download, \
-             patch.object(player_search.image_processor, 'get_image_info') as mock_info, \
+             patch.object(player_search, '_download_image_bytes') as mock_download, \
              patch('ai_services.analyze_player_image') as mock_analyze:
             
             # 5 candidates
             mock_bing.return_value = [{'direct_url': f'http://ex.com/{i}.jpg', 'source_page': 'url'} for i in range(5)]
             mock_google.return_value = []
-            
-            # Mock files
-            files = []
-            for i in range(5):
-                f = temp_dir / f"test_{i}.jpg"
-                f.touch()
-                files.append(f)
-            
-            mock_download.side_effect = files
-            mock_info.return_value = {'width': 400, 'height': 600}
+            mock_download.side_effect = [_picture_bytes((400, 600), seed) for seed in range(5)]
             
             # First 3 are Priority 1
             mock_analyze.side_effect = [
@@ -160,20 +163,15 @@ class TestPlayerImageSearch:
 
     def test_landscape_image_accepted_for_ai_eval(self, player_search, temp_dir):
         """Test that landscape images are accepted for AI evaluation instead of being rejected."""
-        test_img = temp_dir / "landscape.jpg"
-        test_img.touch()
-
         with patch.object(player_search, '_get_image_candidates_from_bing') as mock_bing, \
              patch.object(player_search, '_get_image_candidates_from_google') as mock_google, \
-             patch.object(player_search, '_download_full_size_image') as mock_download, \
-             patch.object(player_search.image_processor, 'get_image_info') as mock_info, \
+             patch.object(player_search, '_download_image_bytes') as mock_download, \
              patch('ai_services.analyze_player_image') as mock_analyze:
             
             mock_bing.return_value = [{'direct_url': 'url', 'source_page': 'page'}]
             mock_google.return_value = []
-            mock_download.return_value = test_img
             # Landscape: width > height
-            mock_info.return_value = {'width': 800, 'height': 600}
+            mock_download.return_value = _jpeg_bytes((800, 600))
             # Mock AI rejecting it eventually (but it should REACH the AI)
             mock_analyze.return_value = {'priority': 4} # Rejected by AI
             
@@ -182,4 +180,83 @@ class TestPlayerImageSearch:
             # Results should be empty because AI rejected it, but mock_analyze should have been called
             assert len(results) == 0
             assert mock_analyze.called
-            assert not test_img.exists() # Should be unlinked after rejection
+
+    def test_accepted_candidate_is_cropped_in_memory_and_written_once(self, player_search, temp_dir):
+        """Test that a candidate is decoded once, cropped in memory, and only the final WEBP reaches disk."""
+        with patch.object(player_search, '_get_image_candidates_from_bing') as mock_bing, \
+             patch.object(player_search, '_get_image_candidates_from_google') as mock_google, \
+             patch.object(player_search, '_download_image_bytes') as mock_download, \
+             patch('ai_services.analyze_player_image') as mock_analyze:
+            
+            mock_bing.return_value = [{'direct_url': 'url', 'source_page': 'page'}]
+            mock_google.return_value = []
+            mock_download.return_value = _jpeg_bytes((1000, 600))
+            # Left half of a landscape image
+            mock_analyze.return_value = {'priority': 1, 'crop_box': [0, 0, 1000, 500]}
+            
+            paths = player_search.download_and_process_player_image("Test Player", "2026-03-07", "fake_key")
+        
+        staging_dir = temp_dir / "temp_player_images"
+        assert paths == [staging_dir / "answer-2026-03-07-1.webp"]
+        with Image.open(paths[0]) as img:
+            assert img.size == (500, 600)
+        # Staged candidates stay out of the image manifest
+        assert sorted(p.name for p in staging_dir.iterdir() if p.is_file()) == ["answer-2026-03-07-1.webp"]
+        assert not list(temp_dir.glob("download_*"))
+
+    def test_too_small_crop_is_rejected(self, player_search):
+        """Test that a crop below the minimum size, in original pixels, rejects the candidate."""
+        with patch.object(player_search, '_get_image_candidates_from_bing') as mock_bing, \
+             patch.object(player_search, '_get_image_candidates_from_google') as mock_google, \
+             patch.object(player_search, '_download_image_bytes') as mock_download, \
+             patch('ai_services.analyze_player_image') as mock_analyze:
+            
+            mock_bing.return_value = [{'direct_url': 'url', 'source_page': 'page'}]
+            mock_google.return_value = []
+            mock_download.return_value = _jpeg_bytes((400, 600))
+            mock_analyze.return_value = {'priority': 1, 'crop_box': [0, 0, 100, 100]}
+            
+            assert player_search.find_first_yankee_image("Test Player", "fake_key") == []
+
+    def test_near_duplicate_candidates_are_analyzed_once(self, player_search):
+        """Test that the same picture from another site, resized, is skipped without a Gemini call."""
+        with patch.object(player_search, '_get_image_candidates_from_bing') as mock_bing, \
+             patch.object(player_search, '_get_image_candidates_from_google') as mock_google, \
+             patch.object(player_search, '_download_image_bytes') as mock_download, \
+             patch('ai_services.analyze_player_image') as mock_analyze:
+            
+            mock_bing.return_value = [{'direct_url': f'http://site{i}.com/card.jpg', 'source_page': 'page'} for i in range(2)]
+            mock_google.return_value = [{'direct_url': f'http://other{i}.com/card.jpg', 'source_page': 'page'} for i in range(2)]
+            mock_download.side_effect = [
+                _picture_bytes((400, 600), 1),
+                _picture_bytes((300, 450), 1),
+                _picture_bytes((800, 1200), 1),
+                _picture_bytes((400, 600), 2),
+            ]
+            mock_analyze.return_value = {'priority': 3}
+            
+            results = player_search.find_first_yankee_image("Test Player", "fake_key")
+            
+            assert mock_analyze.call_count == 2
+            assert len(results) == 2
+
+    def test_rejected_candidates_are_skipped_on_rerun(self, images_dir):
+        """Test that a picture the AI rejected for a player is not analyzed again in a later search."""
+        def search(player_name):
+            player_search = PlayerImageSearch(images_dir, images_dir.parent)
+            with patch.object(player_search, '_get_image_candidates_from_bing') as mock_bing, \
+                 patch.object(player_search, '_get_image_candidates_from_google') as mock_google, \
+                 patch.object(player_search, '_download_image_bytes') as mock_download, \
+                 patch('ai_services.analyze_player_image') as mock_analyze:
+                mock_bing.return_value = [{'direct_url': 'url', 'source_page': 'page'}]
+                mock_google.return_value = []
+                mock_download.return_value = _picture_bytes((400, 600), 1)
+                mock_analyze.return_value = {'priority': 4}
+                assert player_search.find_first_yankee_image(player_name, "fake_key") == []
+                return mock_analyze.call_count
+        
+        assert search("Test Player") == 1
+        assert (images_dir.parent / ".rejected_image_hashes.json").exists()
+        assert search("test  player") == 0
+        # The same picture may still be right for someone else
+        assert search("Other Player") == 1
@@ -0,0 +1,27 @@
+# ABOUTME: Unit tests for the per-prefix autocomplete shards built from the master player list.
+# ABOUTME: Verifies normalization matches the quiz, shards stay sorted by key, and stale shards are removed.
+import json
+
+import player_index  # type: ignore
+
+
+def test_build_player_index_sorts_normalized_names_into_prefix_shards():
+    shards = player_index.build_player_index(["Derek Jeter", "Guillo Zuñiga", "Dennis Rasmussen", "A.J. Burnett", "Derek Jeter", " "])
+
+    assert sorted(shards) == ["a_", "de", "gu"]
+    assert shards["de"] == {'names': ["Dennis Rasmussen", "Derek Jeter"], 'keys': ["dennis rasmussen", "derek jeter"]}
+    assert shards["gu"]['keys'] == ["guillo zuniga"]
+
+
+def test_write_player_index_reads_master_list_and_removes_stale_shards(tmp_path, capsys):
+    (tmp_path / "all_players.js").write_text('// header\nconst ALL_PLAYERS = [\n  "Derek Jeter",\n  "Tony Zych"\n];', encoding='utf-8')
+    stale = tmp_path / "data" / "players" / "qq.json"
+    stale.parent.mkdir(parents=True)
+    stale.write_text("{}", encoding='utf-8')
+
+    names = player_index.load_master_player_list(tmp_path)
+    assert player_index.write_player_index(tmp_path, names) == 3
+    assert not stale.exists()
+    assert json.loads((tmp_path / "data" / "players" / "to.json").read_text(encoding='utf-8'))['names'] == ["Tony Zych"]
+    # Nothing changed, nothing written
+    assert player_index.write_player_index(tmp_path, names) == 0
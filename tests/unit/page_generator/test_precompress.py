@@ -0,0 +1,96 @@
+# ABOUTME: Unit tests for the .gz/.br sibling writer and serve.py's Accept-Encoding negotiation.
+# ABOUTME: Verifies unchanged files are not recompressed and stale or unaccepted siblings are never served.
+import gzip
+import http.client
+import os
+import threading
+from http.server import ThreadingHTTPServer
+from unittest.mock import patch
+
+import precompress  # type: ignore
+import serve  # type: ignore
+
+PAGE = "<html><body>" + "<p>Name That Yankee</p>" * 50 + "</body></html>"
+
+
+def _site(tmp_path):
+    (tmp_path / "2026-04-20.html").write_text(PAGE, encoding="utf-8")
+    (tmp_path / "stats_summary.json").write_text("[]", encoding="utf-8")
+    return tmp_path
+
+
+def test_precompress_site_skips_unchanged_files(tmp_path):
+    site = _site(tmp_path)
+    with patch.object(precompress, "BROTLI_AVAILABLE", False):
+        assert precompress.precompress_site(site) == 1
+        assert gzip.decompress((site / "2026-04-20.html.gz").read_bytes()).decode() == PAGE
+        # Files below MIN_SIZE are left alone
+        assert not (site / "stats_summary.json.gz").exists()
+
+        with patch.object(precompress, "_compress", wraps=precompress._compress) as compress:
+            assert precompress.precompress_site(site) == 0
+            compress.assert_not_called()
+
+        (site / "2026-04-20.html").write_text(PAGE + "<!-- edited -->", encoding="utf-8")
+        assert precompress.precompress_site(site) == 1
+        assert gzip.decompress((site / "2026-04-20.html.gz").read_bytes()).decode().endswith("<!-- edited -->")
+
+
+def test_precompress_site_removes_orphaned_siblings(tmp_path):
+    site = _site(tmp_path)
+    with patch.object(precompress, "BROTLI_AVAILABLE", False):
+        precompress.precompress_site(site)
+        (site / "2026-04-20.html").unlink()
+        precompress.precompress_site(site)
+    assert not (site / "2026-04-20.html.gz").exists()
+
+
+def test_site_files_skip_development_scripts(tmp_path):
+    for name in ("sw.js", "vitest.config.js"):
+        (tmp_path / name).write_text("// script\n", encoding="utf-8")
+
+    assert [path.name for path in precompress.site_files(tmp_path)] == ["sw.js"]
+
+
+def test_parse_accept_encoding_honours_zero_quality():
+    assert serve.parse_accept_encoding("gzip, deflate, br;q=0") == {"gzip", "deflate"}
+    assert serve.parse_accept_encoding("*") >= {"br", "gzip"}
+    assert serve.parse_accept_encoding(None) == set()
+
+
+def _get(port, path, accept_encoding=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("GET", path, headers={"Accept-Encoding": accept_encoding} if accept_encoding else {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def test_serve_negotiates_precompressed_variant(tmp_path):
+    site = _site(tmp_path)
+    with patch.object(precompress, "BROTLI_AVAILABLE", False):
+        precompress.precompress_site(site)
+
+    with patch.object(serve, "DIRECTORY", str(site)):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), serve.CleanURLHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            port = server.server_address[1]
+            response, body = _get(port, "/2026-04-20", "br, gzip")
+            assert response.getheader("Content-Encoding") == "gzip"
+            assert response.getheader("Content-Type") == "text/html"
+            assert response.getheader("Vary") == "Accept-Encoding"
+            assert gzip.decompress(body).decode() == PAGE
+
+            response, body = _get(port, "/2026-04-20.html")
+            assert response.getheader("Content-Encoding") is None
+            assert body.decode() == PAGE
+
+            # A source edited after compression is served raw rather than from its stale sibling
+            os.utime(site / "2026-04-20.html", ns=(0, 0))
+            response, body = _get(port, "/2026-04-20.html", "gzip")
+            assert response.getheader("Content-Encoding") is None
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,114 @@
+# ABOUTME: Unit tests for the canonical per-puzzle JSON records under data/puzzles/.
+# ABOUTME: Verifies records round-trip from rendered pages, consumers read them, and quiz payloads stay in sync.
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import html_generator  # type: ignore
+import puzzle_store  # type: ignore
+from stats_summary import load_stats_summary  # type: ignore
+
+PLAYER_DATA = {
+    "name": "Scott Brosius",
+    "nicknames": ["Brosius"],
+    "facts": ["Won the 1998 World Series MVP.", "Hit a tying homer in Game 5 of the 2001 World Series."],
+    "followup_qa": [{"question": "Where was he born?", "answer": "Hillsboro, Oregon."}, {"question": "", "answer": "skipped"}],
+    "career_totals": {"WAR": "14.8", "HR": "141"},
+    "yearly_war": [
+        {"year": "1997", "teams": ["OAK"], "display_team": "OAK", "war": -0.1},
+        {"year": "1998", "teams": ["NYY"], "display_team": "NYY", "war": 5.3},
+    ],
+}
+
+
+def _project(tmp_path: Path) -> Path:
+    project_dir = tmp_path / "project"
+    (project_dir / "images").mkdir(parents=True)
+    (project_dir / "index.html").write_text('<div class="gallery"></div>', encoding="utf-8")
+    (project_dir / "images" / "clue-2025-04-01.webp").write_text("fake image data")
+    return project_dir
+
+
+def test_record_round_trips_from_rendered_page():
+    html_text = html_generator.build_detail_page_html(PLAYER_DATA, "2025-04-01", "April 01, 2025")
+    rebuilt = puzzle_store.record_from_html(html_text, "2025-04-01")
+    expected = puzzle_store.build_puzzle_record(PLAYER_DATA, "2025-04-01")
+    assert rebuilt == {**expected, "teams": rebuilt["teams"]}
+    assert sorted(rebuilt["teams"]) == sorted(expected["teams"])
+    assert expected["followup_qa"] == [{"question": "Where was he born?", "answer": "Hillsboro, Oregon."}]
+
+
+def test_generate_detail_page_writes_record_used_by_index(tmp_path):
+    project_dir = _project(tmp_path)
+    html_generator.generate_detail_page(PLAYER_DATA, "2025-04-01", "April 01, 2025", project_dir)
+
+    record = json.loads((project_dir / "data" / "puzzles" / "2025-04-01.json").read_text())
+    assert record["name"] == "Scott Brosius"
+    assert record["years"] == ["1997", "1998"]
+
+    with patch("html_generator.extract_page_metadata") as extract:
+        html_generator.rebuild_index_page(project_dir)
+    extract.assert_not_called()
+    stats = load_stats_summary(project_dir / "stats_summary.json")
+    assert stats[0]["name"] == "Scott Brosius"
+    assert stats[0]["nickname"] == "Brosius"
+
+
+def test_add_nickname_updates_record_and_page(tmp_path):
+    project_dir = _project(tmp_path)
+    html_generator.generate_detail_page(PLAYER_DATA, "2025-04-01", "April 01, 2025", project_dir)
+
+    assert html_generator.add_nickname_to_page(project_dir, "2025-04-01", "Scotty")
+    assert not html_generator.add_nickname_to_page(project_dir, "2025-04-01", "scotty")
+
+    assert puzzle_store.load_puzzle_record(project_dir, "2025-04-01")["nicknames"] == ["Brosius", "Scotty"]
+    assert '"Scotty"' in (project_dir / "2025-04-01.html").read_text()
+
+
+def test_backfill_skips_existing_records(tmp_path):
+    project_dir = _project(tmp_path)
+    (project_dir / "2025-04-01.html").write_text(
+        html_generator.build_detail_page_html(PLAYER_DATA, "2025-04-01", "April 01, 2025"), encoding="utf-8")
+
+    assert puzzle_store.backfill(project_dir) == 1
+    assert puzzle_store.backfill(project_dir) == 0
+    assert puzzle_store.load_puzzle_record(project_dir, "2025-04-01")["career_totals"] == {"WAR": "14.8", "HR": "141"}
+
+
+def test_quiz_data_follows_record_and_matches_page(tmp_path):
+    project_dir = _project(tmp_path)
+    html_generator.generate_detail_page(PLAYER_DATA, "2025-04-01", "April 01, 2025", project_dir)
+    html_generator.add_nickname_to_page(project_dir, "2025-04-01", "Scotty")
+
+    payload = json.loads(puzzle_store.quiz_path(project_dir, "2025-04-01").read_text())
+    assert payload == {"answer": "Scott Brosius", "nicknames": ["Brosius", "Scotty"], "hints": PLAYER_DATA["facts"]}
+    assert puzzle_store.validate_quiz_payload(payload) == []
+    assert puzzle_store.check_quiz_data(project_dir) == []
+
+
+def test_check_quiz_data_reports_stale_missing_and_orphaned_files(tmp_path):
+    project_dir = _project(tmp_path)
+    record = puzzle_store.build_puzzle_record(PLAYER_DATA, "2025-04-01")
+    puzzle_store.save_puzzle_record(project_dir, record)
+    puzzle_store.save_puzzle_record(project_dir, {**record, "date": "2025-04-02"})
+    puzzle_store.write_quiz_bundle(project_dir)
+
+    puzzle_store.quiz_path(project_dir, "2025-04-02").unlink()
+    puzzle_store.quiz_path(project_dir, "2025-03-30").write_text("{}")
+    puzzle_store.update_puzzle_record(project_dir, "2025-04-01", nicknames=["Scotty"])
+    puzzle_store.quiz_path(project_dir, "2025-04-01").write_text('{"answer": "", "nicknames": [], "hints": []}')
+
+    assert puzzle_store.check_quiz_data(project_dir) == [
+        "2025-04-01: answer is missing",
+        "2025-04-01: hints are missing",
+        "2025-04-01: quiz data does not match the puzzle record",
+        "2025-04-02: quiz data is missing",
+        "2025-03-30: quiz data has no puzzle record",
+        "all.json: quiz bundle is out of date",
+    ]
+
+    assert puzzle_store.sync_quiz_data(project_dir) == 3
+    assert puzzle_store.write_quiz_bundle(project_dir)
+    assert puzzle_store.check_quiz_data(project_dir) == []
+    bundle = json.loads((project_dir / "data" / "quiz" / "all.json").read_text())
+    assert list(bundle) == ["2025-04-02", "2025-04-01"]
@@ -0,0 +1,42 @@
+# ABOUTME: Unit tests for the generated service worker and its content-hashed precache manifest.
+# ABOUTME: Verifies coverage of the shell and newest puzzles, and that outputs change only with covered files.
+import json
+
+import service_worker  # type: ignore
+
+
+def _site(tmp_path):
+    (tmp_path / "js").mkdir()
+    (tmp_path / "images").mkdir()
+    (tmp_path / "index.html").write_text("<html></html>", encoding="utf-8")
+    (tmp_path / "style.css").write_text("body{}", encoding="utf-8")
+    (tmp_path / "js" / "index.js").write_text("export {}", encoding="utf-8")
+    for date_str in ("2026-04-19", "2026-04-20", "2026-04-21"):
+        (tmp_path / "images" / f"clue-{date_str}.webp").write_bytes(b"clue")
+        (tmp_path / f"{date_str}.html").write_text(date_str, encoding="utf-8")
+    return tmp_path
+
+
+def test_manifest_covers_shell_and_newest_puzzles(tmp_path):
+    site = _site(tmp_path)
+    manifest = service_worker.build_precache_manifest(site, puzzle_count=2)
+
+    assert list(manifest['assets']) == ["index.html", "style.css", "js/index.js",
+                                        "2026-04-21.html", "images/clue-2026-04-21.webp",
+                                        "2026-04-20.html", "images/clue-2026-04-20.webp"]
+    assert manifest['assets']["style.css"] == service_worker.file_revision(site / "style.css")
+
+
+def test_write_service_worker_only_when_covered_files_change(tmp_path):
+    site = _site(tmp_path)
+    assert service_worker.write_service_worker(site, puzzle_count=2) is True
+    version = json.loads((site / "precache-manifest.json").read_text())['version']
+    assert f"const MANIFEST_VERSION = '{version}';" in (site / "sw.js").read_text()
+
+    # An older puzzle outside the precache window does not touch the worker
+    (site / "2026-04-19.html").write_text("edited", encoding="utf-8")
+    assert service_worker.write_service_worker(site, puzzle_count=2) is False
+
+    (site / "style.css").write_text("body{color:red}", encoding="utf-8")
+    assert service_worker.write_service_worker(site, puzzle_count=2) is True
+    assert json.loads((site / "precache-manifest.json").read_text())['version'] != version
@@ -0,0 +1,34 @@
+# ABOUTME: Unit tests for the columnar stats_summary.json format and the page version stamps.
+# ABOUTME: Verifies entries round-trip, including year ranges, shards and summaries from older generators.
+import stats_summary  # type: ignore
+
+ENTRIES = [
+    {'date': "2026-04-21", 'name': "Lou Piniella", 'nickname': "Sweet Lou", 'teams': ["BAL", "KCR", "NYY"],
+     'years': ["1964", "1968", "1969", "1970", "1974", "1975", "1980", "1978"]},
+    {'date': "2026-03-30", 'name': "John Sterling", 'nickname': "", 'teams': [], 'years': [], 'shard': "2026-03"},
+    {'date': "2026-03-29", 'name': "Tony Kubek", 'nickname': "Tony", 'teams': ["NYY"], 'years': ["1957"], 'shard': "2026-03"},
+]
+
+
+def test_year_ranges_keep_season_order():
+    assert stats_summary.year_ranges(ENTRIES[0]['years']) == [1964, [1968, 1970], [1974, 1975], 1980, 1978]
+    assert stats_summary.expand_years([1964, [1968, 1970], 1978]) == ["1964", "1968", "1969", "1970", "1978"]
+
+
+def test_compact_summary_round_trips(tmp_path):
+    compact = stats_summary.compact_stats_summary(ENTRIES, static_count=1)
+    assert compact['team_table'] == ["NYY", "BAL", "KCR"]
+    assert compact['teams'] == [[1, 2, 0], [], [0]]
+    assert stats_summary.expand_stats_summary(compact) == ENTRIES
+
+    path = tmp_path / "stats_summary.json"
+    path.write_text(stats_summary.stats_summary_json(ENTRIES, 1), encoding='utf-8')
+    assert stats_summary.load_stats_summary(path) == ENTRIES
+    # Summaries written by earlier generators are plain lists
+    assert stats_summary.expand_stats_summary(ENTRIES) is ENTRIES
+
+
+def test_stamp_version_handles_either_attribute_order():
+    assert stats_summary.stamp_version('<meta content="old" name="v"/>', "v", "abc") == '<meta content="abc" name="v"/>'
+    assert stats_summary.stamp_version('<meta name="v" content="">', "v", "abc") == '<meta name="v" content="abc">'
+    assert stats_summary.stamp_version('<meta name="other" content="x">', "v", "abc") == '<meta name="other" content="x">'